@@ -0,0 +1,95 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   CAPI gRPC Payload Encoding Benchmark
+#
+##########################################################################
+"""
+Compares serialize/deserialize time and wire size of the legacy JSON/pickle payloads against the binary records in ``step_impl_grpc/capi_payload.py``.
+
+Run from the project root::
+
+    python benchmarks/capi_payload_benchmark.py
+"""
+##########################################################################
+# import libraries
+###
+import os
+import sys
+import json
+import pickle
+import random
+import timeit
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from step_impl_grpc import capi_payload
+
+##########################################################################
+# constants
+###
+CMTP_BUFFER_LEN = 1024
+IO_LEN = 64
+ITERATIONS = 2000
+
+##########################################################################
+# methods
+###
+class Response:
+    """
+    Stand-in for the generated ``basicResponse`` message.
+    """
+    def __init__(self, data="", bytesData=b""):
+        self.data = data
+        self.bytesData = bytesData
+
+def measure(name, encode, decode):
+    payload = encode()
+    encodeTime = timeit.timeit(encode, number=ITERATIONS) / ITERATIONS * 1e6
+    decodeTime = timeit.timeit(lambda: decode(payload), number=ITERATIONS) / ITERATIONS * 1e6
+    size = len(payload.encode("utf-8") if isinstance(payload, str) else payload)
+    print("{:<28} {:>10.2f} {:>10.2f} {:>10}".format(name, encodeTime, decodeTime, size))
+
+def main():
+    produced = [random.randrange(256) for _ in range(IO_LEN)]
+    consumed = [random.randrange(256) for _ in range(IO_LEN)]
+    message = [random.randrange(256) for _ in range(CMTP_BUFFER_LEN)]
+    pingStats = {"transmitted": 10, "received": 10, "duplicated": 0, "lastRTT": 1.0, "maxRTT": 3.0, "minRTT": 1.0, "avrRTT": 1.5, "sumRTT": 15.0, "sendErrorCode": 0, "recvErrorCode": 0}
+    print("{:<28} {:>10} {:>10} {:>10}".format("payload", "encode us", "decode us", "bytes"))
+    # read io response
+    measure("read io json",
+        lambda: json.dumps({"produced": produced, "consumed": consumed}),
+        lambda payload: json.loads(Response(data=payload).data))
+    measure("read io binary",
+        lambda: capi_payload.encodeIO(produced, consumed),
+        lambda payload: capi_payload.decodeIO(Response(bytesData=payload)))
+    # write io request
+    measure("write io pickle",
+        lambda: pickle.dumps(tuple(produced)),
+        lambda payload: pickle.loads(payload))
+    measure("write io binary",
+        lambda: capi_payload.encodeIO(produced),
+        lambda payload: capi_payload.decodeIO(Response(bytesData=payload)))
+    # send message request
+    measure("message request pickle",
+        lambda: pickle.dumps(message),
+        lambda payload: pickle.loads(payload))
+    measure("message request binary",
+        lambda: capi_payload.PAYLOAD_HEADER.pack(capi_payload.PAYLOAD_MAGIC, capi_payload.PAYLOAD_VERSION, capi_payload.MESSAGE_PAYLOAD) + bytes(message),
+        lambda payload: bytes(memoryview(payload)[capi_payload.PAYLOAD_HEADER.size:]))
+    # send message response
+    measure("message response json",
+        lambda: json.dumps({"status": 0, "service": 20, "size": 6, "data": message}),
+        lambda payload: json.loads(Response(data=payload).data))
+    measure("message response binary",
+        lambda: capi_payload.encodeMessageResponse(0, 20, 6, message),
+        lambda payload: capi_payload.decodeMessage(Response(bytesData=payload)))
+    # ping stats response
+    measure("ping stats json",
+        lambda: json.dumps(pingStats),
+        lambda payload: json.loads(Response(data=payload).data))
+    measure("ping stats binary",
+        lambda: capi_payload.encodePingStats(pingStats),
+        lambda payload: capi_payload.decodePingStats(Response(bytesData=payload)))
+
+if __name__ == "__main__":
+    main()
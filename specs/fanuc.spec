@@ -336,7 +336,6 @@ The card will run an arp test
 * ARP unregister
 * Wait "1"
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "5" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -365,7 +364,6 @@ The card will run an arp test
 * ARP unregister
 * Wait "1"
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "10" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -397,7 +395,6 @@ The card will run an arp test
 * Wait "15"
 * ARP unregister
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "4" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -425,7 +422,6 @@ The card will run an arp test
 * Wait "25"
 * ARP unregister
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "10" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -453,7 +449,6 @@ The card will run an arp test
 * Wait "25"
 * ARP unregister
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "10" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -481,7 +476,6 @@ The card will run an arp test
 * Wait "30"
 * ARP unregister
 * Wireshark stop
-* Wireshark generate json "./wireshark.cap"
 * Wireshark arp count "10" "192.168.1.10" "192.168.1.12"
 * Unreserve "profinet1"
 
@@ -47,55 +47,69 @@ Verify device can connect to Allen Bradley PLC
 * Wait "10"
 * PyLogix connect
 * Wait "5"
-* PyLogix read tag "Osprey_MVP_2:I.ConnectionFaulted" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].7" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].7" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].4" value "1" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].5" value "1" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].6" value "1" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].7" value "1" check "False"
+* PyLogix read tags check "False"
+
+   |tag                             |
+   |--------------------------------|
+   |Osprey_MVP_2:I.ConnectionFaulted|
+   |Osprey_MVP_2:O.Data[0].4        |
+   |Osprey_MVP_2:O.Data[0].5        |
+   |Osprey_MVP_2:O.Data[0].6        |
+   |Osprey_MVP_2:O.Data[0].7        |
+   |Osprey_MVP_2:I.Data[0].4        |
+   |Osprey_MVP_2:I.Data[0].5        |
+   |Osprey_MVP_2:I.Data[0].6        |
+   |Osprey_MVP_2:I.Data[0].7        |
+
+* PyLogix write tags "Osprey_MVP_2:O.Data[0].4,Osprey_MVP_2:O.Data[0].5,Osprey_MVP_2:O.Data[0].6,Osprey_MVP_2:O.Data[0].7" value "1" check "False"
 * Wait "2"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].7" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].7" check "False"
+* PyLogix read tags check "False"
+
+   |tag                     |
+   |------------------------|
+   |Osprey_MVP_2:O.Data[0].4|
+   |Osprey_MVP_2:O.Data[0].5|
+   |Osprey_MVP_2:O.Data[0].6|
+   |Osprey_MVP_2:O.Data[0].7|
+   |Osprey_MVP_2:I.Data[0].4|
+   |Osprey_MVP_2:I.Data[0].5|
+   |Osprey_MVP_2:I.Data[0].6|
+   |Osprey_MVP_2:I.Data[0].7|
+
 * Wait "2"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].4" value "0" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].5" value "0" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].6" value "0" check "False"
-* PyLogix write tag "Osprey_MVP_2:O.Data[0].7" value "0" check "False"
+* PyLogix write tags "Osprey_MVP_2:O.Data[0].4,Osprey_MVP_2:O.Data[0].5,Osprey_MVP_2:O.Data[0].6,Osprey_MVP_2:O.Data[0].7" value "0" check "False"
 * Wait "2"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0].7" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].4" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].5" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].6" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0].7" check "False"
+* PyLogix read tags check "False"
+
+   |tag                     |
+   |------------------------|
+   |Osprey_MVP_2:O.Data[0].4|
+   |Osprey_MVP_2:O.Data[0].5|
+   |Osprey_MVP_2:O.Data[0].6|
+   |Osprey_MVP_2:O.Data[0].7|
+   |Osprey_MVP_2:I.Data[0].4|
+   |Osprey_MVP_2:I.Data[0].5|
+   |Osprey_MVP_2:I.Data[0].6|
+   |Osprey_MVP_2:I.Data[0].7|
+
 * Wait "2"
-* PyLogix read tag "Osprey_MVP_2:O.Data[0]" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[1]" check "False"
-* PyLogix read tag "Osprey_MVP_2:O.Data[2]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[0]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[1]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[2]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[3]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[4]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[5]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[6]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[7]" check "False"
-* PyLogix read tag "Osprey_MVP_2:I.Data[8]" check "False"
+* PyLogix read tags check "False"
+
+   |tag                   |
+   |----------------------|
+   |Osprey_MVP_2:O.Data[0]|
+   |Osprey_MVP_2:O.Data[1]|
+   |Osprey_MVP_2:O.Data[2]|
+   |Osprey_MVP_2:I.Data[0]|
+   |Osprey_MVP_2:I.Data[1]|
+   |Osprey_MVP_2:I.Data[2]|
+   |Osprey_MVP_2:I.Data[3]|
+   |Osprey_MVP_2:I.Data[4]|
+   |Osprey_MVP_2:I.Data[5]|
+   |Osprey_MVP_2:I.Data[6]|
+   |Osprey_MVP_2:I.Data[7]|
+   |Osprey_MVP_2:I.Data[8]|
+
 * PyLogix disconnect
 * Wireshark stop
 
@@ -0,0 +1,193 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Selenium Browser Pool for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Suite scoped pool of Selenium web drivers used by ``selenium.py``.
+
+``Selenium connect`` checks a driver out of the pool and ``Selenium disconnect`` returns it, so the browser is only started once per suite and type. On every checkout the driver is reset: extra windows are closed, cookies, local and session storage are cleared and the page is ``about:blank``. A driver that fails the reset is quit and replaced. Browsers named in ``selenium_prewarm`` (ie. ``chrome``) are started in the background when the suite starts.
+
+With ``selenium_headless`` true (default) the browsers run headless and no X display is needed. Otherwise one ``pyvirtualdisplay`` Xvfb display is started for the pool and the browsers run in it.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import data_store
+from step_impl import report
+import os
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+try:
+    from pyvirtualdisplay import Display
+except Exception as exc:
+    print("import pyvirtualdisplay:: {} occured: {}".format(type(exc).__name__, exc))
+
+##########################################################################
+# constants
+###
+BROWSER_TYPES = ("chrome", "firefox")
+WINDOW_SIZE = (1920, 1080)
+CHECKOUT_TIMEOUT = 120
+
+##########################################################################
+# browser pool
+###
+class BrowserPool:
+    """
+    Idle web drivers of each browser type.
+
+    Args:
+        headless (bool, optional): Run the browsers headless without Xvfb. Defaults to ``selenium_headless``.
+    """
+    def __init__(self, headless=None):
+        if headless is None:
+            headless = os.getenv("selenium_headless", "true").strip().lower() == "true"
+        self.headless = headless
+        self.display = None
+        self.idle = {}
+        self.warming = {}
+        self.condition = threading.Condition()
+
+    def launch(self, browserType):
+        """
+        Starts a new browser.
+
+        Args:
+            browserType (string): chrome or firefox.
+
+        Returns:
+            WebDriver: Driver of the new browser.
+        """
+        with self.condition:
+            if not self.headless and self.display is None:
+                self.display = Display(visible=0, size=WINDOW_SIZE)
+                self.display.start()
+        if browserType == "firefox":
+            options = webdriver.FirefoxOptions()
+            if self.headless:
+                options.add_argument("--headless")
+            driver = webdriver.Firefox(options=options, executable_path="{}/selenium_library/drivers/geckodriver".format(os.getenv("workspace_path")))
+        elif browserType == "chrome":
+            options = Options()
+            options.add_argument("--no-sandbox")
+            if self.headless:
+                options.add_argument("--headless")
+            driver = webdriver.Chrome(chrome_options=options)
+        else:
+            raise ValueError("only {} are supported currently".format(" and ".join(BROWSER_TYPES)))
+        driver.set_window_size(*WINDOW_SIZE)
+        return driver
+
+    def reset(self, driver):
+        """
+        Brings a used driver back to a clean state: one window, no cookies or storage, ``about:blank``.
+
+        Args:
+            driver (WebDriver): Driver to reset.
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            # storage belongs to the origin of the current page, about:blank has none
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass
+        if hasattr(driver, "execute_cdp_cmd"):
+            # chrome clears the cookies of all domains, not only the current one
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def checkout(self, browserType, timeout=CHECKOUT_TIMEOUT):
+        """
+        Returns a reset idle driver, waits for a browser that is being prewarmed or starts a new one.
+
+        Args:
+            browserType (string): chrome or firefox.
+            timeout (float, optional): Seconds to wait for a prewarmed browser. Defaults to ``CHECKOUT_TIMEOUT``.
+
+        Returns:
+            WebDriver: Driver checked out of the pool.
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.idle.get(browserType) or not self.warming.get(browserType), timeout)
+                driver = self.idle[browserType].pop() if self.idle.get(browserType) else None
+            if driver is None:
+                return self.launch(browserType)
+            try:
+                self.reset(driver)
+                return driver
+            except Exception as exc:
+                report.writeMessage("Pooled {} browser failed the reset, {}: {}".format(browserType, type(exc).__name__, exc), report.DEBUG)
+                self.quit(driver)
+
+    def checkin(self, browserType, driver):
+        """
+        Returns a driver to the pool.
+
+        Args:
+            browserType (string): chrome or firefox.
+            driver (WebDriver): Driver checked out of the pool.
+        """
+        with self.condition:
+            self.idle.setdefault(browserType, []).append(driver)
+            self.condition.notify_all()
+
+    def prewarm(self, browserType, count=1):
+        """
+        Starts browsers in the background and adds them to the pool.
+
+        Args:
+            browserType (string): chrome or firefox.
+            count (int, optional): Number of browsers. Defaults to 1.
+        """
+        def warm():
+            try:
+                driver = self.launch(browserType)
+            except Exception as exc:
+                print("prewarm {}:: {} occured: {}".format(browserType, type(exc).__name__, exc))
+                driver = None
+            with self.condition:
+                self.warming[browserType] -= 1
+                if driver is not None:
+                    self.idle.setdefault(browserType, []).append(driver)
+                self.condition.notify_all()
+        with self.condition:
+            self.warming[browserType] = self.warming.get(browserType, 0) + count
+        for _ in range(count):
+            threading.Thread(target=warm, name="prewarm-{}".format(browserType), daemon=True).start()
+
+    def quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """
+        Quits all idle browsers and stops the display.
+        """
+        with self.condition:
+            drivers = [driver for drivers in self.idle.values() for driver in drivers]
+            self.idle = {}
+        for driver in drivers:
+            self.quit(driver)
+        if self.display is not None:
+            self.display.stop()
+            self.display = None
+
+def getBrowserPool():
+    """
+    Returns the suite browser pool stored in ``data_store.suite["seleniumPool"]``, creating it on first use.
+    """
+    if "seleniumPool" not in data_store.suite or data_store.suite["seleniumPool"] is None:
+        data_store.suite["seleniumPool"] = BrowserPool()
+    return data_store.suite["seleniumPool"]
@@ -15,11 +15,13 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, after_scenario, before_scenario
+from getgauge.python import step, data_store, after_scenario, before_scenario
 import time
 import os
 import sys
-import struct
+from step_impl.latency_histogram import LatencyHistogram
+from step_impl import report, cmtp_layout, hex_dump, device_context, config_store
+from step_impl.device_readiness import DeviceReadiness
 sys.path.append(r"../capi_library")
 try:
     from CAPILibrary import CAPIController
@@ -29,7 +31,12 @@ except Exception as exc:
 ##########################################################################
 # constants
 ###
-CMTP_BUFFER_LEN = 1024
+IO_POLL_MIN_INTERVAL = 0.002
+IO_POLL_MAX_INTERVAL = 0.05
+LATENCY_TIMEOUT_NS = 2000000000
+LATENCY_POLL_INTERVAL = 0.001
+CONFIG_COMPRESS_THROUGHPUT = 1000000
+CONFIG_COMPRESS_MIN_SAVING = 0.1
 
 ##########################################################################
 # before scenario setup
@@ -47,6 +54,12 @@ def beforeScenarioHook():
         * data_store.scenario["safeEnabled"] is set to know to call Safe Disabled in the After Scenario if it wasn't called
         * data_store.scenario["pingOpen"] is set to know to call Ping Close in the After Scenario if it wasn't called
         * data_store.scenario["arpRegistered"] is set to know to call ARP Unregister in the After Scenario if it wasn't called
+        * data_store.scenario["ioWriteTime"] is set by Write IO so Wait for input can measure the IO round trip
+        * data_store.scenario["ioLatency"] collects the round trip of each Wait for input in ms, reported in the After Scenario
+        * data_store.scenario["configOnDevice"] is set by Check device configuration to skip the configuration download steps
+        * data_store.scenario["resetTime"] is set by Soft reset device so Wait for device ready can measure the time to ready
+        * data_store.scenario["readiness"] collects the timing of each apply, reset and ready wait, reported in the After Scenario
+        * data_store.scenario["configDownloads"] collects the size and time of each configuration write block, reported in the After Scenario
     """
     data_store.scenario["capiController"] = None
     data_store.scenario["init"] = False
@@ -57,7 +70,13 @@ def beforeScenarioHook():
     data_store.scenario["safeEnabled"] = False
     data_store.scenario["pingOpen"] = False
     data_store.scenario["arpRegistered"] = False
-    Messages.write_message("capi before scenario completed")
+    data_store.scenario["ioWriteTime"] = None
+    data_store.scenario["ioLatency"] = []
+    data_store.scenario["configOnDevice"] = False
+    data_store.scenario["resetTime"] = None
+    data_store.scenario["readiness"] = []
+    data_store.scenario["configDownloads"] = []
+    report.writeMessage("capi before scenario completed", report.DEBUG)
 
 ##########################################################################
 # standard card methods
@@ -79,7 +98,7 @@ def init():
     """
     data_store.scenario["capiController"] = CAPIController()
     results = data_store.scenario["capiController"].init()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Init failed"
     data_store.scenario["init"] = True
 ###
@@ -102,7 +121,7 @@ def enumDrivers(index):
         * Enum drivers "0"
     """
     results = data_store.scenario["capiController"].enumDrivers(int(index))
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Enum drivers failed"
 ###
 # open interface at index
@@ -110,7 +129,7 @@ def enumDrivers(index):
 @step("Open interface <index>")
 def openInterface(index):
     """
-    Call CAPI Open Interface method.
+    Call CAPI Open Interface method. The index is offset by ``capi_interface_offset`` so parallel streams open their own card, see ``device_context.py``.
 
     Args:
         index (int): Card index.
@@ -123,8 +142,8 @@ def openInterface(index):
     Example usage:
         * Open interface "0"
     """
-    results = data_store.scenario["capiController"].openInterface(int(index))
-    Messages.write_message(results["description"])
+    results = data_store.scenario["capiController"].openInterface(device_context.interfaceIndex(index))
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Open interface failed"
     data_store.scenario["openInterface"] = True
 ###
@@ -147,21 +166,21 @@ def getCardInfo():
         * Get card info
     """
     results = data_store.scenario["capiController"].getCardInfo()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get card info failed"
     data_store.scenario["productName"] = str(results["data"]["productName"])
-    Messages.write_message("Product name: {}".format(data_store.scenario["productName"]))
+    report.writeMessage("Product name: {}".format(data_store.scenario["productName"]))
     data_store.scenario["ipAddr"] = str(results["data"]["ipAddr"])
-    Messages.write_message("IP addr: {}".format(data_store.scenario["ipAddr"]))
+    report.writeMessage("IP addr: {}".format(data_store.scenario["ipAddr"]))
     data_store.scenario["firmwareVersion"] = str(results["data"]["firmwareVersion"])
-    Messages.write_message("Firmware version: {}".format(data_store.scenario["firmwareVersion"]))
+    report.writeMessage("Firmware version: {}".format(data_store.scenario["firmwareVersion"]))
 ###
 # soft reset
 ###
 @step("Soft reset device")
 def softResetDevice():
     """
-    Calls CAPI method to soft reset the DUT device.
+    Calls CAPI method to soft reset the DUT device. Skipped once if Check device configuration found the configuration already on the device.
 
     Step and function definition::
 
@@ -171,9 +190,15 @@ def softResetDevice():
     Example usage:
         * Soft reset device
     """
+    if data_store.scenario["configOnDevice"]:
+        # last step of the configuration download, later soft resets run again
+        data_store.scenario["configOnDevice"] = False
+        report.writeMessage("Configuration already on device, soft reset skipped")
+        return
     results = data_store.scenario["capiController"].softReset()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Soft reset failed"
+    data_store.scenario["resetTime"] = time.monotonic()
 ###
 # start standard connections
 ###
@@ -194,10 +219,10 @@ def startStandardConnection(index):
         * Start standard connections "0"
     """
     results = data_store.scenario["capiController"].refreshIO()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Refresh io failed"
     results = data_store.scenario["capiController"].startAllConnections()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Start all connections failed"
     data_store.scenario["capiController"].startProduce(int(index))
     assert data_store.scenario["capiController"].produceFunctionStop == False
@@ -221,7 +246,7 @@ def startProtocol():
         * Start protocol
     """
     results = data_store.scenario["capiController"].startProtocol()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Start protocol failed"
     data_store.scenario["startProtocol"] = False
 ###
@@ -241,7 +266,7 @@ def stopProtocol():
         * Stop protocol
     """
     results = data_store.scenario["capiController"].stopProtocol()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Stop protocol failed"
 ###
 # get connection info
@@ -262,12 +287,12 @@ def getConnectionInfo():
         * Get connection info
     """
     results = data_store.scenario["capiController"].getConnectionInfo()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get connection info failed"
     data_store.scenario["numConnections"] = results["data"]["numConnections"]
-    Messages.write_message("Number of connections: {}".format(data_store.scenario["numConnections"]))
+    report.writeMessage("Number of connections: {}".format(data_store.scenario["numConnections"]))
     data_store.scenario["numActConnections"] = results["data"]["numActConnections"]
-    Messages.write_message("Active connections: {}".format(data_store.scenario["numActConnections"]))
+    report.writeMessage("Active connections: {}".format(data_store.scenario["numActConnections"]))
 ###
 # get state
 ###
@@ -291,14 +316,14 @@ def getState():
         * Get state
     """
     results = data_store.scenario["capiController"].readState()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get state info failed"
-    Messages.write_message("State: {}".format(results["data"]["state"]))
-    Messages.write_message("IO State: {}".format(results["data"]["ioState"]))
-    Messages.write_message("Ch1 State: {}".format(results["data"]["ch1State"]))
-    Messages.write_message("Ch2 State: {}".format(results["data"]["ch2State"]))
-    Messages.write_message("Ch1 IO State: {}".format(results["data"]["ch1IOState"]))
-    Messages.write_message("Ch2 IO State: {}".format(results["data"]["ch2IOState"]))
+    report.writeMessage("State: {}".format(results["data"]["state"]))
+    report.writeMessage("IO State: {}".format(results["data"]["ioState"]))
+    report.writeMessage("Ch1 State: {}".format(results["data"]["ch1State"]))
+    report.writeMessage("Ch2 State: {}".format(results["data"]["ch2State"]))
+    report.writeMessage("Ch1 IO State: {}".format(results["data"]["ch1IOState"]))
+    report.writeMessage("Ch2 IO State: {}".format(results["data"]["ch2IOState"]))
 ###
 # read io
 ###
@@ -318,19 +343,19 @@ def readIO():
         * Read IO
     """
     results = data_store.scenario["capiController"].readIO()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Read io failed"
     data_store.scenario["producedIO"] = results["data"]["produced"]
-    Messages.write_message("Produced: {}".format(data_store.scenario["producedIO"]))
+    report.writeMessage("Produced: {}".format(data_store.scenario["producedIO"]))
     data_store.scenario["consumedIO"] = results["data"]["consumed"]
-    Messages.write_message("Consumed: {}".format(data_store.scenario["consumedIO"]))
+    report.writeMessage("Consumed: {}".format(data_store.scenario["consumedIO"]))
 ###
 # write io
 ###
 @step("Write IO <value>")
 def writeIO(value):
     """
-    Calls the CAPI Write IO method and sets the produced data to the value given.
+    Calls the CAPI Write IO method and sets the produced data to the value given. The Step returns right after the write, follow it with Wait for input to see the value arrive.
 
     Args:
         value (int): Value to set IO.
@@ -347,10 +372,57 @@ def writeIO(value):
     newProduceData[0] = int(value)
     newProduceData = tuple(newProduceData)
     results = data_store.scenario["capiController"].writeProducedIO(newProduceData)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Write io failed"
-    Messages.write_message("Write: {}".format(newProduceData))
-    time.sleep(data_store.scenario["capiController"].produceFunctionDuty)
+    report.writeMessage("Write: {}".format(newProduceData))
+    data_store.scenario["ioWriteTime"] = time.perf_counter()
+###
+# wait for input
+###
+@step("Wait for input <value> within <timeoutMs>")
+def waitForInput(value, timeoutMs):
+    """
+    Polls the CAPI Read IO method until ``data_store.scenario["consumedIO"][0]`` matches the given value or the timeout expires. The poll interval starts at ``IO_POLL_MIN_INTERVAL`` and doubles up to ``IO_POLL_MAX_INTERVAL``, so the step returns as soon as the value arrives.
+
+    The latency from the last Write IO (or from the start of the step) is written to the report and stored in ``data_store.scenario["ioLatency"]``.
+
+    Args:
+        value (int): Value of IO.
+        timeoutMs (int): Timeout in ms.
+
+    Step and function definition::
+
+        @step("Wait for input <value> within <timeoutMs>")
+        def waitForInput(value, timeoutMs):
+
+    Example usage:
+        * Wait for input "1" within "2000"
+    """
+    start = time.perf_counter()
+    if data_store.scenario["ioWriteTime"] is not None:
+        start = data_store.scenario["ioWriteTime"]
+    deadline = time.perf_counter() + int(timeoutMs) / 1000.0
+    interval = IO_POLL_MIN_INTERVAL
+    reads = 0
+    while True:
+        results = data_store.scenario["capiController"].readIO()
+        reads += 1
+        assert results["result"] == 0, "Read io failed"
+        if results["data"]["consumed"][0] == int(value):
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, IO_POLL_MAX_INTERVAL)
+    latency = (time.perf_counter() - start) * 1000
+    data_store.scenario["ioWriteTime"] = None
+    data_store.scenario["producedIO"] = results["data"]["produced"]
+    data_store.scenario["consumedIO"] = results["data"]["consumed"]
+    report.writeMessage("Consumed: {}".format(data_store.scenario["consumedIO"]))
+    report.writeMessage("Input latency: {:.1f} ms ({} reads)".format(latency, reads))
+    verifyInput(value)
+    data_store.scenario["ioLatency"].append(latency)
 ###
 # start all connections
 ###
@@ -368,7 +440,7 @@ def startAllConnections():
         * Start all connections
     """
     results = data_store.scenario["capiController"].startAllConnections()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Start all connections failed"
 ###
 # refresh io
@@ -387,7 +459,7 @@ def refreshIO():
         * Refresh IO
     """
     results = data_store.scenario["capiController"].refreshIO()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Refresh io failed"
 ###
 # ping open
@@ -420,7 +492,7 @@ def pingOpen(ip, interval, length):
     if length == 0:
         length = 10
     results = data_store.scenario["capiController"].pingOpen(ip, interval, length)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Ping open failed"
     data_store.scenario["pingOpen"] = True
 ###
@@ -440,7 +512,7 @@ def pingClose():
         * Ping close
     """
     results = data_store.scenario["capiController"].pingClose()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Ping close failed"
     data_store.scenario["pingOpen"] = False
 ###
@@ -470,29 +542,29 @@ def getPingStats():
         * Get ping stats
     """
     results = data_store.scenario["capiController"].pingGetStats()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get ping stats failed"
     if results["data"] != "":
         data_store.scenario["transmitted"] = str(results["data"]["transmitted"])
-        Messages.write_message("Number of transmitted PING requests: {}".format(data_store.scenario["transmitted"]))
+        report.writeMessage("Number of transmitted PING requests: {}".format(data_store.scenario["transmitted"]))
         data_store.scenario["received"] = str(results["data"]["received"])
-        Messages.write_message("Number of received PING reply packets: {}".format(data_store.scenario["received"]))
+        report.writeMessage("Number of received PING reply packets: {}".format(data_store.scenario["received"]))
         data_store.scenario["duplicated"] = str(results["data"]["duplicated"])
-        Messages.write_message("Number of duplicated PING reply packets: {}".format(data_store.scenario["duplicated"]))
+        report.writeMessage("Number of duplicated PING reply packets: {}".format(data_store.scenario["duplicated"]))
         data_store.scenario["lastRTT"] = str(results["data"]["lastRTT"])
-        Messages.write_message("Round trip time of the last PING in millisec: {}".format(data_store.scenario["lastRTT"]))
+        report.writeMessage("Round trip time of the last PING in millisec: {}".format(data_store.scenario["lastRTT"]))
         data_store.scenario["maxRTT"] = str(results["data"]["maxRTT"])
-        Messages.write_message("Maximum round trip time in millisec: {}".format(data_store.scenario["maxRTT"]))
+        report.writeMessage("Maximum round trip time in millisec: {}".format(data_store.scenario["maxRTT"]))
         data_store.scenario["minRTT"] = str(results["data"]["minRTT"])
-        Messages.write_message("Minimum round trip time in millisec: {}".format(data_store.scenario["minRTT"]))
+        report.writeMessage("Minimum round trip time in millisec: {}".format(data_store.scenario["minRTT"]))
         data_store.scenario["avrRTT"] = str(results["data"]["avrRTT"])
-        Messages.write_message("Average round trip time in millisec: {}".format(data_store.scenario["avrRTT"]))
+        report.writeMessage("Average round trip time in millisec: {}".format(data_store.scenario["avrRTT"]))
         data_store.scenario["sumRTT"] = str(results["data"]["sumRTT"])
-        Messages.write_message("Sum of all round trip time in millisec: {}".format(data_store.scenario["sumRTT"]))
+        report.writeMessage("Sum of all round trip time in millisec: {}".format(data_store.scenario["sumRTT"]))
         data_store.scenario["sendErrorCode"] = str(results["data"]["sendErrorCode"])
-        Messages.write_message("PING send request error code if any: {}".format(data_store.scenario["sendErrorCode"]))
+        report.writeMessage("PING send request error code if any: {}".format(data_store.scenario["sendErrorCode"]))
         data_store.scenario["recvErrorCode"] = str(results["data"]["recvErrorCode"])
-        Messages.write_message("PING recv error code if any: {}".format(data_store.scenario["recvErrorCode"]))
+        report.writeMessage("PING recv error code if any: {}".format(data_store.scenario["recvErrorCode"]))
     else:
         assert False, "Returned with empty data"
 ###
@@ -512,11 +584,11 @@ def getPingErrorNo():
         * Get ping error no
     """
     results = data_store.scenario["capiController"].pingGetErrNo()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get ping error no failed"
     if results["data"] != "":
         data_store.scenario["pingErrNo"] = hex(results["data"]["pingErrNo"])
-        Messages.write_message("Last error Number: {}".format(data_store.scenario["pingErrNo"]))
+        report.writeMessage("Last error Number: {}".format(data_store.scenario["pingErrNo"]))
     else:
         assert False, "Returned with empty data"
 ###
@@ -536,7 +608,7 @@ def arpRegister():
         * ARP register
     """
     results = data_store.scenario["capiController"].arpRegister()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ARP register failed"
     data_store.scenario["arpRegistered"] = True
 ###
@@ -561,7 +633,7 @@ def arpUse(ip):
     ip = list(map(int, ip.split(".")))
     assert len(ip) == 4, "IP address is wrong"
     results = data_store.scenario["capiController"].arpUse(ip)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ARP use failed"
 ###
 # arp start
@@ -594,7 +666,7 @@ def arpStart(ip, probe, interval, timeout):
     timeout = int(timeout)
     data_store.scenario["arpStartTime"] = time.time()
     results = data_store.scenario["capiController"].arpStart(ip, probe, interval, timeout)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ARP start failed"
 ###
 # arp cancel
@@ -618,7 +690,7 @@ def arpCancel(ip):
     ip = list(map(int, ip.split(".")))
     assert len(ip) == 4, "IP address formar is wrong"
     results = data_store.scenario["capiController"].arpCancel(ip)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ARP cancel failed"
 ###
 # arp unregister
@@ -637,7 +709,7 @@ def arpUnregister():
         * ARP unregister
     """
     results = data_store.scenario["capiController"].arpUnregister()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ARP unregister failed"
     data_store.scenario["arpRegistered"] = False
 ###
@@ -661,7 +733,7 @@ def hbStart(heartBeat):
      """
     heartBeat = int(heartBeat)
     results = data_store.scenario["capiController"].startHeartBeatHC(heartBeat)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "HB start failed"
 ###
 # hb stop
@@ -680,7 +752,7 @@ def hbStop():
         * HB stop
      """
     results = data_store.scenario["capiController"].stopHeartBeatHC()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "HB stop failed"
 ###
 # hb fail
@@ -699,7 +771,7 @@ def hbFail():
         * HB fail
      """
     results = data_store.scenario["capiController"].failHeartBeatHC()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "HB fail failed"
 ###
 # poll start
@@ -722,7 +794,7 @@ def pollStart(dutyCycle):
      """
     dutyCycle = int(dutyCycle)
     results = data_store.scenario["capiController"].startPollCH(dutyCycle)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Poll start failed"
 ###
 # poll stop
@@ -741,7 +813,7 @@ def pollStop():
         * Poll stop
      """
     results = data_store.scenario["capiController"].stopPollCH()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Poll stop failed"
 ###
 # change connection state
@@ -768,7 +840,7 @@ def changeConnectionState(index, state):
     index = int(index)
     state = bool(int(state))
     results = data_store.scenario["capiController"].changeConnectionState(index, state)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Change connection state"
 ###
 # get io status
@@ -793,12 +865,12 @@ def getIOStatus(index):
      """
     index = int(index)
     results = data_store.scenario["capiController"].getIOStatus(index)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get IO status failed"
     data_store.scenario["producedStatus"] = results["data"]["producedStatus"]
-    Messages.write_message("Produced Status: {}".format(data_store.scenario["producedStatus"]))
+    report.writeMessage("Produced Status: {}".format(data_store.scenario["producedStatus"]))
     data_store.scenario["consumedStatus"] = results["data"]["consumedStatus"]
-    Messages.write_message("Consumed Status: {}".format(data_store.scenario["consumedStatus"]))
+    report.writeMessage("Consumed Status: {}".format(data_store.scenario["consumedStatus"]))
 ###
 # send blink message
 ###
@@ -821,37 +893,20 @@ def sendMessageBlink(byMac, dataLength):
      """
     assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 20
-    for i, mac in enumerate(byMac.split(":")):
-        data[i] = int("0x{}".format(mac), 0)
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage("blink", byMac=cmtp_layout.macBytes(byMac))
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send set ip message
@@ -881,52 +936,26 @@ def sendMessageSetName(dwRemanent, dwNameLength, szName, byMac, dataLength):
     assert int(dwNameLength) == len(szName), "szName and dwNameLength are not equal in size"
     assert int(dwRemanent) < 4294967296, "dwRemanent is too large, needs to be less than 4294967296"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 22
-    # set request type, 0 is volatile 1 is permenant
-    dwRemanentOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwRemanent))):
-        data[i + dwRemanentOffset] = num
-    # set name length
-    dwNameLengthOffset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwNameLength))):
-        data[i + dwNameLengthOffset] = num
-    # set name
-    szNameOffset = 32 - 24
-    for i, stringNum in enumerate(bytes(szName, "utf-8")):
-        data[i + szNameOffset] = stringNum
-    # set MAC
-    byMacOffset = 272 - 24
-    for i, mac in enumerate(byMac.split(":")):
-        data[i + byMacOffset] = int("0x{}".format(mac), 0)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage(
+        "set name",
+        dwRemanent = int(dwRemanent),
+        dwNameLength = int(dwNameLength),
+        szName = bytes(szName, "utf-8"),
+        byMac = cmtp_layout.macBytes(byMac)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send set ip message
@@ -960,60 +989,28 @@ def sendMessageSetIP(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGateway, byMa
     assert int(dwRemanent) < 4294967296, "dwRemanent is too large, needs to be less than 4294967296"
     assert int(dwIPMode) < 4294967296, "dwIPMode is too large, needs to be less than 4294967296"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 23
-    # set request type, 0 is volatile 1 is permenant
-    dwRemanentOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwRemanent))):
-        data[i + dwRemanentOffset] = num
-    # set IP mode, 1 for static
-    dwIPModeOffset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwIPMode))):
-        data[i + dwIPModeOffset] = num
-    # set IP Addr
-    byIPAddrOffset = 32 - 24
-    for i, ip in enumerate(byIPAddr.split(".")):
-        data[i + byIPAddrOffset] = int("{}".format(ip), 0)
-    # set IP Mask
-    byIPMaskOffset = 36 - 24
-    for i, ip in enumerate(byIPMask.split(".")):
-        data[i + byIPMaskOffset] = int("{}".format(ip), 0)
-    # set IP Gateway
-    byIPGatewayOffset = 40 - 24
-    for i, ip in enumerate(byIPGateway.split(".")):
-        data[i + byIPGatewayOffset] = int("{}".format(ip), 0)
-    # set MAC
-    byMacOffset = 44 - 24
-    for i, mac in enumerate(byMac.split(":")):
-        data[i + byMacOffset] = int("0x{}".format(mac), 0)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage(
+        "set ip",
+        dwRemanent = int(dwRemanent),
+        dwIPMode = int(dwIPMode),
+        byIPAddr = cmtp_layout.ipBytes(byIPAddr),
+        byIPMask = cmtp_layout.ipBytes(byIPMask),
+        byIPGateway = cmtp_layout.ipBytes(byIPGateway),
+        byMac = cmtp_layout.macBytes(byMac)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send read explicit message
@@ -1042,70 +1039,31 @@ def sendMessageReadExplicit(dwConfID, dwCrc32, wDeviceNumber, dwApi, wSlotNumber
     Example usage:
         * TBD
     """
-    assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 32
-    # set configuration ID
-    dwConfIDOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwConfID))):
-        data[i + dwConfIDOffset] = num
-    # set crc 32
-    dwCrc32Offset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwCrc32))):
-        data[i + dwCrc32Offset] = num
-    # set device number
-    wDeviceNumberOffset = 32 - 24
-    for i, num in enumerate(struct.pack('<h', int(wDeviceNumber))):
-        data[i + wDeviceNumberOffset] = num
-    # set api
-    dwApiOffset = 34 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwApi))):
-        data[i + dwApiOffset] = num
-    # set slot number
-    wSlotNumberOffset = 38 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSlotNumber))):
-        data[i + wSlotNumberOffset] = num
-    # set sub slot number
-    wSubSlotNumberOffset = 40 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSubSlotNumber))):
-        data[i + wSubSlotNumberOffset] = num
-    # set index
-    wIndexOffset = 42 - 24
-    for i, num in enumerate(struct.pack('<h', int(wIndex))):
-        data[i + wSubSlotNumberOffset] = num
-    # set length data to read
-    wLengthDataToReadOffset = 44 - 24
-    for i, num in enumerate(struct.pack('<h', int(wLengthDataToRead))):
-        data[i + wLengthDataToReadOffset] = num
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage(
+        "read explicit",
+        dwConfID = int(dwConfID),
+        dwCrc32 = int(dwCrc32),
+        wDeviceNumber = int(wDeviceNumber),
+        dwApi = int(dwApi),
+        wSlotNumber = int(wSlotNumber),
+        wSubSlotNumber = int(wSubSlotNumber),
+        wIndex = int(wIndex),
+        wLengthDataToRead = int(wLengthDataToRead)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send write explicit message
@@ -1134,71 +1092,35 @@ def sendMessageWriteExplicit(dwConfID, dwCrc32, wDeviceNumber, dwApi, wSlotNumbe
     Example usage:
         * TBD
     """
-    assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 32
-    # set configuration ID
-    dwConfIDOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwConfID))):
-        data[i + dwConfIDOffset] = num
-    # set crc 32
-    dwCrc32Offset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwCrc32))):
-        data[i + dwCrc32Offset] = num
-    # set device number
-    wDeviceNumberOffset = 32 - 24
-    for i, num in enumerate(struct.pack('<h', int(wDeviceNumber))):
-        data[i + wDeviceNumberOffset] = num
-    # set api
-    dwApiOffset = 34 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwApi))):
-        data[i + dwApiOffset] = num
-    # set slot number
-    wSlotNumberOffset = 38 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSlotNumber))):
-        data[i + wSlotNumberOffset] = num
-    # set sub slot number
-    wSubSlotNumberOffset = 40 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSubSlotNumber))):
-        data[i + wSubSlotNumberOffset] = num
-    # set index
-    wIndexOffset = 42 - 24
-    for i, num in enumerate(struct.pack('<h', int(wIndex))):
-        data[i + wSubSlotNumberOffset] = num
-    # set data to write
-    dataToWriteOffset = 44 - 24
+    dataToWriteList = []
     for i, num in enumerate(dataToWrite.split(",")):
         assert int(num) < 256, "Number in dataToWrite list too large {} at index {}".format(num, i)
-        data[i + dataToWriteOffset] = int(num)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+        dataToWriteList.append(int(num))
+    serviceID, data = cmtp_layout.buildMessage(
+        "write explicit",
+        dwConfID = int(dwConfID),
+        dwCrc32 = int(dwCrc32),
+        wDeviceNumber = int(wDeviceNumber),
+        dwApi = int(dwApi),
+        wSlotNumber = int(wSlotNumber),
+        wSubSlotNumber = int(wSubSlotNumber),
+        wIndex = int(wIndex),
+        dataToWrite = bytes(dataToWriteList)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send identify message
@@ -1216,35 +1138,20 @@ def sendMessageIdentify():
     Example usage:
         * Send message identify
     """
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = 254
-    serviceID = 10
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage("identify")
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send get device detected message
@@ -1262,35 +1169,20 @@ def sendMessageGetDeviceDetected():
     Example usage:
         * Send message get device detected
     """
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = 254
-    serviceID = 11
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage("get device detected")
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 ###
 # send blink message
@@ -1314,37 +1206,20 @@ def sendMessageFactoryReset(byMac, dataLength):
     """
     assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 21
-    for i, mac in enumerate(byMac.split(":")):
-        data[i] = int("0x{}".format(mac), 0)
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Sending Service: {}".format(serviceID))
-    Messages.write_message("Sending Size: {}".format(dataLength))
-    Messages.write_message("Sending Data: \n{}".format(dataString))
+    serviceID, data = cmtp_layout.buildMessage("factory reset", byMac=cmtp_layout.macBytes(byMac))
+    dataString = hex_dump.hexDump(data, dataLength)
+    report.writeMessage("Sending Service: {}".format(serviceID))
+    report.writeMessage("Sending Size: {}".format(dataLength))
+    report.writeMessage("Sending Data: \n{}".format(dataString))
     results = data_store.scenario["capiController"].sendMessage(data, serviceID, dataLength)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Send message failed"
-    Messages.write_message("Received Status: {}".format(results["data"]["status"]))
-    Messages.write_message("Received Service: {}".format(results["data"]["service"]))
-    Messages.write_message("Received Size: {}".format(results["data"]["size"]))
-    dataString = ""
-    for i, resultData in enumerate(results["data"]["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-    Messages.write_message("Received Data: \n{}".format(dataString))
+    report.writeMessage("Received Status: {}".format(results["data"]["status"]))
+    report.writeMessage("Received Service: {}".format(results["data"]["service"]))
+    report.writeMessage("Received Size: {}".format(results["data"]["size"]))
+    dataString = hex_dump.hexDump(results["data"]["data"], results["data"]["size"])
+    report.writeMessage("Received Data: \n{}".format(dataString))
     assert results["data"]["status"] == 0, "Status from response is non-zero - {}".format(results["data"]["status"])
 
 ##########################################################################
@@ -1366,7 +1241,7 @@ def safeInit():
         * Safe init
     """
     results = data_store.scenario["capiController"].safeInit()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Safe init failed"
     data_store.scenario["safeInit"] = True
 ###
@@ -1375,7 +1250,7 @@ def safeInit():
 @step("Open safe interface <index>")
 def openSafeInterface(index):
     """
-    Calls the CAPI Open Safe Interface method at given index.
+    Calls the CAPI Open Safe Interface method at given index, offset by ``capi_interface_offset`` like Open interface.
 
     Args:
         index (int): Index of card.
@@ -1388,8 +1263,8 @@ def openSafeInterface(index):
     Example usage:
         * Open safe interface "0"
     """
-    results = data_store.scenario["capiController"].openSafeInterface(int(index))
-    Messages.write_message(results["description"])
+    results = data_store.scenario["capiController"].openSafeInterface(device_context.interfaceIndex(index))
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Open safe interface failed"
     data_store.scenario["safeOpenInterface"] = True
 ###
@@ -1409,7 +1284,7 @@ def readSafeConfig():
         * Read safe config
     """
     results = data_store.scenario["capiController"].readSafeConfig()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Read safe config failed"
 ###
 # enable safe connection
@@ -1428,7 +1303,7 @@ def enableSafeConnection():
         * Enable safe connection
     """
     results = data_store.scenario["capiController"].enableSafeConnection()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Enable safe connection failed"
     data_store.scenario["safeEnabled"] = True
 ###
@@ -1451,7 +1326,7 @@ def startSafeConnections(index):
         * Start safe connections "0"
     """
     results = data_store.scenario["capiController"].refreshSafeIO()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Refresh safe io failed"
     data_store.scenario["capiController"].startSafeProduce(0)
     assert data_store.scenario["capiController"].produceSafeFunctionStop == False
@@ -1475,12 +1350,12 @@ def readSafeIO():
         * Read safe IO
     """
     results = data_store.scenario["capiController"].readSafeIO()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Read safe io failed"
     data_store.scenario["producedSafeIO"] = results["data"]["produced"]
-    Messages.write_message("Safe Produced: {}".format(data_store.scenario["producedSafeIO"]))
+    report.writeMessage("Safe Produced: {}".format(data_store.scenario["producedSafeIO"]))
     data_store.scenario["consumedSafeIO"] = results["data"]["consumed"]
-    Messages.write_message("Safe Consumed: {}".format(data_store.scenario["consumedSafeIO"]))
+    report.writeMessage("Safe Consumed: {}".format(data_store.scenario["consumedSafeIO"]))
 ###
 # write safe io
 ###
@@ -1504,9 +1379,9 @@ def writeSafeIO(value):
     newProduceData[0] = int(value)
     newProduceData = tuple(newProduceData)
     results = data_store.scenario["capiController"].writeSafeProducedIO(newProduceData)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Write safe io failed"
-    Messages.write_message("Write: {}".format(newProduceData))
+    report.writeMessage("Write: {}".format(newProduceData))
     time.sleep(data_store.scenario["capiController"].produceSafeFunctionDuty)
 ###
 # change ncs
@@ -1528,7 +1403,7 @@ def changeNCS(value):
         * Change NCS "4"
     """
     results = data_store.scenario["capiController"].changeNCS(int(value))
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Change NCS failed"
 ###
 # get ncs
@@ -1549,19 +1424,19 @@ def getNCS():
         * Get NCS
     """
     results = data_store.scenario["capiController"].getNCS()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get NCS failed"
     data_store.scenario["producedNSC"] = results["data"]["producedNSC"]
-    Messages.write_message("Produced NCS: {}".format(data_store.scenario["producedNSC"]))
+    report.writeMessage("Produced NCS: {}".format(data_store.scenario["producedNSC"]))
     data_store.scenario["consumedNSC"] = results["data"]["consumedNSC"]
-    Messages.write_message("Consumed NCS: {}".format(data_store.scenario["consumedNSC"]))
+    report.writeMessage("Consumed NCS: {}".format(data_store.scenario["consumedNSC"]))
 ###
 # ncs loop
 ###
 @step("Get NCS loop <value>")
 def getNCSLoop(value):
     """
-    Calls the CAPI Get NCS method on a loop with given timeout value and prints the results to the Gauge report.
+    Calls the CAPI Get NCS method on a loop with given timeout value. Every result is written to the Gauge report at ``debug`` verbosity, the last one at ``info``.
 
     Args:
         value (int): Value for timeout in s.
@@ -1574,13 +1449,15 @@ def getNCSLoop(value):
     Example usage:
         * Get NCS loop "10"
     """
+    assert float(value) > 0, "Get NCS loop needs a timeout above 0, got {}".format(value)
     timeout = time.time() + float(value)
     while (time.time() < timeout):
         x = data_store.scenario["capiController"].getNCS()
-        Messages.write_message(x["description"])
-        Messages.write_message("Produced NCS: {}".format(x["data"]["producedNSC"]))
-        Messages.write_message("Produced NCS: {}".format(x["data"]["consumedNSC"]))
+        report.writeMessage(x["description"], report.DEBUG)
+        report.writeMessage("Produced NCS: {}".format(x["data"]["producedNSC"]), report.DEBUG)
+        report.writeMessage("Consumed NCS: {}".format(x["data"]["consumedNSC"]), report.DEBUG)
         time.sleep(0.5)
+    report.writeMessage("Produced NCS: {}, Consumed NCS: {}".format(x["data"]["producedNSC"], x["data"]["consumedNSC"]))
 ###
 # get safe io status
 ###
@@ -1604,16 +1481,57 @@ def getIOStatus(index):
     """
     index = int(index)
     results = data_store.scenario["capiController"].getSafeIOStatus(index)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Get safe IO status failed"
     data_store.scenario["producedSafeStatus"] = results["data"]["producedStatus"]
-    Messages.write_message("Produced Safe Status: {}".format(data_store.scenario["producedSafeStatus"]))
+    report.writeMessage("Produced Safe Status: {}".format(data_store.scenario["producedSafeStatus"]))
     data_store.scenario["consumedSafeStatus"] = results["data"]["consumedStatus"]
-    Messages.write_message("Consumed Safe Status: {}".format(data_store.scenario["consumedSafeStatus"]))
+    report.writeMessage("Consumed Safe Status: {}".format(data_store.scenario["consumedSafeStatus"]))
 
 ##########################################################################
 # configuration steps
 ###
+# check device configuration
+###
+@step("Check device configuration")
+def checkDeviceConfiguration():
+    """
+    Calls the CAPI Read Config ID method and compares the device CRC against the CRC stored by Get config crc. If the device already runs this configuration the following configuration download steps (Config register through Soft reset device) are skipped.
+
+    Step and function definition::
+
+        @step("Check device configuration")
+        def checkDeviceConfiguration():
+
+    Example usage:
+        * Check device configuration
+    """
+    data_store.scenario["configOnDevice"] = False
+    if data_store.scenario["capiController"] is None or "configCRC" not in data_store.suite:
+        report.writeMessage("No device or config CRC, configuration will be downloaded")
+        return
+    results = data_store.scenario["capiController"].readConfigID(True)
+    report.writeMessage(results["description"])
+    if results["result"] != 0:
+        report.writeMessage("No configuration on device, configuration will be downloaded")
+        return
+    deviceCRC = hex(int(results["data"]["configDataCRC"]))
+    report.writeMessage("Device CRC: {}".format(deviceCRC))
+    report.writeMessage("Database CRC: {}".format(data_store.suite["configCRC"]))
+    data_store.scenario["configOnDevice"] = int(deviceCRC, 16) == int(data_store.suite["configCRC"], 16)
+    if data_store.scenario["configOnDevice"]:
+        report.writeMessage("Configuration already on device, download skipped")
+
+def configDownloadSkipped():
+    """
+    Returns:
+        bool: True if Check device configuration found the configuration on the device.
+    """
+    if data_store.scenario["configOnDevice"]:
+        report.writeMessage("Configuration already on device, step skipped")
+        return True
+    return False
+###
 # register
 ###
 @step("Config register")
@@ -1629,8 +1547,10 @@ def configRegister():
     Example usage:
         * Config register
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].notifyReq(True)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Register failed"
 ###
 # unregister
@@ -1648,8 +1568,10 @@ def configUnregister():
     Example usage:
         * Config unregister
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].notifyReq(False)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Unregister failed"
 ###
 # lock
@@ -1667,8 +1589,10 @@ def configLock():
     Example usage:
         * Config lock
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].configLockReq(True)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Lock failed"
 ###
 # unlock
@@ -1686,8 +1610,10 @@ def configUnlock():
     Example usage:
         * Config unlock
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].configLockReq(False)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Unlock failed"
 ###
 # config mode
@@ -1705,8 +1631,10 @@ def configMode():
     Example usage:
         * Config mode
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].configMode()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Config mode failed"
 ###
 # config reset
@@ -1724,16 +1652,13 @@ def configReset():
     Example usage:
         * Config reset
     """
+    data_store.scenario["configOnDevice"] = False
+    start = time.monotonic()
     results = data_store.scenario["capiController"].configReset()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Config reset failed"
-    timeout = time.time() + 30
-    configRead = False
-    while (time.time() < timeout and configRead == False):
-        x = data_store.scenario["capiController"].readConfigID(True)
-        if (x["result"] == 0):
-            configRead = True
-    assert configRead == True, "Unable to confirm config was reset"
+    results = waitDeviceReady("Config reset", start, time.monotonic() - start)
+    assert results["result"] == 0, "Unable to confirm config was reset"
 ###
 # write block - network config
 ###
@@ -1750,12 +1675,13 @@ def writeBlockNetworkConfig():
     Example usage:
         * Write block network config
     """
+    if configDownloadSkipped():
+        return
     try:
-        results = data_store.scenario["capiController"].writeBlock(10, data_store.suite["configFile"])
-        Messages.write_message(results["description"])
+        results = writeConfigBlock(10, data_store.suite["configFile"], os.path.getsize(data_store.suite["configFile"]))
         assert results["result"] == 0, "Write file to device failed"
     except NameError:
-        Messages.write_message("Load config was not called, there is no config to load")
+        report.writeMessage("Load config was not called, there is no config to load")
         assert False, "NameError when trying to write configFile"
 ###
 # write block - network config compressed
@@ -1763,7 +1689,7 @@ def writeBlockNetworkConfig():
 @step("Write block network config compressed")
 def writeBlockNetworkConfigCompressed():
     """
-    Calls the CAPI Write Block Network Configuration Compressed method and it will use the filename saved in ``data_store.suite["configFile"]`` variable.
+    Calls the CAPI Write Block Network Configuration Compressed method and it will use the filename saved in ``data_store.suite["configFile"]`` variable. The file is sent as it is, it must already be in the compressed format of the device.
 
     Step and function definition::
 
@@ -1773,14 +1699,76 @@ def writeBlockNetworkConfigCompressed():
     Example usage:
         * Write block network config compressed
     """
+    if configDownloadSkipped():
+        return
     try:
-        results = data_store.scenario["capiController"].writeBlock(11, data_store.suite["configFile"])
-        Messages.write_message(results["description"])
+        results = writeConfigBlock(11, data_store.suite["configFile"], os.path.getsize(data_store.suite["configFile"]))
         assert results["result"] == 0, "Write file to device failed"
     except NameError:
-        Messages.write_message("Load config was not called, there is no config to load")
+        report.writeMessage("Load config was not called, there is no config to load")
         assert False, "NameError when trying to write configFile"
 ###
+# write block - network config auto
+###
+@step("Write block network config auto")
+def writeBlockNetworkConfigAuto():
+    """
+    Calls the CAPI Write Block Network Configuration method, compressed or non-compressed depending on the link throughput measured by the earlier config downloads of the suite. Links slower than ``config_compress_throughput`` bytes/s (default 1000000) and the first download get the compressed block if compression saves at least 10%. A configuration file that is already compressed is always written as the compressed block.
+
+    This Step is opt-in, the download concepts use ``Write block network config``. It sends the zlib stream of ``config_store.py`` as block type 11, use it only with devices that accept that format.
+
+    Step and function definition::
+
+        @step("Write block network config auto")
+        def writeBlockNetworkConfigAuto():
+
+    Example usage:
+        * Write block network config auto
+    """
+    if configDownloadSkipped():
+        return
+    assert "configFile" in data_store.suite, "Load config was not called, there is no config to load"
+    configFile = data_store.suite["configFile"]
+    throughput = data_store.suite["configThroughput"] if "configThroughput" in data_store.suite else None
+    if config_store.isCompressed(configFile):
+        # a compressed file is never sent as the non-compressed block
+        report.writeMessage("{} is already compressed, writing compressed".format(configFile))
+        results = writeConfigBlock(11, configFile, os.path.getsize(configFile))
+    elif throughput is not None and throughput >= float(os.getenv("config_compress_throughput", CONFIG_COMPRESS_THROUGHPUT)):
+        report.writeMessage("Link throughput {:.0f} bytes/s, writing non-compressed".format(throughput))
+        results = writeConfigBlock(10, configFile, os.path.getsize(configFile))
+    else:
+        compressed = config_store.compressConfig(configFile)
+        report.writeMessage(compressed["description"])
+        if compressed["data"]["compressedSize"] > compressed["data"]["size"] * (1 - CONFIG_COMPRESS_MIN_SAVING):
+            results = writeConfigBlock(10, configFile, compressed["data"]["size"])
+        else:
+            results = writeConfigBlock(11, compressed["data"]["file"], compressed["data"]["size"])
+    assert results["result"] == 0, "Write file to device failed"
+
+def writeConfigBlock(blockType, filepath, size):
+    """
+    Calls the CAPI Write Block method and keeps the transfer in ``data_store.scenario["configDownloads"]`` and the link throughput in ``data_store.suite["configThroughput"]``.
+
+    Args:
+        blockType (int): 10 for the non-compressed, 11 for the compressed network configuration.
+        filepath (string): File written to the device.
+        size (int): Size of the non-compressed configuration.
+
+    Returns:
+        dict: Results of the CAPI Write Block method.
+    """
+    sent = os.path.getsize(filepath)
+    start = time.monotonic()
+    results = data_store.scenario["capiController"].writeBlock(blockType, filepath)
+    elapsed = time.monotonic() - start
+    report.writeMessage(results["description"])
+    if results["result"] == 0 and elapsed > 0:
+        data_store.suite["configThroughput"] = sent / elapsed
+        data_store.scenario["configDownloads"].append({"blockType": blockType, "size": size, "sent": sent, "time": elapsed})
+        report.writeMessage("Write block {}: {} bytes in {:.3f} s, {:.0f} bytes/s, ratio {:.2f}".format(blockType, sent, elapsed, sent / elapsed, sent / size if size else 1))
+    return results
+###
 # config validate
 ###
 @step("Config validate")
@@ -1796,8 +1784,10 @@ def configValidate():
     Example usage:
         * Config validate
     """
+    if configDownloadSkipped():
+        return
     results = data_store.scenario["capiController"].configValidate()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Config validate failed"
 ###
 # config apply
@@ -1815,16 +1805,65 @@ def configApply():
     Example usage:
         * Config apply
     """
+    if configDownloadSkipped():
+        return
+    start = time.monotonic()
     results = data_store.scenario["capiController"].configApply()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Config apply failed"
-    timeout = time.time() + 30
-    configRead = False
-    while (time.time() < timeout and configRead == False):
-        x = data_store.scenario["capiController"].readConfigID(True)
-        if (x["result"] == 0):
-            configRead = True
-    assert configRead == True, "Cannot verify config"
+    results = waitDeviceReady("Config apply", start, time.monotonic() - start)
+    assert results["result"] == 0, "Cannot verify config"
+###
+# wait for device ready
+###
+@step("Wait for device ready within <timeoutMs>")
+def waitForDeviceReady(timeoutMs):
+    """
+    Polls the CAPI Read Config ID and Read State methods with backoff until the device is ready, see ``device_readiness.py``. After Soft reset device it first waits to see the device go down, or for ``device_ready_settle`` seconds if it never does, and the time to ready is measured from the reset.
+
+    Args:
+        timeoutMs (int): Timeout in milliseconds.
+
+    Step and function definition::
+
+        @step("Wait for device ready within <timeoutMs>")
+        def waitForDeviceReady(timeoutMs):
+
+    Example usage:
+        * Wait for device ready within "30000"
+    """
+    resetTime = data_store.scenario["resetTime"]
+    data_store.scenario["resetTime"] = None
+    results = waitDeviceReady("Soft reset" if resetTime is not None else "Device", resetTime, None, int(timeoutMs) / 1000, resetTime is not None)
+    assert results["result"] == 0, "Device not ready within {} ms".format(timeoutMs)
+
+def waitDeviceReady(name, since, commandTime, timeout=30, requireTransition=False):
+    """
+    Waits for the device to be ready and keeps the timing in ``data_store.scenario["readiness"]``.
+
+    Args:
+        name (string): Name of the command in the report.
+        since (float): ``time.monotonic()`` of the command, None for now.
+        commandTime (float): Seconds the command itself took, None if there was no command.
+        timeout (float, optional): Timeout in seconds. Defaults to 30.
+        requireTransition (bool, optional): Wait to see the device go down first, up to ``device_ready_settle`` seconds after ``since``. Defaults to False.
+
+    Returns:
+        dict: Results of ``DeviceReadiness.waitReady``.
+    """
+    controller = data_store.scenario["capiController"]
+    def readState():
+        state = controller.readState()
+        return state["data"]["state"] if state["result"] == 0 else None
+    readiness = DeviceReadiness(lambda: controller.readConfigID(True)["result"] == 0, readState)
+    results = readiness.waitReady(timeout, since, requireTransition)
+    report.writeMessage("{}: {}".format(name, results["description"]))
+    if commandTime is not None:
+        report.writeMessage("{} command time: {:.3f} s".format(name, commandTime))
+    for elapsed, oldState, newState in results["data"]["transitions"]:
+        report.writeMessage("State {} -> {} at {:.3f} s".format(oldState, newState, elapsed), report.DEBUG)
+    data_store.scenario["readiness"].append({"name": name, "commandTime": commandTime, "timeToReady": results["data"]["timeToReady"], "polls": results["data"]["polls"]})
+    return results
 
 ##########################################################################
 # verify steps
@@ -1845,11 +1884,11 @@ def verifyConfiguration():
         * Verify configuration
     """
     results = data_store.scenario["capiController"].readConfigID(True)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Read config failed"
-    Messages.write_message("Device CRC: {}".format(hex(int(results["data"]["configDataCRC"]))))
-    Messages.write_message("Database CRC: {}".format(data_store.suite["configCRC"]))
-    Messages.write_message("{}".format(results["data"]))
+    report.writeMessage("Device CRC: {}".format(hex(int(results["data"]["configDataCRC"]))))
+    report.writeMessage("Database CRC: {}".format(data_store.suite["configCRC"]))
+    report.writeMessage("{}".format(results["data"]))
     assert data_store.suite["configCRC"] == hex(int(results["data"]["configDataCRC"])), "Cannot verify config"
 ###
 # verify card name
@@ -2037,14 +2076,9 @@ def testIOTestSafeIOLoop(standardValue, safeValue, timeoutSeconds):
     while timeout > time.time():
         readIO()
         writeIO(standardValue)
-        time.sleep(0.5)
-        readIO()
-        verifyInput(standardValue)
-        readIO()
+        waitForInput(standardValue, "2000")
         writeIO("0")
-        time.sleep(0.5)
-        readIO()
-        verifyInput("0")
+        waitForInput("0", "2000")
         verifyNCS("0", "16")
         getState()
         readSafeIO()
@@ -2059,9 +2093,122 @@ def testIOTestSafeIOLoop(standardValue, safeValue, timeoutSeconds):
         verifySafeOutput("0")
         verifyConnections("2")
         verifyActiveConnections("2")
-        Messages.write_message("=============================")
-        Messages.write_message("Loop iteration")
-        Messages.write_message("=============================")
+        report.writeMessage("=============================")
+        report.writeMessage("Loop iteration")
+        report.writeMessage("=============================")
+###
+# io latency measurement
+###
+def _measureLatency(name, write, read, samples, rateHz):
+    # writes 1 and 0 alternately to the first IO byte, timestamps the write and the first read that returns it
+    histogram = LatencyHistogram()
+    period = int(1000000000 / float(rateHz))
+    samples = int(samples)
+    timeouts = 0
+    value = 0
+    nextWrite = time.perf_counter_ns()
+    for sample in range(samples):
+        value ^= 1
+        writeTime = time.perf_counter_ns()
+        write(value)
+        while True:
+            matched = read() == value
+            readTime = time.perf_counter_ns()
+            if matched:
+                histogram.record(readTime - writeTime)
+                break
+            if readTime - writeTime > LATENCY_TIMEOUT_NS:
+                timeouts += 1
+                break
+            # a short pause so the polling doesn't load the CAPI link it measures
+            time.sleep(LATENCY_POLL_INTERVAL)
+        nextWrite += period
+        delay = nextWrite - time.perf_counter_ns()
+        if delay > 0:
+            time.sleep(delay / 1000000000)
+        else:
+            # running behind, restart the schedule from now instead of bursting
+            nextWrite = time.perf_counter_ns()
+    summary = histogram.summary()
+    report.writeMessage("{} latency over {} samples at {} Hz, {} timeouts".format(name, histogram.count, rateHz, timeouts))
+    if histogram.count:
+        report.writeMessage("min {:.3f} ms, p50 {:.3f} ms, p99 {:.3f} ms, p99.9 {:.3f} ms, max {:.3f} ms".format(
+            summary["min"] / 1e6, summary["p50"] / 1e6, summary["p99"] / 1e6, summary["p99.9"] / 1e6, summary["max"] / 1e6))
+    reportDir = os.path.join(os.getenv("gauge_reports_dir", "reports"), "io_latency")
+    os.makedirs(reportDir, exist_ok=True)
+    filename = os.path.join(reportDir, "{}_{}.json".format(name.lower().replace(" ", "_"), time.strftime("%Y%m%d_%H%M%S")))
+    with open(filename, "w") as artifact:
+        artifact.write(histogram.toJson(name=name, samples=samples, rateHz=float(rateHz), timeouts=timeouts))
+    report.writeMessage("Latency histogram written to {}".format(filename))
+    return {"histogram": histogram, "timeouts": timeouts}
+
+@step("Measure IO latency <samples> at <rateHz>")
+def measureIOLatency(samples, rateHz):
+    """
+    Toggles the first produced IO byte between 0 and 1 at the given rate and measures how long each write takes to show up in the consumed IO, read every ``LATENCY_POLL_INTERVAL`` seconds. The write and each read are timestamped with ``time.perf_counter_ns`` and collected in a ``LatencyHistogram``, p50/p99/p99.9/max are written to the report and the histogram to ``<gauge_reports_dir>/io_latency`` as JSON.
+
+    Args:
+        samples (int): Number of writes.
+        rateHz (float): Writes per second.
+
+    Step and function definition::
+
+        @step("Measure IO latency <samples> at <rateHz>")
+        def measureIOLatency(samples, rateHz):
+
+    Example usage:
+        * Measure IO latency "1000" at "50"
+    """
+    controller = data_store.scenario["capiController"]
+    readIO()
+    produced = list(data_store.scenario["producedIO"])
+
+    def write(value):
+        produced[0] = value
+        results = controller.writeProducedIO(tuple(produced))
+        assert results["result"] == 0, "Write io failed"
+
+    def read():
+        results = controller.readIO()
+        assert results["result"] == 0, "Read io failed"
+        return results["data"]["consumed"][0]
+
+    results = _measureLatency("IO", write, read, samples, rateHz)
+    assert results["timeouts"] == 0, "{} IO writes not seen within {} ms".format(results["timeouts"], LATENCY_TIMEOUT_NS // 1000000)
+
+@step("Measure safe IO latency <samples> at <rateHz>")
+def measureSafeIOLatency(samples, rateHz):
+    """
+    Same as Measure IO latency for the safe IO, the write to the produced safe IO is matched against the first consumed safe IO byte, so the device has to loop the safe output back to its safe input.
+
+    Args:
+        samples (int): Number of writes.
+        rateHz (float): Writes per second.
+
+    Step and function definition::
+
+        @step("Measure safe IO latency <samples> at <rateHz>")
+        def measureSafeIOLatency(samples, rateHz):
+
+    Example usage:
+        * Measure safe IO latency "1000" at "20"
+    """
+    controller = data_store.scenario["capiController"]
+    readSafeIO()
+    produced = list(data_store.scenario["producedSafeIO"])
+
+    def write(value):
+        produced[0] = value
+        results = controller.writeSafeProducedIO(tuple(produced))
+        assert results["result"] == 0, "Write safe io failed"
+
+    def read():
+        results = controller.readSafeIO()
+        assert results["result"] == 0, "Read safe io failed"
+        return results["data"]["consumed"][0]
+
+    results = _measureLatency("Safe IO", write, read, samples, rateHz)
+    assert results["timeouts"] == 0, "{} safe IO writes not seen within {} ms".format(results["timeouts"], LATENCY_TIMEOUT_NS // 1000000)
 
 ##########################################################################
 # after scenario tasks
@@ -2072,28 +2219,40 @@ def afterScenarioHook():
     Goes through all variables named in the Before Scenario Hook and calls the related method to close CAPI.
 
     """
+    if data_store.scenario["ioLatency"]:
+        latency = data_store.scenario["ioLatency"]
+        report.writeMessage("Input latency over {} checks: min {:.1f} ms, avg {:.1f} ms, max {:.1f} ms".format(len(latency), min(latency), sum(latency) / len(latency), max(latency)))
+    if data_store.scenario["configDownloads"]:
+        downloads = data_store.scenario["configDownloads"]
+        sent = sum(download["sent"] for download in downloads)
+        size = sum(download["size"] for download in downloads)
+        elapsed = sum(download["time"] for download in downloads)
+        report.writeMessage("Config download: {} bytes ({} bytes configuration) in {:.3f} s, {:.0f} bytes/s, ratio {:.2f}".format(sent, size, elapsed, sent / elapsed, sent / size if size else 1))
+    for readiness in data_store.scenario["readiness"]:
+        if readiness["timeToReady"] is not None:
+            report.writeMessage("{} ready after {:.3f} s ({} polls)".format(readiness["name"], readiness["timeToReady"], readiness["polls"]))
     if data_store.scenario["safeEnabled"]:
         results = data_store.scenario["capiController"].disableSafeConnection()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["safeOpenInterface"]:
         results = data_store.scenario["capiController"].closeSafeInterface()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["safeInit"]:
         results = data_store.scenario["capiController"].safeExit()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["pingOpen"]:
         results = data_store.scenario["capiController"].pingClose()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["arpRegistered"]:
         results = data_store.scenario["capiController"].arpUnregister()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["startProtocol"]:
         results = data_store.scenario["capiController"].stopProtocol()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["openInterface"]:
         results = data_store.scenario["capiController"].closeInterface()
-        Messages.write_message(results["description"])
+        report.writeMessage(results["description"])
     if data_store.scenario["init"]:
         results = data_store.scenario["capiController"].exit()
-        Messages.write_message(results["description"])
-    Messages.write_message("capi after scenario completed")
\ No newline at end of file
+        report.writeMessage(results["description"])
+    report.writeMessage("capi after scenario completed", report.DEBUG)
\ No newline at end of file
@@ -0,0 +1,151 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   CMTP Message Layouts for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Layouts of the CMTP request data sent by the ``Send message ...`` Steps in ``capi.py`` and ``capi_grpc.py``.
+
+Each service is declared once as a list of ``(offset, name, format)`` fields, offsets are relative to the start of the request data (the 24 byte CMTP header is added by the CAPI library). The fields are compiled into a single ``struct.Struct`` with pad bytes between them and packed with one call into a new ``CMTP_BUFFER_LEN`` byte list. Byte string fields longer than their field fail instead of being cut by ``struct``.
+"""
+##########################################################################
+# import libraries
+###
+import struct
+
+##########################################################################
+# constants
+###
+CMTP_BUFFER_LEN = 1024
+
+##########################################################################
+# message layout
+###
+class MessageLayout:
+    """
+    Compiled layout of one CMTP service request.
+
+    Args:
+        serviceID (int): CMTP service ID.
+        fields (list): ``(offset, name, format)`` tuples, format is a single ``struct`` code (ie. ``I``, ``H``, ``6s``).
+        size (int, optional): Size of the request buffer. Defaults to ``CMTP_BUFFER_LEN``.
+    """
+    def __init__(self, serviceID, fields, size=CMTP_BUFFER_LEN):
+        self.serviceID = serviceID
+        self.names = []
+        self.lengths = {}
+        layout = "<"
+        position = 0
+        for offset, name, fieldFormat in sorted(fields):
+            assert offset >= position, "CMTP field {} overlaps the previous field".format(name)
+            if offset > position:
+                layout += "{}x".format(offset - position)
+            layout += fieldFormat
+            position = offset + struct.calcsize("<" + fieldFormat)
+            self.names.append(name)
+            if fieldFormat.endswith("s"):
+                self.lengths[name] = struct.calcsize("<" + fieldFormat)
+        self.struct = struct.Struct(layout)
+        assert self.struct.size <= size, "CMTP layout for service {} larger than the buffer".format(serviceID)
+        self.padding = bytes(size - self.struct.size)
+
+    def pack(self, **values):
+        """
+        Packs the given field values, the bytes after the layout are zero.
+
+        Args:
+            **values: One value per field name.
+
+        Returns:
+            list: Request buffer of ``size`` bytes, a new list on every call.
+        """
+        for name, length in self.lengths.items():
+            assert len(values[name]) <= length, "CMTP field {} is {} bytes, longer than {}".format(name, len(values[name]), length)
+        return list(self.struct.pack(*[values[name] for name in self.names]) + self.padding)
+
+##########################################################################
+# layouts
+###
+MESSAGE_LAYOUTS = {
+    "identify": MessageLayout(10, []),
+    "get device detected": MessageLayout(11, []),
+    "blink": MessageLayout(20, [
+        (0, "byMac", "6s")
+    ]),
+    "factory reset": MessageLayout(21, [
+        (0, "byMac", "6s")
+    ]),
+    "set name": MessageLayout(22, [
+        (0, "dwRemanent", "I"),
+        (4, "dwNameLength", "I"),
+        (8, "szName", "240s"),
+        (248, "byMac", "6s")
+    ]),
+    "set ip": MessageLayout(23, [
+        (0, "dwRemanent", "I"),
+        (4, "dwIPMode", "I"),
+        (8, "byIPAddr", "4s"),
+        (12, "byIPMask", "4s"),
+        (16, "byIPGateway", "4s"),
+        (20, "byMac", "6s")
+    ]),
+    "read explicit": MessageLayout(32, [
+        (0, "dwConfID", "I"),
+        (4, "dwCrc32", "I"),
+        (8, "wDeviceNumber", "H"),
+        (10, "dwApi", "I"),
+        (14, "wSlotNumber", "H"),
+        (16, "wSubSlotNumber", "H"),
+        (18, "wIndex", "H"),
+        (20, "wLengthDataToRead", "H")
+    ]),
+    "write explicit": MessageLayout(32, [
+        (0, "dwConfID", "I"),
+        (4, "dwCrc32", "I"),
+        (8, "wDeviceNumber", "H"),
+        (10, "dwApi", "I"),
+        (14, "wSlotNumber", "H"),
+        (16, "wSubSlotNumber", "H"),
+        (18, "wIndex", "H"),
+        (20, "dataToWrite", "{}s".format(CMTP_BUFFER_LEN - 20))
+    ])
+}
+
+##########################################################################
+# methods
+###
+def macBytes(byMac):
+    """
+    Args:
+        byMac (string): MAC address (ie. 00:A0:91:30:4B:29).
+
+    Returns:
+        bytes: 6 byte MAC address.
+    """
+    return bytes(int(mac, 16) for mac in byMac.split(":"))
+
+def ipBytes(ip):
+    """
+    Args:
+        ip (string): IP address (ie. 192.168.1.12).
+
+    Returns:
+        bytes: 4 byte IP address.
+    """
+    return bytes(int(num, 0) for num in ip.split("."))
+
+def buildMessage(service, **values):
+    """
+    Packs a CMTP request.
+
+    Args:
+        service (string): Key of the service in ``MESSAGE_LAYOUTS``.
+        **values: One value per field of the layout.
+
+    Returns:
+        tuple: Service ID and the request buffer.
+    """
+    layout = MESSAGE_LAYOUTS[service]
+    return layout.serviceID, layout.pack(**values)
@@ -0,0 +1,140 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Network Configuration Store for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Content addressed store for the network configuration files used by ``Load config`` and ``Get config crc`` in ``utility.py``.
+
+A configuration file is checked once against the CRC the lab server returns for it (CRC-32 of the file) and copied to ``config_store_dir`` (default ``.config_store``) as ``<crc>.bin``. Later loads of a configuration with the same CRC use the local copy without reading or checking the source again.
+
+Compressed configurations for the opt-in Write block network config auto Step (block type 11) are made on demand with zlib and kept in the same directory as ``<sha256 of the source>.zlib``, so a configuration is only compressed once. Files that already are zlib or gzip streams are used as they are.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import shutil
+import hashlib
+import zlib
+
+##########################################################################
+# constants
+###
+CONFIG_STORE_DIR = ".config_store"
+CHUNK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 9
+
+##########################################################################
+# methods
+###
+def fileCRC(filepath):
+    """
+    Args:
+        filepath (string): File path.
+
+    Returns:
+        int: CRC-32 of the file.
+    """
+    crc = 0
+    with open(filepath, "rb") as configFile:
+        for chunk in iter(lambda: configFile.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
+
+def storedConfig(crc):
+    """
+    Args:
+        crc (string): CRC from the lab server (ie. 0x1a2b3c4d).
+
+    Returns:
+        string: Path of the stored configuration with this CRC, None if it is not in the store.
+    """
+    storedFile = os.path.join(os.getenv("config_store_dir", CONFIG_STORE_DIR), "{:08x}.bin".format(int(crc, 16)))
+    if os.path.exists(storedFile):
+        return storedFile
+    return None
+
+def storeConfig(filepath, crc):
+    """
+    Adds a configuration file to the store if its CRC matches the lab server CRC.
+
+    Args:
+        filepath (string): Configuration file path.
+        crc (string): CRC from the lab server (ie. 0x1a2b3c4d).
+
+    Returns:
+        dict: ``result`` is 0 and ``data`` the stored path if the file is (already) in the store, otherwise 1 with ``data`` the original path.
+    """
+    storedFile = storedConfig(crc)
+    if storedFile is not None:
+        return {"result": 0, "description": "config {} found in store".format(crc), "data": storedFile}
+    localCRC = fileCRC(filepath)
+    if localCRC != int(crc, 16):
+        return {"result": 1, "description": "CRC of {} is {}, lab server CRC is {}".format(filepath, hex(localCRC), crc), "data": filepath}
+    storeDir = os.getenv("config_store_dir", CONFIG_STORE_DIR)
+    os.makedirs(storeDir, exist_ok=True)
+    storedFile = os.path.join(storeDir, "{:08x}.bin".format(localCRC))
+    # copy then rename so parallel streams never pick up a partial file
+    tmpFile = "{}.{}.tmp".format(storedFile, os.getpid())
+    shutil.copyfile(filepath, tmpFile)
+    os.replace(tmpFile, storedFile)
+    return {"result": 0, "description": "config {} added to store".format(crc), "data": storedFile}
+
+def isCompressed(filepath):
+    """
+    Args:
+        filepath (string): File path.
+
+    Returns:
+        bool: True if the file starts with a zlib or gzip header.
+    """
+    with open(filepath, "rb") as configFile:
+        header = configFile.read(1024)
+    if len(header) < 2:
+        return False
+    if header[:2] == b"\x1f\x8b":
+        return True
+    if header[0] & 0x0F != 8 or (header[0] * 256 + header[1]) % 31 != 0:
+        return False
+    # the header check alone matches about 1 in 500 raw files, make sure the data inflates
+    try:
+        zlib.decompressobj().decompress(header)
+    except zlib.error:
+        return False
+    return True
+
+def compressConfig(filepath):
+    """
+    Returns the compressed copy of a configuration file, compressing it if it is not in the store yet.
+
+    Args:
+        filepath (string): Configuration file path.
+
+    Returns:
+        dict: ``result`` is 0, ``data`` holds the compressed ``file``, the ``size`` of the source, the ``compressedSize`` and whether it was ``cached``.
+    """
+    size = os.path.getsize(filepath)
+    if isCompressed(filepath):
+        return {"result": 0, "description": "{} is already compressed".format(filepath), "data": {"file": filepath, "size": size, "compressedSize": size, "cached": True}}
+    sourceHash = hashlib.sha256()
+    with open(filepath, "rb") as configFile:
+        for chunk in iter(lambda: configFile.read(CHUNK_SIZE), b""):
+            sourceHash.update(chunk)
+    storeDir = os.getenv("config_store_dir", CONFIG_STORE_DIR)
+    compressedFile = os.path.join(storeDir, "{}.zlib".format(sourceHash.hexdigest()))
+    cached = os.path.exists(compressedFile)
+    if not cached:
+        os.makedirs(storeDir, exist_ok=True)
+        tmpFile = "{}.{}.tmp".format(compressedFile, os.getpid())
+        compressor = zlib.compressobj(COMPRESS_LEVEL)
+        with open(filepath, "rb") as configFile, open(tmpFile, "wb") as outFile:
+            for chunk in iter(lambda: configFile.read(CHUNK_SIZE), b""):
+                outFile.write(compressor.compress(chunk))
+            outFile.write(compressor.flush())
+        os.replace(tmpFile, compressedFile)
+    compressedSize = os.path.getsize(compressedFile)
+    description = "{} compressed {} -> {} bytes ({:.1%}){}".format(filepath, size, compressedSize, compressedSize / size if size else 1, ", from store" if cached else "")
+    return {"result": 0, "description": description, "data": {"file": compressedFile, "size": size, "compressedSize": compressedSize, "cached": cached}}
@@ -0,0 +1,177 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Cyclic IO Analysis for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Cycle time and jitter of the cyclic real-time IO in a Wireshark capture, used by ``wireshark.py`` and ``step_impl_grpc/wireshark_grpc.py``.
+
+The capture is read once with ``pcap_reader.py`` and the arrival times are collected per connection in ``array`` buffers:
+    * PROFINET RT frames (ethertype 0x8892, frame ID 0x8000 - 0xFBFF) by frame ID and source MAC
+    * EtherNet/IP class 1 IO (UDP port 2222) by CIP connection ID and source IP, with the sequence number of the sequenced address item
+
+Per connection the cycle is the median interval (or the expected cycle if given) and the jitter is each interval minus the cycle. An interval of 1.5 cycles or more counts as missed frames (EtherNet/IP uses the sequence gaps instead), an interval more than ``lateTolerance`` of the cycle too long as a late frame. The arrays are analyzed with NumPy when it is installed and with plain Python otherwise.
+"""
+##########################################################################
+# import libraries
+###
+from step_impl import pcap_reader
+from array import array
+import math
+import statistics
+import struct
+try:
+    import numpy
+except Exception as exc:
+    numpy = None
+    print("import numpy:: {} occured: {}".format(type(exc).__name__, exc))
+
+##########################################################################
+# constants
+###
+PN_CYCLIC_FRAME_IDS = (0x8000, 0xFBFF)
+ENIP_IO_PORT = 2222
+CPF_SEQUENCED_ADDRESS = 0x8002
+LATE_TOLERANCE = 0.5
+MISSED_FACTOR = 1.5
+
+##########################################################################
+# methods
+###
+def _mac(data):
+    return ":".join(["{:02x}".format(byte) for byte in data])
+
+def connectionKey(packet):
+    """
+    Args:
+        packet (memoryview): Ethernet frame.
+
+    Returns:
+        tuple: Connection name and EtherNet/IP sequence number (None for PROFINET), None if the frame isn't cyclic IO.
+    """
+    etherType, position = pcap_reader._payload(packet)
+    if etherType == pcap_reader.ETHERTYPE_PROFINET and len(packet) >= position + 2:
+        frameID = (packet[position] << 8) | packet[position + 1]
+        if PN_CYCLIC_FRAME_IDS[0] <= frameID <= PN_CYCLIC_FRAME_IDS[1]:
+            return "PN 0x{:04X} {}".format(frameID, _mac(packet[6:12])), None
+        return None
+    if etherType != pcap_reader.ETHERTYPE_IPV4 or len(packet) < position + 20 or packet[position + 9] != pcap_reader.IP_PROTOCOL_UDP:
+        return None
+    udp = position + (packet[position] & 0x0F) * 4
+    cpf = udp + 8
+    if len(packet) < cpf + 14 or (packet[udp + 2] << 8 | packet[udp + 3]) != ENIP_IO_PORT:
+        return None
+    # common packet format: item count, then the sequenced address item with connection ID and sequence number
+    itemType, itemLength, connectionID, sequence = struct.unpack_from("<HHII", packet, cpf + 2)
+    if itemType != CPF_SEQUENCED_ADDRESS or itemLength != 8:
+        return None
+    source = ".".join([str(byte) for byte in packet[position + 12:position + 16]])
+    return "CIP 0x{:08X} {}".format(connectionID, source), sequence
+
+def collect(reader, since=None):
+    """
+    Collects the arrival times of every cyclic IO connection in one pass.
+
+    Args:
+        reader (PcapReader): Reader of the capture.
+        since (float, optional): Skip packets before this ``time.time()``. Defaults to None.
+
+    Returns:
+        dict: (``array`` of timestamps, ``array`` of EtherNet/IP sequence numbers) of each connection.
+    """
+    connections = {}
+    for timestamp, linktype, packet in reader.packets():
+        if linktype != pcap_reader.LINKTYPE_ETHERNET or timestamp is None or (since is not None and timestamp < since):
+            continue
+        key = connectionKey(packet)
+        if key is None:
+            continue
+        timestamps, sequences = connections.setdefault(key[0], (array("d"), array("Q")))
+        timestamps.append(timestamp)
+        if key[1] is not None:
+            sequences.append(key[1])
+    return connections
+
+def _sequenceMissed(sequences):
+    # 32 bit sequence counts, a gap of more than one is missed frames
+    missed = 0
+    for previous, current in zip(sequences, sequences[1:]):
+        gap = (current - previous) & 0xFFFFFFFF
+        if gap > 1:
+            missed += gap - 1
+    return missed
+
+def _percentile(ordered, percent):
+    # linear interpolation between the closest ranks like numpy.percentile
+    rank = (len(ordered) - 1) * percent / 100.0
+    low = int(math.floor(rank))
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def analyzeConnection(timestamps, sequences=None, cycleMs=None, lateTolerance=LATE_TOLERANCE):
+    """
+    Args:
+        timestamps (array): Arrival times in seconds.
+        sequences (array, optional): EtherNet/IP sequence numbers. Defaults to None.
+        cycleMs (float, optional): Expected cycle in ms. Defaults to None for the median interval.
+        lateTolerance (float, optional): Part of the cycle an interval may be longer before the frame is late. Defaults to ``LATE_TOLERANCE``.
+
+    Returns:
+        dict: ``frames``, ``cycleMs``, jitter ``meanMs``, ``stdMs``, ``maxMs`` (largest deviation either way), ``p99Ms`` and the ``late`` and ``missed`` frame counts. None if there are less than two frames.
+    """
+    if len(timestamps) < 2:
+        return None
+    if numpy is not None:
+        intervals = numpy.diff(numpy.frombuffer(timestamps, dtype=numpy.float64)) * 1000
+        cycle = float(cycleMs) if cycleMs else float(numpy.median(intervals))
+        jitter = intervals - cycle
+        deviation = numpy.abs(jitter)
+        late = int(numpy.count_nonzero(intervals > cycle * (1 + lateTolerance)))
+        missed = int(numpy.sum(numpy.maximum(numpy.rint(intervals / cycle) - 1, 0)[intervals >= cycle * MISSED_FACTOR])) if cycle > 0 else 0
+        results = {"meanMs": float(jitter.mean()), "stdMs": float(jitter.std()), "maxMs": float(deviation.max()), "p99Ms": float(numpy.percentile(deviation, 99))}
+    else:
+        intervals = [(current - previous) * 1000 for previous, current in zip(timestamps, timestamps[1:])]
+        cycle = float(cycleMs) if cycleMs else statistics.median(intervals)
+        jitter = [interval - cycle for interval in intervals]
+        deviation = sorted([abs(value) for value in jitter])
+        late = len([interval for interval in intervals if interval > cycle * (1 + lateTolerance)])
+        missed = sum([max(round(interval / cycle) - 1, 0) for interval in intervals if interval >= cycle * MISSED_FACTOR]) if cycle > 0 else 0
+        results = {"meanMs": statistics.mean(jitter), "stdMs": statistics.pstdev(jitter), "maxMs": deviation[-1], "p99Ms": _percentile(deviation, 99)}
+    if sequences:
+        missed = _sequenceMissed(sequences)
+    results.update({"frames": len(timestamps), "cycleMs": cycle, "late": late, "missed": missed})
+    return results
+
+def analyzeCapture(filepath, cycleMs=None, since=None):
+    """
+    Analyzes every cyclic IO connection of a capture file.
+
+    Args:
+        filepath (string): Capture file.
+        cycleMs (float, optional): Expected cycle in ms. Defaults to None for the median interval of each connection.
+        since (float, optional): Skip packets before this ``time.time()``. Defaults to None.
+
+    Returns:
+        dict: ``analyzeConnection`` results of each connection with at least two frames.
+    """
+    connections = collect(pcap_reader.PcapReader(filepath), since)
+    results = {}
+    for name, (timestamps, sequences) in connections.items():
+        analysis = analyzeConnection(timestamps, sequences, cycleMs)
+        if analysis is not None:
+            results[name] = analysis
+    return results
+
+def describe(name, analysis):
+    """
+    Args:
+        name (string): Connection name.
+        analysis (dict): ``analyzeConnection`` results.
+
+    Returns:
+        string: One line report of the connection.
+    """
+    return "{}: {} frames, cycle {:.3f} ms, jitter mean {:.3f} ms, std {:.3f} ms, p99 {:.3f} ms, max {:.3f} ms, {} late, {} missed".format(
+        name, analysis["frames"], analysis["cycleMs"], analysis["meanMs"], analysis["stdMs"], analysis["p99Ms"], analysis["maxMs"], analysis["late"], analysis["missed"])
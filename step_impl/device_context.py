@@ -0,0 +1,108 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Device Context for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Per stream device context for ``gauge run --parallel`` on one automation node.
+
+Every parallel stream is a separate Gauge runner process with its own ``data_store``, only the Dynamic Variables (``ss1_usb``, ``automation_index``, ``wireshark_interface`` ...) are shared. When the node inventory file named by ``node_inventory`` exists, the variables of the entry matching ``GAUGE_PARALLEL_STREAM_ID`` (stream ``1`` outside of parallel runs) are written over the environment before the Before Suite Hooks open any hardware, so each stream drives its own DUT. Without an inventory nothing is changed.
+
+Inventory file example::
+
+    {
+        "defaults": {"wireshark_interface": "eth1"},
+        "streams": {
+            "1": {"ss1_usb": "ttyUSB0", "ss2_usb": "ttyUSB1", "ss3_usb": "ttyUSB2", "automation_index": "3", "capi_interface_offset": "0"},
+            "2": {"ss1_usb": "ttyUSB3", "ss2_usb": "ttyUSB4", "ss3_usb": "ttyUSB5", "automation_index": "4", "capi_interface_offset": "1", "wireshark_interface": "eth2"}
+        }
+    }
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import before_suite
+from step_impl import report
+import os
+import json
+
+##########################################################################
+# constants
+###
+NODE_INVENTORY_FILE = "env/default/node_inventory.json"
+
+##########################################################################
+# methods
+###
+deviceContext = None
+
+def getStreamID():
+    """
+    Returns:
+        string: Gauge parallel stream ID, ``1`` if Gauge is not running in parallel.
+    """
+    return os.getenv("GAUGE_PARALLEL_STREAM_ID", "1")
+
+def applyDeviceContext():
+    """
+    Loads the inventory entry of this stream and writes its variables to the environment. Only the first call reads the file, later calls return the same context.
+
+    Returns:
+        dict: Variables of this stream, empty if there is no inventory.
+    """
+    global deviceContext
+    if deviceContext is not None:
+        return deviceContext
+    deviceContext = {}
+    inventoryFile = os.getenv("node_inventory", NODE_INVENTORY_FILE)
+    if not os.path.exists(inventoryFile):
+        return deviceContext
+    with open(inventoryFile) as inventoryJson:
+        inventory = json.load(inventoryJson)
+    streamID = getStreamID()
+    assert streamID in inventory["streams"], "No DUT for stream {} in {}".format(streamID, inventoryFile)
+    deviceContext.update(inventory.get("defaults", {}))
+    deviceContext.update(inventory["streams"][streamID])
+    for key, value in deviceContext.items():
+        os.environ[key] = str(value)
+    report.writeMessage("stream {} device context: {}".format(streamID, deviceContext), report.DEBUG)
+    return deviceContext
+
+def streamName(name):
+    """
+    Suffixes a name (ie. a logger or file name) with the stream ID when a device context is active, so parallel streams don't share it.
+
+    Args:
+        name (string): Name.
+
+    Returns:
+        string: ``name`` or ``name_<stream>``.
+    """
+    if applyDeviceContext():
+        return "{}_{}".format(name, getStreamID())
+    return name
+
+def interfaceIndex(index):
+    """
+    Maps a CAPI card index used in a Spec to the card of this stream using ``capi_interface_offset``.
+
+    Args:
+        index (int): Card index in the Spec.
+
+    Returns:
+        int: Card index on the node.
+    """
+    applyDeviceContext()
+    return int(index) + int(os.getenv("capi_interface_offset", "0"))
+
+##########################################################################
+# before suite
+###
+@before_suite
+def beforeSuiteHook():
+    """
+    Applies the device context of this stream.
+    """
+    applyDeviceContext()
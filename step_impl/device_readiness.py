@@ -0,0 +1,86 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Device Readiness for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Readiness polling used by ``Config apply``, ``Config reset`` and ``Wait for device ready`` in ``capi.py`` and ``capi_grpc.py``.
+
+The device is polled through two callables, one reading the config ID and one reading the CAPI state. Polls start ``READY_POLL_MIN_INTERVAL`` seconds apart and the interval doubles up to ``READY_POLL_MAX_INTERVAL`` (back to the minimum after a state change), so a device that comes back quickly is seen within milliseconds without flooding the CAPI driver while it is busy. Every change of the state is recorded with its time. After a reset the device counts as ready once it was seen going down (config ID not readable or a state change) and coming back. A reset can also complete between two polls without changing the state, so if no transition was seen a device that is readable and stable ``device_ready_settle`` seconds (default 10, the fixed wait the concepts used before) after the reset is accepted too.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import time
+
+##########################################################################
+# constants
+###
+READY_POLL_MIN_INTERVAL = 0.01
+READY_POLL_MAX_INTERVAL = 0.5
+READY_TIMEOUT = 30
+READY_SETTLE = 10
+
+##########################################################################
+# device readiness
+###
+class DeviceReadiness:
+    """
+    Polls a device until its configuration can be read and its state stopped changing.
+
+    Args:
+        readConfig (function): Returns True if the config ID could be read.
+        readState (function, optional): Returns the CAPI state, None if it could not be read. Defaults to None to only poll the config ID.
+    """
+    def __init__(self, readConfig, readState=None):
+        self.readConfig = readConfig
+        self.readState = readState
+
+    def waitReady(self, timeout=READY_TIMEOUT, since=None, requireTransition=False):
+        """
+        Polls with exponential backoff until the device is ready.
+
+        Args:
+            timeout (float, optional): Timeout in seconds. Defaults to ``READY_TIMEOUT``.
+            since (float, optional): ``time.monotonic()`` of the command that made the device busy, ``timeToReady`` is measured from it. Defaults to now.
+            requireTransition (bool, optional): Wait to see the device go down first (ie. after a reset), for at most ``device_ready_settle`` seconds after ``since``. Defaults to False.
+
+        Returns:
+            dict: ``result`` is 0 if the device is ready, 1 on timeout. ``data`` holds ``timeToReady`` in seconds, the number of ``polls`` and the state ``transitions`` as (seconds, old state, new state).
+        """
+        start = time.monotonic()
+        if since is None:
+            since = start
+        deadline = start + float(timeout)
+        settled = since + float(os.getenv("device_ready_settle", READY_SETTLE))
+        interval = READY_POLL_MIN_INTERVAL
+        transitions = []
+        polls = 0
+        lastState = None
+        wentDown = False
+        while True:
+            polls += 1
+            configRead = self.readConfig()
+            state = self.readState() if self.readState is not None else None
+            now = time.monotonic()
+            stable = polls == 1 or state == lastState
+            if not stable:
+                transitions.append((now - since, lastState, state))
+                wentDown = True
+            lastState = state
+            if not configRead:
+                wentDown = True
+            # after a reset ready counts once the device was seen going down, or after the settle time if the reboot was missed
+            if configRead and stable and (wentDown or not requireTransition or now >= settled):
+                return {"result": 0, "description": "device ready after {:.3f} s, {} polls".format(now - since, polls), "data": {"timeToReady": now - since, "polls": polls, "transitions": transitions}}
+            if now >= deadline:
+                return {"result": 1, "description": "device not ready after {:.3f} s, {} polls".format(now - since, polls), "data": {"timeToReady": None, "polls": polls, "transitions": transitions}}
+            if stable:
+                interval = min(interval * 2, READY_POLL_MAX_INTERVAL)
+            else:
+                # the state just changed, confirm it quickly
+                interval = READY_POLL_MIN_INTERVAL
+            time.sleep(min(interval, deadline - now))
@@ -19,7 +19,8 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, after_step
+from getgauge.python import step, after_step
+from step_impl import report
 import time
 import sys
 import os
@@ -51,16 +52,16 @@ def runConformanceTests():
     conformanceTool = ENetIPCTController()
     files = os.getenv("conformance_files")
     conformanceConfigFilePath = os.getenv("conformance_config_file_path")
-    Messages.write_message("Conformance Config File Path: {}".format(conformanceConfigFilePath))
+    report.writeMessage("Conformance Config File Path: {}".format(conformanceConfigFilePath))
     files = files.split(",")
-    Messages.write_message("Files: {}".format(files))
+    report.writeMessage("Files: {}".format(files))
     print("\n\n")
     for newFile in files:
         print("Running Test: {}".format(newFile))
         filePath = "{}{}".format(conformanceConfigFilePath.strip(), newFile.strip())
-        Messages.write_message("Running File Path: {}".format(filePath))
+        report.writeMessage("Running File Path: {}".format(filePath))
         result = conformanceTool.runTest(filePath)
-        Messages.write_message("Results: {}".format(result))
+        report.writeMessage("Results: {}".format(result))
         conformanceTool.renameLog(newFile.strip())
     print("\n\n")
     assert True
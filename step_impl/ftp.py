@@ -17,7 +17,8 @@ Go to the Concepts to see any concepts that simplify the steps.
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite
+from getgauge.python import step, data_store, before_suite
+from step_impl import report
 import os
 import sys
 sys.path.append(r"../ftp_library")
@@ -46,13 +47,13 @@ def ftpConnect(host):
     """
     try:
         data_store.suite["ftpController"] = FTPController()
-        Messages.write_message("create ftp object successful")
+        report.writeMessage("create ftp object successful")
     except:
-        Messages.write_message("error creating ftp object")
+        report.writeMessage("error creating ftp object")
         assert False
     results = data_store.suite["ftpController"].connect(host)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp connect failed"
 ###
 # login
@@ -75,8 +76,8 @@ def ftpLogin(user, password):
         * FTP login "root" "root"
     """
     results = data_store.suite["ftpController"].login(user, password)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp login failed"
 ###
 # change work dir
@@ -99,8 +100,8 @@ def ftpChangeWorkDir(newDir):
 
     """
     results = data_store.suite["ftpController"].cwd(newDir)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp cwd failed"
 ###
 # make new dir
@@ -122,8 +123,8 @@ def ftpMakeDir(newDir):
         * FTP mkd "bin"
     """
     results = data_store.suite["ftpController"].mkd(newDir)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp mkd failed"
 ###
 # list files in cwd
@@ -142,8 +143,8 @@ def ftpListFiles():
         * FTP nlst
     """
     results = data_store.suite["ftpController"].nlst()
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp nlst failed"
 ###
 # store binary
@@ -165,8 +166,8 @@ def ftpStoreBinary(filename):
         * FTP storebinary "sup"
     """
     results = data_store.suite["ftpController"].storbinary(filename)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
     assert results["result"] == 0, "ftp storebinary failed"
 ###
 # store binary
@@ -185,5 +186,5 @@ def ftpExit():
         * FTP exit
     """
     results = data_store.suite["ftpController"].exit()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "ftp exit failed"
\ No newline at end of file
@@ -12,7 +12,8 @@ The ``gpio_library`` is used for this Step Implementation file. All Steps are in
 
 Go to the Concepts to see any concepts that simplify the steps.
 """
-from getgauge.python import step, Messages, after_step, data_store, after_scenario, before_scenario
+from getgauge.python import step, after_step, data_store, after_scenario, before_scenario
+from step_impl import report
 import sys
 import json
 
@@ -35,7 +36,7 @@ def beforeScenarioHook():
     """
     data_store.scenario["GPIOController"] = None
     data_store.scenario["gpioConnected"] = False
-    Messages.write_message("GPIO before scenario completed")
+    report.writeMessage("GPIO before scenario completed", report.DEBUG)
 
 ##########################################################################
 # methods
@@ -57,9 +58,9 @@ def gpioConnect():
     """
     try:
         data_store.scenario["gpioController"] = GPIOController()
-        Messages.write_message("create gpio object successful")
+        report.writeMessage("create gpio object successful")
     except:
-        Messages.write_message("error creating gpio object")
+        report.writeMessage("error creating gpio object")
         assert False, "Creating GPIO object failed."
     data_store.scenario["gpioConnected"] = True
 
@@ -84,13 +85,13 @@ def initGpio(pinNumber, dir):
         * Init GPIO "329" "out"
     """
     assert data_store.scenario["gpioConnected"] == True, "Call GPIO connect first. As GPIO class is not instentiated"
-    Messages.write_message("Initialize the GPIO object and set direction for GPIO.")
+    report.writeMessage("Initialize the GPIO object and set direction for GPIO.")
     pinNumber = int(pinNumber)
     __dir_list = ["in", "out"]
     if dir in __dir_list == False:
         assert False, "dir can only take only 'in' and 'out' values."
     results = data_store.scenario["gpioController"].initGpio(pinNumber, dir)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Init GPIO failed"
 
 ###
@@ -115,7 +116,7 @@ def readPinLevel(pinNumber):
     assert data_store.scenario["gpioConnected"] == True, "Call GPIO connect first. As GPIO class is not instentiated"
     pinNumber = int(pinNumber)
     results = data_store.scenario["gpioController"].readPinLevel(pinNumber)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Read pin level failed"
 
 ###
@@ -144,7 +145,7 @@ def setPinLevel(pinNumber, value):
     if isinstance(value, bool) == False:
         assert False, "Value can take only boolen input. Provide either True or False input."
     results = data_store.scenario["gpioController"].setPinLevel(pinNumber, value)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Set pin level failed"
 
 ###
@@ -169,5 +170,5 @@ def closeSysfsGpio(pinNumber):
     assert data_store.scenario["gpioConnected"] == True, "Call GPIO connect first. As GPIO class is not instentiated"
     pinNumber = int(pinNumber)
     results = data_store.scenario["gpioController"].closeSysfsGpio(pinNumber)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Close sysfs GPIO failed"
\ No newline at end of file
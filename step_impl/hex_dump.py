@@ -0,0 +1,72 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Hex Dump Formatting for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Hex dump helpers shared by the message Steps in ``capi.py``, ``capi_grpc.py`` and ``nab.py``.
+
+The buffers are converted to hex once with ``binascii.hexlify`` and the report text is joined in a single pass. CMTP dumps stop after the meaningful ``dataLength`` plus ``hex_dump_tail`` bytes (environment variable, default 16) instead of printing the whole 1024 byte buffer.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import binascii
+
+##########################################################################
+# constants
+###
+HEX_DUMP_TAIL = 16
+HEX_DUMP_ROW = 4
+
+##########################################################################
+# methods
+###
+def _hexPairs(data):
+    hexString = binascii.hexlify(bytes(data)).decode().upper()
+    return [hexString[i:i + 2] for i in range(0, len(hexString), 2)]
+
+def dumpTail():
+    """
+    Returns:
+        int: Bytes shown after ``dataLength``, from the ``hex_dump_tail`` environment variable.
+    """
+    return int(os.getenv("hex_dump_tail", HEX_DUMP_TAIL))
+
+def hexDump(data, dataLength=None, tail=None):
+    """
+    Formats a buffer as addressed rows of 4 bytes (ie. ``0004: 00 A0 91 30``), each row starting on a new line.
+
+    Args:
+        data (bytes or list): Buffer to format.
+        dataLength (int, optional): Meaningful length of the buffer, the rest is cut after the tail. Defaults to None for the whole buffer.
+        tail (int, optional): Bytes shown after ``dataLength``. Defaults to ``dumpTail()``.
+
+    Returns:
+        string: Hex dump.
+    """
+    if tail is None:
+        tail = dumpTail()
+    length = len(data)
+    if dataLength is not None:
+        length = min(length, max(int(dataLength), 0) + tail)
+    pairs = _hexPairs(data[:length])
+    rows = ["\n{:04X}: {} ".format(i, " ".join(pairs[i:i + HEX_DUMP_ROW])) for i in range(0, length, HEX_DUMP_ROW)]
+    if length < len(data):
+        rows.append("\n... {} more bytes".format(len(data) - length))
+    return "".join(rows)
+
+def hexList(data):
+    """
+    Formats a buffer as ``0x`` prefixed bytes (ie. ``0x01 0x02 ``).
+
+    Args:
+        data (bytes or list): Buffer to format.
+
+    Returns:
+        string: Hex bytes.
+    """
+    return "".join(["0x{} ".format(pair) for pair in _hexPairs(data)])
@@ -14,7 +14,8 @@ Go to the Concepts to see any concepts that simplify the steps.
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, after_step, data_store, after_scenario, before_scenario
+from getgauge.python import step, after_step, data_store, after_scenario, before_scenario
+from step_impl import report
 import sys
 import json
 
@@ -47,7 +48,7 @@ def beforeScenarioHook():
     data_store.scenario["configureProtocolInterfaces"] = False
     data_store.scenario["createTrafficItem"] = False
     data_store.scenario["startTraffic"] = False
-    Messages.write_message("Ixnetwork before scenario completed")
+    report.writeMessage("Ixnetwork before scenario completed", report.DEBUG)
 
 ##########################################################################
 # methods
@@ -87,7 +88,7 @@ def connectToIxia(ipAddress, sessionName, clearConfig):
     results = data_store.scenario["IxnetworkController"].connectToChassis(ipAddress = ipAddress,
                                                                           sessionName = sessionName,
                                                                           clearConfig = clearConfig)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Connect to ixia failed"
     data_store.scenario["ixiaConnected"] = True
 
@@ -111,10 +112,10 @@ def configurePorts(portIds, forceOwnership):
     assert data_store.scenario["ixiaConnected"] == True, "ixia chassis is not connected"
     if portIds != "":
         portIdList = [int(x) for x in portIds.split(",")]
-        Messages.write_message("data to echo: {}".format("".join("0x{:02X} ".format(x) for x in portIdList)))
+        report.writeMessage("data to echo: {}".format("".join("0x{:02X} ".format(x) for x in portIdList)))
     else:
         portIdList = [1, 2]
-        Messages.write_message("PortIds are not given, it will take the default values")
+        report.writeMessage("PortIds are not given, it will take the default values")
     assert len(portIdList) == 2, "port ID list should have two ports, one as source and other as destination."
 
     forceOwnership = json.loads(forceOwnership.lower())
@@ -125,7 +126,7 @@ def configurePorts(portIds, forceOwnership):
 
     results = data_store.scenario["IxnetworkController"].configurePorts(portIdList = portIdList,
                                                                         forceOwnership = forceOwnership)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Configure ports failed"
     data_store.scenario["ixiaPortsConfigured"] = True
 
@@ -154,17 +155,17 @@ def configureTopologyAndDeviceGroup(topologyName, deviceGroupName, portId, multi
     assert portId != "", "Please don't leave the port ID empty"
     if multiplier == "":
         multiplier = '1'
-        Messages.write_message("multiplier value is not given, it will use the default value '1' ")
+        report.writeMessage("multiplier value is not given, it will use the default value '1' ")
 
     results = data_store.scenario["IxnetworkController"].configureTopology(topologyName = topologyName,
                                                                            portId = int(portId),
                                                                            multiplier = multiplier)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Configure topology failed"
     results = data_store.scenario["IxnetworkController"].configureDeviceGroup(topologyName = topologyName,
                                                                               deviceGroupName = deviceGroupName,
                                                                               multiplier = multiplier)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Configure device group failed"
     data_store.scenario["configureTopologyAndDeviceGroup"] = True
 
@@ -192,12 +193,12 @@ def configureProtocolInterfaces(deviceGroupName, protocolName, mtuValue):
 
     if mtuValue == "":
         mtuValue = "1500"
-        Messages.write_message("mtuValue value is not given, it will use the default value '1500' ")
+        report.writeMessage("mtuValue value is not given, it will use the default value '1500' ")
 
     results = data_store.scenario["IxnetworkController"].configureProtocolInterfaces(deviceGroupName = deviceGroupName,
                                                                                      protocolName = protocolName,
                                                                                      mtuValue = mtuValue)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Configure Protocol Interface failed"
     data_store.scenario["configureProtocolInterfaces"] = True
 
@@ -239,7 +240,7 @@ def createTrafficItem(trafficItemName, trafficType, biDirectional, sourcePortId,
                                                                            biDirectional = biDirectional,
                                                                            sourcePortId = sourcePortId,
                                                                            destPortId = destPortId)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Create traffic item failed"
     data_store.scenario["createTrafficItem"] = True
 
@@ -265,21 +266,21 @@ def configTrafficItem(frameSize, percentLineRate, etherTypeValue):
 
     if percentLineRate == "":
         percentLineRate = '100'
-        Messages.write_message("percentLineRate value is not given, it will use the default value '100' ")
+        report.writeMessage("percentLineRate value is not given, it will use the default value '100' ")
 
     if etherTypeValue == "":
         etherTypeValue = "ffff"
-        Messages.write_message("etherTypeValue value is not given, it will use the default value 'ffff' ")
+        report.writeMessage("etherTypeValue value is not given, it will use the default value 'ffff' ")
 
     if frameSize == "":
         frameSize = 245
-        Messages.write_message("frameSize value is not given, it will use the default value 245 ")
+        report.writeMessage("frameSize value is not given, it will use the default value 245 ")
 
     frameSize = int(frameSize)
     results = data_store.scenario["IxnetworkController"].configTrafficItem(frameSize = frameSize,
                                                                            percentLineRate = percentLineRate,
                                                                            etherTypeValue = etherTypeValue)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Configure traffic item failed"
 
 @step("Start traffic")
@@ -299,7 +300,7 @@ def startTraffic():
     assert data_store.scenario["createTrafficItem"] == True, "Traffic item is not created"
 
     results = data_store.scenario["IxnetworkController"].startTraffic()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Start traffic failed"
     data_store.scenario["startTraffic"] = True
 
@@ -318,7 +319,7 @@ def printStatistics():
     """
     assert data_store.scenario["startTraffic"] == True, "Traffic is not started"
     results = data_store.scenario["IxnetworkController"].printStatistics()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Print statistics failed"
 
 @step ("Stop traffic")
@@ -336,5 +337,5 @@ def stopTraffic():
     """
     assert data_store.scenario["startTraffic"] == True, "Traffic is not started"
     results = data_store.scenario["IxnetworkController"].stopTraffic()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Stop traffic failed"
\ No newline at end of file
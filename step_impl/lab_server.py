@@ -0,0 +1,270 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Lab Server Client for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Client for the lab server API (``lab_server_url``, default ``http://10.10.1.100:5000/api/v2``) used by ``utility.py`` and ``web_relay.py``.
+
+All requests of the suite go through one ``requests.Session`` so the HTTP connections are pooled. Reservations are retried with jittered exponential backoff starting at ``RESERVE_BACKOFF_BASE`` seconds, so a tool is picked up shortly after it is freed instead of after a fixed 15 s sleep. If ``lab_server_long_poll`` is set to a number of seconds the reserve request asks the server to hold the request open for that long (``wait`` query parameter) before answering busy. Several tools can be reserved concurrently with ``reserveAll``.
+
+Lookups that only change when the lab is reconfigured (config CRC, protocol lookup, relay info) go through ``cachedPost``. Successful responses are kept in memory and in ``lab_server_cache_dir`` (default ``.lab_server_cache`` in the workspace) keyed by a hash of the path and request data, so later scenarios and later Gauge runs skip the round trip. An entry older than ``lab_server_cache_ttl`` seconds (default 3600, 0 disables the cache) is revalidated with ``If-None-Match`` when the server sent an ``ETag``, otherwise fetched again. Entries on disk carry a hash of the response and are dropped if it doesn't match.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import data_store
+from concurrent.futures import ThreadPoolExecutor
+import os
+import json
+import hashlib
+import random
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+##########################################################################
+# constants
+###
+LAB_SERVER_URL = "http://10.10.1.100:5000/api/v2"
+REQUEST_TIMEOUT = 30
+RESERVE_TIMEOUT = 300
+RESERVE_BACKOFF_BASE = 0.5
+RESERVE_BACKOFF_MAX = 15
+POOL_SIZE = 8
+CACHE_DIR = ".lab_server_cache"
+CACHE_TTL = 3600
+
+##########################################################################
+# lab server client
+###
+class LabServerClient:
+    """
+    Pooled HTTP client for the lab server.
+
+    Args:
+        url (string, optional): API base url. Defaults to ``lab_server_url`` or ``LAB_SERVER_URL``.
+    """
+    def __init__(self, url=None):
+        self.url = (url or os.getenv("lab_server_url", LAB_SERVER_URL)).rstrip("/")
+        self.longPoll = int(os.getenv("lab_server_long_poll", "0"))
+        self.cacheDir = os.getenv("lab_server_cache_dir", CACHE_DIR)
+        self.cacheTTL = float(os.getenv("lab_server_cache_ttl", CACHE_TTL))
+        self.cache = {}
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _send(self, path, data, params=None, timeout=REQUEST_TIMEOUT, headers=None):
+        # returns the decoded results and the http response (None on a transport error)
+        try:
+            response = self.session.post(url="{}/{}".format(self.url, path), params=params, data=json.dumps(data), timeout=timeout, headers=headers)
+        except requests.RequestException as exc:
+            return {"result": -1, "description": "error while sending request to {}: {}".format(path, exc), "data": None}, None
+        if response.status_code == 304:
+            return None, response
+        if response.status_code != 200:
+            return {"result": -1, "description": "error returned from server {}: {} {}".format(path, response.status_code, response.text), "data": None}, response
+        try:
+            return response.json(), response
+        except ValueError:
+            return {"result": -1, "description": "invalid JSON returned from server {}: {}".format(path, response.text), "data": None}, response
+
+    def post(self, path, data, params=None, timeout=REQUEST_TIMEOUT):
+        """
+        Posts JSON data to the lab server.
+
+        Args:
+            path (string): API path (ie. ``reserve``).
+            data (dict): Request data, sent as JSON text.
+            params (dict, optional): Query parameters. Defaults to None.
+            timeout (float, optional): Request timeout in seconds. Defaults to ``REQUEST_TIMEOUT``.
+
+        Returns:
+            dict: Server response. On a transport or HTTP error ``result`` is -1 and ``description`` holds the error.
+        """
+        return self._send(path, data, params, timeout)[0]
+
+    def _cacheKey(self, path, data):
+        return hashlib.sha256("{} {}".format(path, json.dumps(data, sort_keys=True)).encode()).hexdigest()
+
+    def _cacheFile(self, key):
+        return os.path.join(self.cacheDir, "{}.json".format(key))
+
+    def _loadEntry(self, key):
+        if key in self.cache:
+            return self.cache[key]
+        try:
+            with open(self._cacheFile(key)) as cacheJson:
+                entry = json.load(cacheJson)
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(json.dumps(entry["results"], sort_keys=True).encode()).hexdigest() != entry["hash"]:
+            return None
+        self.cache[key] = entry
+        return entry
+
+    def _storeEntry(self, key, path, results, etag):
+        entry = {
+            "path": path,
+            "results": results,
+            "etag": etag,
+            "hash": hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest(),
+            "storedAt": time.time()
+        }
+        self.cache[key] = entry
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            # write then rename so parallel streams never read a half written entry
+            tmpFile = "{}.{}.tmp".format(self._cacheFile(key), os.getpid())
+            with open(tmpFile, "w") as cacheJson:
+                json.dump(entry, cacheJson)
+            os.replace(tmpFile, self._cacheFile(key))
+        except OSError:
+            pass
+
+    def cachedPost(self, path, data, timeout=REQUEST_TIMEOUT):
+        """
+        Posts JSON data to the lab server, answering from the cache while the entry is fresh.
+
+        Args:
+            path (string): API path (ie. ``lookup``).
+            data (dict): Request data, sent as JSON text.
+            timeout (float, optional): Request timeout in seconds. Defaults to ``REQUEST_TIMEOUT``.
+
+        Returns:
+            dict: Server response, only responses with ``result`` 0 are cached.
+        """
+        if self.cacheTTL <= 0:
+            return self.post(path, data, timeout=timeout)
+        key = self._cacheKey(path, data)
+        entry = self._loadEntry(key)
+        if entry is not None and time.time() - entry["storedAt"] < self.cacheTTL:
+            self.cacheHits += 1
+            return entry["results"]
+        headers = None
+        if entry is not None and entry["etag"]:
+            headers = {"If-None-Match": entry["etag"]}
+        results, response = self._send(path, data, timeout=timeout, headers=headers)
+        if results is None and entry is not None:
+            # 304, the cached response is still valid
+            self.cacheHits += 1
+            self._storeEntry(key, path, entry["results"], entry["etag"])
+            return entry["results"]
+        self.cacheMisses += 1
+        if results is None:
+            return {"result": -1, "description": "unexpected 304 from server {}".format(path), "data": None}
+        if results["result"] == 0:
+            self._storeEntry(key, path, results, response.headers.get("ETag"))
+        return results
+
+    def invalidate(self, path=None):
+        """
+        Drops cached responses from memory and disk.
+
+        Args:
+            path (string, optional): Only drop responses of this API path. Defaults to None for all.
+        """
+        for key in list(self.cache.keys()):
+            if path is None or self.cache[key]["path"] == path:
+                del self.cache[key]
+        if not os.path.isdir(self.cacheDir):
+            return
+        for filename in os.listdir(self.cacheDir):
+            filepath = os.path.join(self.cacheDir, filename)
+            if path is not None:
+                try:
+                    with open(filepath) as cacheJson:
+                        if json.load(cacheJson)["path"] != path:
+                            continue
+                except (OSError, ValueError, KeyError):
+                    pass
+            try:
+                os.remove(filepath)
+            except OSError:
+                pass
+
+    def reserve(self, node, toolname, vlanId, timeout=RESERVE_TIMEOUT):
+        """
+        Reserves a tool for the node, retrying while the tool is busy (``result`` 1) or the request doesn't reach the server.
+
+        Args:
+            node (string): Node name.
+            toolname (string): Tool name.
+            vlanId (int): VLAN ID of the node.
+            timeout (float, optional): Timeout in seconds. Defaults to ``RESERVE_TIMEOUT``.
+
+        Returns:
+            dict: Last server response, with the number of ``attempts`` and the ``waited`` seconds added.
+        """
+        start = time.time()
+        deadline = start + timeout
+        params = {"vlan_id": vlanId}
+        if self.longPoll > 0:
+            params["wait"] = self.longPoll
+        attempt = 0
+        while True:
+            attempt += 1
+            results, response = self._send("reserve", {"node": node, "toolname": toolname}, params=params, timeout=REQUEST_TIMEOUT + self.longPoll)
+            remaining = deadline - time.time()
+            # transport errors (no response) are retried like a busy tool
+            if (results["result"] != 1 and response is not None) or remaining <= 0:
+                break
+            # full jitter so nodes waiting on the same tool don't retry in lock step
+            delay = random.uniform(0, min(RESERVE_BACKOFF_BASE * 2 ** (attempt - 1), RESERVE_BACKOFF_MAX))
+            time.sleep(min(delay, remaining))
+        results["attempts"] = attempt
+        results["waited"] = time.time() - start
+        return results
+
+    def reserveAll(self, node, toolnames, vlanId, timeout=RESERVE_TIMEOUT):
+        """
+        Reserves several tools concurrently.
+
+        Args:
+            node (string): Node name.
+            toolnames (list): Tool names.
+            vlanId (int): VLAN ID of the node.
+            timeout (float, optional): Timeout in seconds for each tool. Defaults to ``RESERVE_TIMEOUT``.
+
+        Returns:
+            dict: Server response of each tool name.
+        """
+        with ThreadPoolExecutor(max_workers=min(len(toolnames), POOL_SIZE) or 1) as executor:
+            futures = {toolname: executor.submit(self.reserve, node, toolname, vlanId, timeout) for toolname in toolnames}
+        return {toolname: future.result() for toolname, future in futures.items()}
+
+    def unreserve(self, node, toolname):
+        """
+        Releases a tool reserved by the node.
+
+        Args:
+            node (string): Node name.
+            toolname (string): Tool name.
+
+        Returns:
+            dict: Server response.
+        """
+        return self.post("unreserve", {"node": node, "toolname": toolname})
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+        self.session.close()
+
+###
+# client accessor
+###
+def getLabServerClient():
+    """
+    Returns the suite client stored in ``data_store.suite["labServerClient"]``, creating it on first use.
+    """
+    if "labServerClient" not in data_store.suite or data_store.suite["labServerClient"] is None:
+        data_store.suite["labServerClient"] = LabServerClient()
+    return data_store.suite["labServerClient"]
@@ -0,0 +1,113 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Latency Histogram for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+HDR-style latency histogram used by the IO latency Steps in ``capi.py``.
+
+Values are recorded in nanoseconds into log-linear buckets: every power of two range is split into ``2 ** subBucketBits`` linear sub buckets, so the relative error of any reported percentile is below ``1 / 2 ** subBucketBits`` (under 1% with the default of 7 bits) whatever the magnitude of the value, while the memory used only grows with the number of distinct buckets hit.
+"""
+##########################################################################
+# import libraries
+###
+import json
+
+##########################################################################
+# constants
+###
+SUB_BUCKET_BITS = 7
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+##########################################################################
+# latency histogram
+###
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies in nanoseconds.
+
+    Args:
+        subBucketBits (int, optional): Linear sub buckets per power of two as a number of bits. Defaults to ``SUB_BUCKET_BITS``.
+    """
+    def __init__(self, subBucketBits=SUB_BUCKET_BITS):
+        self.subBucketBits = subBucketBits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value):
+        # sub buckets of a power of two range are 2 ** subBucketBits to 2 ** (subBucketBits + 1) - 1
+        shift = max(value.bit_length() - self.subBucketBits - 1, 0)
+        return shift, value >> shift
+
+    def record(self, value):
+        """
+        Records a latency.
+
+        Args:
+            value (int): Latency in ns.
+        """
+        value = max(int(value), 0)
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def valueAtPercentile(self, percentile):
+        """
+        Args:
+            percentile (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Highest value in the bucket holding the given percentile in ns, capped at the recorded maximum. None if nothing was recorded.
+        """
+        if self.count == 0:
+            return None
+        target = max(1, int(round(percentile / 100.0 * self.count)))
+        seen = 0
+        for shift, sub in sorted(self.counts, key=lambda bucket: bucket[1] << bucket[0]):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                return min(((sub + 1) << shift) - 1, self.max)
+        return self.max
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Args:
+            percentiles (tuple, optional): Percentiles to report. Defaults to ``PERCENTILES``.
+
+        Returns:
+            dict: ``count``, ``min``, ``mean``, ``max`` and one ``pXX`` entry per percentile, all in ns.
+        """
+        summary = {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max
+        }
+        for percentile in percentiles:
+            summary["p{:g}".format(percentile)] = self.valueAtPercentile(percentile)
+        return summary
+
+    def toJson(self, **extra):
+        """
+        Serializes the summary and the raw buckets so histograms from several runs can be merged later.
+
+        Args:
+            **extra: Additional fields stored with the histogram (ie. rate, timeouts).
+
+        Returns:
+            string: JSON document.
+        """
+        document = dict(extra)
+        document["unit"] = "ns"
+        document["subBucketBits"] = self.subBucketBits
+        document["summary"] = self.summary()
+        document["buckets"] = [[sub << shift, self.counts[(shift, sub)]] for shift, sub in sorted(self.counts, key=lambda bucket: bucket[1] << bucket[0])]
+        return json.dumps(document, indent=2)
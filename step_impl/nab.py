@@ -16,7 +16,8 @@ Go to the Concepts to see any concepts that simplify the steps.
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite, after_suite, before_spec
+from getgauge.python import step, data_store, before_suite, after_suite, before_spec
+from step_impl import report, hex_dump
 import os
 import sys
 import filecmp
@@ -68,14 +69,14 @@ def nabConnect():
         * NAB connect
     """    
     if data_store.suite["nabAgentConnected"]:
-        Messages.write_message("NAB Agent object already connected")
+        report.writeMessage("NAB Agent object already connected")
     else:
         try:
             data_store.suite["nabAgentController"] = NABAgentController()
-            Messages.write_message("create NAB Agent object successful")
+            report.writeMessage("create NAB Agent object successful")
             data_store.suite["nabAgentConnected"] = True
         except:
-            Messages.write_message("error creating NAB Agent object")
+            report.writeMessage("error creating NAB Agent object")
             assert False
 ###
 # disconnect
@@ -96,7 +97,7 @@ def nabDisconnect():
     if data_store.suite["nabAgentConnected"]:
         del(data_store.suite["nabAgentController"])
     else:
-        Messages.write_message("NAB Agent not connected")
+        report.writeMessage("NAB Agent not connected")
     data_store.suite["nabAgentConnected"] = False
 ###
 # echo data
@@ -123,20 +124,20 @@ def nabEchoData(echoData, verifyResponseResult):
     assert data_store.suite["nabAgentConnected"] == True, "NAB Agent is not connected"
     if echoData != "":
         data = [int(x) for x in echoData.split(",")]
-        Messages.write_message("data to echo: {}".format("".join("0x{:02X} ".format(x) for x in data)))
+        report.writeMessage("data to echo: {}".format(hex_dump.hexList(data)))
     else:
         data = list()
-        Messages.write_message("data to echo: empty")
+        report.writeMessage("data to echo: empty")
 
     #TODO - need a way to store nab/ssr specific values like the command type
     results = data_store.suite["nabAgentController"].exchange(0x5002005c, 0x0000, 0x0001, len(data), data)
     # This is the success response for the socket exchange
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "nab connection error"
     
-    Messages.write_message("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"]["header"]))
-    Messages.write_message("Response Result: {}".format(results["data"]["result"]))
-    Messages.write_message("Response Data: {}".format("".join("0x{:02X} ".format(x) for x in results["data"]["data"])))
+    report.writeMessage("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"]["header"]))
+    report.writeMessage("Response Result: {}".format(results["data"]["result"]))
+    report.writeMessage("Response Data: {}".format(hex_dump.hexList(results["data"]["data"])))
 
     # Confirm the formatting of the response header, except the msg_id
     assert int(results["data"]["header"][0]) == int(0x5002805c), "replied command is incorrect"
@@ -178,18 +179,18 @@ def nabInverseData(inverseData, verifyResponseResult):
     assert data_store.suite["nabAgentConnected"] == True, "NAB Agent is not connected"
     if inverseData != "":
         data = [int(x) for x in inverseData.split(",")]
-        Messages.write_message("data to inverse: {}".format("".join("0x{:02X} ".format(x) for x in data)))
+        report.writeMessage("data to inverse: {}".format(hex_dump.hexList(data)))
     else:
         data = list()
-        Messages.write_message("data to inverse in empty, sending empty inverse request")
+        report.writeMessage("data to inverse in empty, sending empty inverse request")
        
     results = data_store.suite["nabAgentController"].exchange(0x500200ba, 0x0000, 0x0001, len(data), data)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "nab connection error"
 
-    Messages.write_message("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"]["header"]))
-    Messages.write_message("Response Result: {}".format(results["data"]["result"]))
-    Messages.write_message("Response Data: {}".format("".join("0x{:02X} ".format(x) for x in results["data"]["data"])))
+    report.writeMessage("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"]["header"]))
+    report.writeMessage("Response Result: {}".format(results["data"]["result"]))
+    report.writeMessage("Response Data: {}".format(hex_dump.hexList(results["data"]["data"])))
 
     # Confirm the formatting of the response header, except the msg_id
     assert int(results["data"]["header"][0]) == int(0x500280ba), "replied command is incorrect"
@@ -227,19 +228,19 @@ def nabInverseData(inverseData, verifyResponseResult):
 #     """
 #     assert data_store.suite["nabAgentConnected"] == True, "NAB Agent is not connected"
 #     results = data_store.suite["nabAgentController"].readInternalDiag()
-#     Messages.write_message(results["description"])
-#     Messages.write_message(results)
+#     report.writeMessage(results["description"])
+#     report.writeMessage(results)
 #     assert results["result"] == 0, "read internal diag failed"
 #     try:
-#         Messages.write_message("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"][0]["header"]))
-#         Messages.write_message("Response Result: {}".format(results["data"][0]["result"]))
-#         Messages.write_message("Response Data: {}".format("".join("0x{:02X} ".format(x) for x in results["data"][0]["data"])))
-#         Messages.write_message("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"][1]["header"]))
-#         Messages.write_message("Response Result: {}".format(results["data"][1]["result"]))
-#         Messages.write_message("Response Data: {}".format("".join("0x{:02X} ".format(x) for x in results["data"][1]["data"])))
+#         report.writeMessage("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"][0]["header"]))
+#         report.writeMessage("Response Result: {}".format(results["data"][0]["result"]))
+#         report.writeMessage("Response Data: {}".format(hex_dump.hexList(results["data"][0]["data"])))
+#         report.writeMessage("Response Header: 0x{:08X} 0x{:04X} 0x{:04X} 0x{:04X} 0x{:04X}".format(*results["data"][1]["header"]))
+#         report.writeMessage("Response Result: {}".format(results["data"][1]["result"]))
+#         report.writeMessage("Response Data: {}".format(hex_dump.hexList(results["data"][1]["data"])))
 #     except:
-#         Messages.write_message("Issue printing data")
-#         Messages.write_message(results)
+#         report.writeMessage("Issue printing data")
+#         report.writeMessage(results)
 #     if verifyResponseResult.lower() == "true":
 #         assert results["data"][0]["result"] == 0, "return 0 from nab was non-zero"
 #         assert results["data"][1]["result"] == 0, "return 1 from nab was non-zero"
@@ -267,8 +268,8 @@ def nabInverseData(inverseData, verifyResponseResult):
 #     assert os.path.exists(filePath), "file does not exist, {}".format(filePath)
 #     assert data_store.suite["nabAgentConnected"] == True, "NAB Agent is not connected"
 #     results = data_store.suite["nabAgentController"].writeConfigFile(filePath)
-#     Messages.write_message(results["description"])
-#     Messages.write_message(results)
+#     report.writeMessage(results["description"])
+#     report.writeMessage(results)
 #     if verifyResult.lower() == "true":
 #         assert results["result"] == 0, "write config failed"
 #     elif verifyResult.lower() == "non-zero":
@@ -296,8 +297,8 @@ def nabInverseData(inverseData, verifyResponseResult):
 #     filePath = os.getenv("workspace_path") + filePath
 #     assert data_store.suite["nabAgentConnected"] == True, "NAB Agent is not connected"
 #     results = data_store.suite["nabAgentController"].readConfigFile(filePath)
-#     Messages.write_message(results["description"])
-#     Messages.write_message(results)
+#     report.writeMessage(results["description"])
+#     report.writeMessage(results)
 #     if verifyResult.lower() == "true":
 #         assert results["result"] == 0, "read config failed"
 #     elif verifyResult.lower() == "non-zero":
@@ -327,8 +328,8 @@ def nabInverseData(inverseData, verifyResponseResult):
 #     else:
 #         threadRate = float(threadRate)
 #         results = data_store.suite["nabAgentController"].subscribeDataUpdate(threadRate)
-#     Messages.write_message(results["description"])
-#     Messages.write_message(results)
+#     report.writeMessage(results["description"])
+#     report.writeMessage(results)
 #     assert results["result"] == 0, "subscribe update failed"
 #     data_store.spec["nabAgentSubTransactions"].append(results["data"]["transaction"])
 # ###
@@ -361,8 +362,8 @@ def nabInverseData(inverseData, verifyResponseResult):
 #                 results = data_store.suite["nabAgentController"].unsubscribeDataUpdate(transactionId)
 #             else:
 #                 results = data_store.suite["nabAgentController"].unsubscribeDataUpdate(transactionId, int(timeout))
-#             Messages.write_message(results["description"])
-#             Messages.write_message(results)
+#             report.writeMessage(results["description"])
+#             report.writeMessage(results)
 #             if verifyResult.lower() == "true":
 #                 assert results["result"] == 0, "unsubscribe update failed"
 #             elif verifyResult.lower() == "non-zero":
@@ -376,8 +377,8 @@ def nabInverseData(inverseData, verifyResponseResult):
 #             results = data_store.suite["nabAgentController"].unsubscribeDataUpdate(transaction)
 #         else:
 #             results = data_store.suite["nabAgentController"].unsubscribeDataUpdate(transaction, int(timeout))
-#         Messages.write_message(results["description"])
-#         Messages.write_message(results)
+#         report.writeMessage(results["description"])
+#         report.writeMessage(results)
 #         if verifyResult.lower() == "true":
 #             assert results["result"] == 0, "unsubscribe update failed"
 #         elif verifyResult.lower() == "non-zero":
@@ -8,7 +8,8 @@
 #
 ##########################################################################
 """
-The ``numato_ethernet_relay_library`` is used for this Step Implementation file. All Steps are in the ``numato_ethernet_relay.py`` file.
+All Steps are in the ``numato_ethernet_relay.py`` file.
+Every Step talks to the relay through the telnet session of ``numato_session.py``, which stays logged in for the whole suite. The relay accepts only one telnet client at a time, so no Step opens a connection of its own.
 Go to the Concepts to see any concepts that simplify the steps.
 
 Below are a list of implemented Steps:
@@ -17,14 +18,14 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite
+from getgauge.python import step, data_store, before_suite
+from step_impl import report, relay_state, numato_session
 import os
-import sys
-sys.path.append(r"../numato_ethernet_relay_library")
-try:
-    from NumatoEthernetRelayLibrary import NumatoEthernetRelayController
-except Exception as exc:
-    print("import numato_ethernet_relay:: {} occured: {}".format(type(exc).__name__, exc))
+
+##########################################################################
+# constants
+###
+NUMATO_RELAY_COUNT = 16
 
 ##########################################################################
 # before suite
@@ -34,20 +35,74 @@ def beforeSuiteHook():
     """
     Initializes variables:
         * ``data_store.suite["numatoEthernetRelayConnected"]`` is set to ``{}`` so that no Step can be run unless the PyLogix Controller class is created
-        * ``data_store.suite["numatoEthernetRelayController"]`` is set to ``{}`` so that no Step can be run unless the PyLogix Controller class is created
+        * ``data_store.suite["numatoEthernetRelayHost"]`` is set to ``{}``, the host of each name is used to find its telnet session in ``numato_session.py``
     """
     data_store.suite["numatoEthernetRelayConnected"] = {}
-    data_store.suite["numatoEthernetRelayController"] = {}
+    data_store.suite["numatoEthernetRelayHost"] = {}
 
 ##########################################################################
 # methods
 ###
+# relay state
+###
+def getNumatoRelayState(name):
+    """
+    Args:
+        name (string): The key used to differentiate the object.
+
+    Returns:
+        RelayState: Cached relay states of the relay, see ``relay_state.py``.
+    """
+    return relay_state.getRelayState("numato-{}".format(name), lambda: readNumatoRelayStates(name))
+
+def getNumatoSession(name):
+    """
+    Args:
+        name (string): The key used to differentiate the object.
+
+    Returns:
+        NumatoSession: Logged in telnet session of the relay host, see ``numato_session.py``.
+    """
+    return numato_session.getNumatoSession(data_store.suite["numatoEthernetRelayHost"][name])
+
+def readNumatoRelayStates(name):
+    """
+    Reads all relay states of a Numato relay.
+
+    Args:
+        name (string): The key used to differentiate the object.
+
+    Returns:
+        dict: ``result`` is 0 and ``data`` the state (0 or 1) of each relay index.
+    """
+    results = getNumatoSession(name).readAll()
+    if results["result"] != 0:
+        return results
+    states = relay_state.parseStates(results["data"], NUMATO_RELAY_COUNT)
+    if states is None:
+        return {"result": -1, "description": "Unknown relay read all data {}".format(results["data"]), "data": None}
+    return {"result": 0, "description": results["description"], "data": states}
+
+def updateNumatoRelayState(name, results, states):
+    """
+    Records a write in the relay state, a failed write invalidates it.
+
+    Args:
+        name (string): The key used to differentiate the object.
+        results (dict): Results of the write.
+        states (dict): Written state of each relay index.
+    """
+    if results["result"] == 0:
+        getNumatoRelayState(name).written(states)
+    else:
+        getNumatoRelayState(name).invalidate()
+###
 # connect
 ###
 @step("Numato eth relay connect to <name> at <host>")
 def numatoEthernetRelayConnect(name, host):
     """
-    Create the PyLogix Contoller class using the ``data_store.suite["numatoEthernetRelayController"]`` variable with the given ``name`` key.
+    Log in the telnet session to the relay at ``host`` and store it with the given ``name`` key.
 
     Args:
         name (string): The key used to differentiate the object.
@@ -63,12 +118,14 @@ def numatoEthernetRelayConnect(name, host):
     """
     if name in data_store.suite["numatoEthernetRelayConnected"]:
         if data_store.suite["numatoEthernetRelayConnected"][name]:
-            Messages.write_message("NAB Agent object already connected")
+            report.writeMessage("NAB Agent object already connected")
     try:
-        data_store.suite["numatoEthernetRelayController"][name] = NumatoEthernetRelayController(ip=host)
+        numato_session.getNumatoSession(host).login()
+        data_store.suite["numatoEthernetRelayHost"][name] = host
         data_store.suite["numatoEthernetRelayConnected"][name] = True
-    except:
-        Messages.write_message("Error creating Numato Ethernet Relay object")
+        getNumatoRelayState(name).invalidate()
+    except Exception as exc:
+        report.writeMessage("Error logging in to Numato Ethernet Relay, {}: {}".format(type(exc).__name__, exc))
         assert False
 ###
 # version
@@ -93,8 +150,8 @@ def numatoEthernetRelayVersion(name):
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].ver()
-    Messages.write_message(results)
+    results = getNumatoSession(name).version()
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # reset
@@ -119,8 +176,9 @@ def numatoEthernetRelayReset(name):
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].reset()
-    Messages.write_message(results)
+    results = getNumatoSession(name).reset()
+    getNumatoRelayState(name).invalidate()
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # read
@@ -128,7 +186,7 @@ def numatoEthernetRelayReset(name):
 @step("Numato eth relay read at <name> with <index>")
 def numatoEthernetRelayRead(name, index):
     """
-    Read the state of the relay at the given ``index`` from the relay with the given ``name`` key.
+    Read the state of the relay at the given ``index`` from the relay with the given ``name`` key. A state confirmed within ``relay_state_ttl`` seconds is answered from the relay state.
 
     Args:
         name (string): The key used to differentiate the object.
@@ -146,8 +204,12 @@ def numatoEthernetRelayRead(name, index):
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].relayRead(int(index))
-    Messages.write_message(results)
+    cached = getNumatoRelayState(name).cached([int(index)])
+    if cached is not None:
+        results = {"result": 0, "description": "relay {} state from cache".format(index), "data": cached[int(index)]}
+    else:
+        results = getNumatoSession(name).relayRead(int(index))
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # read all
@@ -155,7 +217,7 @@ def numatoEthernetRelayRead(name, index):
 @step("Numato eth relay read all at <name>")
 def numatoEthernetRelayReadAll(name):
     """
-    Read all states from the relay with the given ``name`` key.
+    Read all states from the relay with the given ``name`` key. After a write all states are read once, then answered from the relay state for ``relay_state_ttl`` seconds.
 
     Args:
         name (string): The key used to differentiate the object.
@@ -172,8 +234,8 @@ def numatoEthernetRelayReadAll(name):
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].relayReadAll()
-    Messages.write_message(results)
+    results = getNumatoRelayState(name).read(range(NUMATO_RELAY_COUNT))
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # relay on
@@ -181,11 +243,11 @@ def numatoEthernetRelayReadAll(name):
 @step("Numato eth relay on at <name> with <index>")
 def numatoEthernetRelayOn(name, index):
     """
-    Set the state high of the relay at the given ``index`` from the relay with the given ``name`` key.
+    Set the state high of the relay at the given ``index`` from the relay with the given ``name`` key. Several comma separated indexes are sent in one write on the telnet session.
 
     Args:
         name (string): The key used to differentiate the object.
-        index (int): Index of the relay.
+        index (string): Index of the relay or comma separated indexes.
 
     Step and function definition::
 
@@ -194,13 +256,16 @@ def numatoEthernetRelayOn(name, index):
 
     Example usage:
         * Numato eth relay on at "relay-1" with "0"
+        * Numato eth relay on at "relay-1" with "0,1,2,3"
     """
     if name in data_store.suite["numatoEthernetRelayConnected"]:
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].relayOn(int(index))
-    Messages.write_message(results)
+    indices = [int(i) for i in index.split(",")]
+    results = getNumatoSession(name).relaysOn(indices)
+    updateNumatoRelayState(name, results, {i: 1 for i in indices})
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # relay off
@@ -208,11 +273,11 @@ def numatoEthernetRelayOn(name, index):
 @step("Numato eth relay off at <name> with <index>")
 def numatoEthernetRelayOff(name, index):
     """
-    Set the state low of the relay at the given ``index`` from the relay with the given ``name`` key.
+    Set the state low of the relay at the given ``index`` from the relay with the given ``name`` key. Several comma separated indexes are sent in one write on the telnet session.
 
     Args:
         name (string): The key used to differentiate the object.
-        index (int): Index of the relay.
+        index (string): Index of the relay or comma separated indexes.
 
     Step and function definition::
 
@@ -221,13 +286,16 @@ def numatoEthernetRelayOff(name, index):
 
     Example usage:
         * Numato eth relay off at "relay-1" with "0"
+        * Numato eth relay off at "relay-1" with "0,1,2,3"
     """
     if name in data_store.suite["numatoEthernetRelayConnected"]:
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].relayOff(int(index))
-    Messages.write_message(results)
+    indices = [int(i) for i in index.split(",")]
+    results = getNumatoSession(name).relaysOff(indices)
+    updateNumatoRelayState(name, results, {i: 0 for i in indices})
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
 ###
 # write all
@@ -255,6 +323,39 @@ def numatoEthernetRelayWriteAll(name, indexList):
         assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
     else:
         assert False, "Numato web relay with name ({}) does not exist".format(name)
-    results = data_store.suite["numatoEthernetRelayController"][name].relayWriteAll(indexList)
-    Messages.write_message(results)
+    results = getNumatoSession(name).writeAll(sum([state << i for i, state in enumerate(indexList)]), NUMATO_RELAY_COUNT)
+    updateNumatoRelayState(name, results, dict(enumerate(indexList)))
+    report.writeMessage(results)
+    assert results["result"] == 0, "Error getting results"
+###
+# write bitmask
+###
+@step("Numato eth relay write bitmask at <name> with <bitmask> and <mask>")
+def numatoEthernetRelayWriteBitmask(name, bitmask, mask):
+    """
+    Set the relays selected by ``mask`` to the states in ``bitmask`` from the relay with the given ``name`` key, the other relays keep their state. The states are read and written with one ``relay writeall`` without other commands in between, so all selected relays switch at the same time.
+
+    Args:
+        name (string): The key used to differentiate the object.
+        bitmask (string): Relay states, bit 0 is relay 0 (ie. ``0x00F0``).
+        mask (string): Relays to set, ``0xFFFF`` for all.
+
+    Step and function definition::
+
+        @step("Numato eth relay write bitmask at <name> with <bitmask> and <mask>")
+        def numatoEthernetRelayWriteBitmask(name, bitmask, mask):
+
+    Example usage:
+        * Numato eth relay write bitmask at "relay-1" with "0x00F0" and "0x00FF"
+    """
+    if name in data_store.suite["numatoEthernetRelayConnected"]:
+        assert data_store.suite["numatoEthernetRelayConnected"][name] == True, "Numato web relay is not connected"
+    else:
+        assert False, "Numato web relay with name ({}) does not exist".format(name)
+    results = getNumatoSession(name).writeMask(int(bitmask, 0), int(mask, 0), NUMATO_RELAY_COUNT)
+    if results["result"] == 0:
+        updateNumatoRelayState(name, results, relay_state.parseStates(results["data"], NUMATO_RELAY_COUNT))
+    else:
+        getNumatoRelayState(name).invalidate()
+    report.writeMessage(results)
     assert results["result"] == 0, "Error getting results"
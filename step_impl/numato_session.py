@@ -0,0 +1,265 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Numato Relay Telnet Sessions for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Pool of logged in telnet sessions to Numato ethernet relays used by ``numato_ethernet_relay.py``.
+
+One session per relay host is kept in ``data_store.suite["numatoSessions"]`` and stays logged in across scenarios until the end of the suite. Several commands are sent in one write and their answers are read back together, one ``>`` prompt per command, so switching N relays costs one round trip instead of N. A session that was closed by the relay is logged in again once before the commands fail.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import data_store, after_suite
+import os
+import socket
+import threading
+import time
+
+##########################################################################
+# constants
+###
+NUMATO_PORT = 23
+NUMATO_USER = "admin"
+NUMATO_PASSWORD = "admin"
+NUMATO_TIMEOUT = 5
+NUMATO_PROMPT = b">"
+NUMATO_LINE_END = "\r"
+RELAY_NAMES = "0123456789ABCDEFGHIJKLMNOPQRSTUV"
+
+##########################################################################
+# numato session
+###
+def relayName(index):
+    """
+    Args:
+        index (int): Relay index.
+
+    Returns:
+        string: Relay number in the Numato command set, 10 and up are letters.
+    """
+    return RELAY_NAMES[int(index)]
+
+class NumatoSession:
+    """
+    Logged in telnet session to one Numato ethernet relay.
+
+    Args:
+        host (string): IP address of the relay.
+        user (string, optional): Login user. Defaults to ``numato_user`` or ``NUMATO_USER``.
+        password (string, optional): Login password. Defaults to ``numato_password`` or ``NUMATO_PASSWORD``.
+    """
+    def __init__(self, host, user=None, password=None):
+        self.host = host
+        self.user = user or os.getenv("numato_user", NUMATO_USER)
+        self.password = password or os.getenv("numato_password", NUMATO_PASSWORD)
+        self.sock = None
+        self.buffer = b""
+        self.lock = threading.RLock()
+
+    def _readUntil(self, token, deadline):
+        while token not in self.buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("{} did not send {}".format(self.host, token))
+            self.sock.settimeout(remaining)
+            data = self.sock.recv(4096)
+            if not data:
+                raise ConnectionError("{} closed the session".format(self.host))
+            self.buffer += data
+        data, _, self.buffer = self.buffer.partition(token)
+        return data
+
+    def login(self):
+        """
+        Opens the telnet connection and logs in.
+        """
+        self.close()
+        deadline = time.monotonic() + NUMATO_TIMEOUT
+        self.sock = socket.create_connection((self.host, NUMATO_PORT), NUMATO_TIMEOUT)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = b""
+        self._readUntil(b"User Name:", deadline)
+        self.sock.sendall((self.user + NUMATO_LINE_END).encode())
+        self._readUntil(b"Password:", deadline)
+        self.sock.sendall((self.password + NUMATO_LINE_END).encode())
+        self._readUntil(NUMATO_PROMPT, deadline)
+
+    def _send(self, commands):
+        if self.sock is None:
+            self.login()
+        deadline = time.monotonic() + NUMATO_TIMEOUT
+        self.sock.sendall("".join([command + NUMATO_LINE_END for command in commands]).encode())
+        answers = []
+        for command in commands:
+            # the relay echoes the command, the answer follows on the next lines
+            lines = self._readUntil(NUMATO_PROMPT, deadline).decode(errors="replace").replace("\r", "\n").split("\n")
+            lines = [line.strip() for line in lines if line.strip()]
+            if lines and lines[0] == command:
+                lines = lines[1:]
+            answers.append("\n".join(lines))
+        return answers
+
+    def command(self, *commands):
+        """
+        Sends the commands in one write and reads their answers.
+
+        Args:
+            commands (string): Numato commands (ie. ``relay on 3``).
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the list of answers, one per command.
+        """
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    answers = self._send(commands)
+                    return {"result": 0, "description": "{} sent {}".format(self.host, ", ".join(commands)), "data": answers}
+                except (OSError, ConnectionError) as exc:
+                    # the relay drops idle sessions, log in again once
+                    self.close()
+                    error = exc
+        return {"result": -1, "description": "{} {} occured: {}".format(self.host, type(error).__name__, error), "data": None}
+
+    def version(self):
+        """
+        Returns:
+            dict: Results of ``command``, ``data`` is the firmware version.
+        """
+        results = self.command("ver")
+        if results["result"] == 0:
+            results["data"] = results["data"][0]
+        return results
+
+    def reset(self):
+        """
+        Sets all relays to their default state.
+
+        Returns:
+            dict: Results of ``command``.
+        """
+        return self.command("reset")
+
+    def relayRead(self, index):
+        """
+        Args:
+            index (int): Relay index.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the relay state, 1 for on and 0 for off.
+        """
+        results = self.command("relay read {}".format(relayName(index)))
+        if results["result"] != 0:
+            return results
+        answer = results["data"][0].lower()
+        if answer not in ("on", "off"):
+            return {"result": -1, "description": "{} unknown relay read answer {}".format(self.host, repr(results["data"][0])), "data": None}
+        return {"result": 0, "description": "{} relay {} is {}".format(self.host, index, answer), "data": int(answer == "on")}
+
+    def relaysOn(self, indices):
+        """
+        Args:
+            indices (list): Relay indexes to turn on in one write.
+
+        Returns:
+            dict: Results of ``command``.
+        """
+        return self.command(*["relay on {}".format(relayName(index)) for index in indices])
+
+    def relaysOff(self, indices):
+        """
+        Args:
+            indices (list): Relay indexes to turn off in one write.
+
+        Returns:
+            dict: Results of ``command``.
+        """
+        return self.command(*["relay off {}".format(relayName(index)) for index in indices])
+
+    def readAll(self):
+        """
+        Returns:
+            dict: ``result`` is 0 and ``data`` the bitmask of all relay states.
+        """
+        results = self.command("relay readall")
+        if results["result"] != 0:
+            return results
+        try:
+            return {"result": 0, "description": "{} relay readall {}".format(self.host, results["data"][0]), "data": int(results["data"][0].split()[-1], 16)}
+        except (IndexError, ValueError):
+            return {"result": -1, "description": "{} unknown relay readall answer {}".format(self.host, repr(results["data"][0])), "data": None}
+
+    def writeAll(self, bitmask, count):
+        """
+        Sets all relays with one ``relay writeall`` command, the relays switch together.
+
+        Args:
+            bitmask (int): Relay states, bit 0 is relay 0.
+            count (int): Number of relays of the module.
+
+        Returns:
+            dict: Results of ``command``.
+        """
+        return self.command("relay writeall {:0{}x}".format(bitmask, (count + 3) // 4))
+
+    def writeMask(self, bitmask, mask, count):
+        """
+        Sets the relays selected by a mask and keeps the others, read and write happen without other commands of the session in between.
+
+        Args:
+            bitmask (int): Relay states, bit 0 is relay 0.
+            mask (int): Relays to set.
+            count (int): Number of relays of the module.
+
+        Returns:
+            dict: Results of ``command``, ``data`` is the written bitmask.
+        """
+        with self.lock:
+            results = self.readAll()
+            if results["result"] != 0:
+                return results
+            written = (results["data"] & ~mask) | (bitmask & mask)
+            results = self.writeAll(written, count)
+        if results["result"] == 0:
+            results["data"] = written
+        return results
+
+    def close(self):
+        """
+        Closes the connection, the next command logs in again.
+        """
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = None
+
+def getNumatoSession(host):
+    """
+    Returns the session of a relay host stored in ``data_store.suite["numatoSessions"]``, creating it on first use.
+
+    Args:
+        host (string): IP address of the relay.
+    """
+    if "numatoSessions" not in data_store.suite or data_store.suite["numatoSessions"] is None:
+        data_store.suite["numatoSessions"] = {}
+    if host not in data_store.suite["numatoSessions"]:
+        data_store.suite["numatoSessions"][host] = NumatoSession(host)
+    return data_store.suite["numatoSessions"][host]
+
+##########################################################################
+# after suite
+###
+@after_suite
+def afterSuiteHook():
+    """
+    Closes the Numato sessions of the suite.
+    """
+    if "numatoSessions" in data_store.suite and data_store.suite["numatoSessions"]:
+        for session in data_store.suite["numatoSessions"].values():
+            session.close()
+        data_store.suite["numatoSessions"] = {}
@@ -16,7 +16,8 @@ Below are a list of implemented Steps:
 # import libraries
 ###
 import sys
-from getgauge.python import step, Messages, data_store, before_suite, after_suite
+from getgauge.python import step, data_store, before_suite, after_suite
+from step_impl import report
 sys.path.append(r"../opcua_client_library")
 from OPCUAClientLibrary import OPCUAClientController
 
@@ -42,7 +43,7 @@ def opcUaClientConnect(url):
         * OPC UA Client connect "opc.tcp://192.168.1.10:48020"
     """
     data_store.suite["opcUaClientController"] = OPCUAClientController(url)
-    Messages.write_message("Create OPC UA Client object successful")
+    report.writeMessage("Create OPC UA Client object successful")
 ###
 # get node
 ###
@@ -67,7 +68,7 @@ def opcUaClientGetNode(nodeId, keyName):
     results = data_store.suite["opcUaClientController"].getNode(nodeId)
     assert results["result"] == 0, "Error getting node, check log"
     data_store.suite[keyName] = results["data"]["node"]
-    Messages.write_message("Stored node in {} key".format(keyName))
+    report.writeMessage("Stored node in {} key".format(keyName))
 ###
 # get browse name
 ###
@@ -90,7 +91,7 @@ def opcUaClientGetBrowseName(keyName):
     """
     results = data_store.suite["opcUaClientController"].getBrowseName(data_store.suite[keyName])
     assert results["result"] == 0, "Error getting browse name, check log"
-    Messages.write_message("Browse name: {}".format(results["data"]["name"]))
+    report.writeMessage("Browse name: {}".format(results["data"]["name"]))
 ###
 # get value
 ###
@@ -113,7 +114,7 @@ def opcUaClientGetValue(keyName):
     """
     results = data_store.suite["opcUaClientController"].getValue(data_store.suite[keyName])
     assert results["result"] == 0, "Error getting value, check log"
-    Messages.write_message("Value: {}".format(results["data"]["value"]))
+    report.writeMessage("Value: {}".format(results["data"]["value"]))
 ###
 # set value
 ###
@@ -152,4 +153,4 @@ def opcUaClientSetValue(keyName, value, valueType):
         raise Exception("Type given is not supported, only bool, int, float, and str are supported")
     results = data_store.suite["opcUaClientController"].setValue(data_store.suite[keyName], value)
     assert results["result"] == 0, "Error setting value, check log"
-    Messages.write_message("Set value to: {}".format(value))
\ No newline at end of file
+    report.writeMessage("Set value to: {}".format(value))
\ No newline at end of file
@@ -0,0 +1,401 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Packet Capture Reader for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Streaming reader for the pcap and pcapng files written by tshark, used by the Wireshark Steps in ``wireshark.py``.
+
+The capture is mapped with ``mmap`` and every packet is handed out as a ``memoryview`` slice of the map, so nothing is copied or converted and memory stays bounded however long the capture is. The reader remembers the offset of the first record it could not read yet, so a capture that is still being written can be read again from there later.
+
+Filters are compiled once from their arguments (ie. the IP addresses are packed to bytes) and test the raw Ethernet frame:
+    * ``arpFilter`` ARP with optional sender and target IP
+    * ``dcpFilter`` PROFINET DCP (ethertype 0x8892, frame ID 0xFEFC - 0xFEFF)
+    * ``cipFilter`` EtherNet/IP, explicit messages on port 44818 and IO on UDP port 2222
+
+``PacketStats`` aggregates the packets of one filter in a single pass: count, bytes, inter-arrival min/mean/max/standard deviation and the bytes per flow.
+
+``LiveCapture`` tails a capture tshark is still writing: every update only reads the records added since the last one into rolling ``PacketStats``, and waits poll every ``LIVE_POLL_INTERVAL`` seconds until a condition on them is met.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import mmap
+import math
+import socket
+import struct
+import time
+
+##########################################################################
+# constants
+###
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9)
+}
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_IDB = 1
+PCAPNG_SPB = 3
+PCAPNG_EPB = 6
+LINKTYPE_ETHERNET = 1
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_ARP = 0x0806
+ETHERTYPE_PROFINET = 0x8892
+IP_PROTOCOL_TCP = 6
+IP_PROTOCOL_UDP = 17
+ENIP_PORTS = (44818, 2222)
+LIVE_POLL_INTERVAL = 0.1
+
+##########################################################################
+# reader
+###
+class PcapReader:
+    """
+    Incremental reader of a pcap or pcapng file.
+
+    Args:
+        filepath (string): Capture file.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.offset = 0
+        self.format = None
+        self.endian = "<"
+        self.resolution = 1e-6
+        self.linktypes = []
+        self.resolutions = []
+
+    def _header(self, data):
+        # reads the file header once, returns False while it is not complete
+        if len(data) < 24:
+            return False
+        if bytes(data[:4]) in PCAP_MAGIC:
+            self.format = "pcap"
+            self.endian, self.resolution = PCAP_MAGIC[bytes(data[:4])]
+            self.linktypes = [struct.unpack_from(self.endian + "I", data, 20)[0] & 0xFFFF]
+            self.offset = 24
+        elif struct.unpack_from("<I", data, 0)[0] == PCAPNG_SHB:
+            self.format = "pcapng"
+        else:
+            raise ValueError("{} is not a pcap or pcapng file".format(self.filepath))
+        return True
+
+    def _pcapRecords(self, data):
+        recordHeader = struct.Struct(self.endian + "IIII")
+        while self.offset + 16 <= len(data):
+            seconds, fraction, capturedLength, _ = recordHeader.unpack_from(data, self.offset)
+            end = self.offset + 16 + capturedLength
+            if end > len(data):
+                return
+            start = self.offset + 16
+            self.offset = end
+            yield seconds + fraction * self.resolution, self.linktypes[0], data[start:end]
+
+    def _pcapngRecords(self, data):
+        while self.offset + 12 <= len(data):
+            blockType = struct.unpack_from("<I", data, self.offset)[0]
+            if blockType == PCAPNG_SHB:
+                self.endian = "<" if bytes(data[self.offset + 8:self.offset + 12]) == b"\x4d\x3c\x2b\x1a" else ">"
+                # a new section starts its own interface list
+                self.linktypes = []
+                self.resolutions = []
+            blockType, blockLength = struct.unpack_from(self.endian + "II", data, self.offset)
+            end = self.offset + blockLength
+            if blockLength < 12 or end > len(data):
+                return
+            body = self.offset + 8
+            self.offset = end
+            if blockType == PCAPNG_IDB:
+                self.linktypes.append(struct.unpack_from(self.endian + "H", data, body)[0])
+                self.resolutions.append(self._tsresol(data, body + 8, end - 4))
+            elif blockType == PCAPNG_EPB:
+                interface, high, low, capturedLength = struct.unpack_from(self.endian + "IIII", data, body)
+                timestamp = ((high << 32) | low) * self.resolutions[interface]
+                yield timestamp, self.linktypes[interface], data[body + 20:body + 20 + capturedLength]
+            elif blockType == PCAPNG_SPB:
+                originalLength = struct.unpack_from(self.endian + "I", data, body)[0]
+                yield None, self.linktypes[0], data[body + 4:body + 4 + min(originalLength, blockLength - 16)]
+
+    def _tsresol(self, data, position, end):
+        # if_tsresol option of an interface description block, microseconds by default
+        while position + 4 <= end:
+            code, length = struct.unpack_from(self.endian + "HH", data, position)
+            if code == 0:
+                break
+            if code == 9 and length == 1:
+                value = data[position + 4]
+                return 2 ** -(value & 0x7F) if value & 0x80 else 10 ** -value
+            position += 4 + (length + 3) // 4 * 4
+        return 1e-6
+
+    def packets(self):
+        """
+        Iterates the packets written since the last call. The ``memoryview`` of a packet is only valid until the next packet is read.
+
+        Returns:
+            generator: (timestamp in seconds or None, link type, packet ``memoryview``) of each packet.
+        """
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return
+        with open(self.filepath, "rb") as captureFile, mmap.mmap(captureFile.fileno(), 0, access=mmap.ACCESS_READ) as captureMap:
+            data = memoryview(captureMap)
+            try:
+                if self.format is None and not self._header(data):
+                    return
+                records = self._pcapRecords(data) if self.format == "pcap" else self._pcapngRecords(data)
+                for packet in records:
+                    try:
+                        yield packet
+                    finally:
+                        # the map can only be closed once no packet view is left
+                        packet[2].release()
+            finally:
+                data.release()
+
+###
+# filters
+###
+def _ipBytes(address):
+    return socket.inet_aton(address) if address else None
+
+def _payload(packet):
+    # ethertype and offset of the payload after the VLAN tags
+    if len(packet) < 14:
+        return None, 0
+    position = 12
+    etherType = (packet[position] << 8) | packet[position + 1]
+    while etherType in ETHERTYPE_VLAN and len(packet) >= position + 6:
+        position += 4
+        etherType = (packet[position] << 8) | packet[position + 1]
+    return etherType, position + 2
+
+def arpFilter(srcAddr=None, dstAddr=None):
+    """
+    Args:
+        srcAddr (string, optional): Sender IP address. Defaults to None for any.
+        dstAddr (string, optional): Target IP address. Defaults to None for any.
+
+    Returns:
+        function: Filter of ARP packets.
+    """
+    sender = _ipBytes(srcAddr)
+    target = _ipBytes(dstAddr)
+    def match(packet):
+        etherType, position = _payload(packet)
+        if etherType != ETHERTYPE_ARP or len(packet) < position + 28:
+            return False
+        if sender is not None and packet[position + 14:position + 18] != sender:
+            return False
+        return target is None or packet[position + 24:position + 28] == target
+    return match
+
+def dcpFilter():
+    """
+    Returns:
+        function: Filter of PROFINET DCP packets.
+    """
+    def match(packet):
+        etherType, position = _payload(packet)
+        if etherType != ETHERTYPE_PROFINET or len(packet) < position + 2:
+            return False
+        return 0xFEFC <= ((packet[position] << 8) | packet[position + 1]) <= 0xFEFF
+    return match
+
+def cipFilter(srcAddr=None):
+    """
+    Args:
+        srcAddr (string, optional): Source IP address. Defaults to None for any.
+
+    Returns:
+        function: Filter of EtherNet/IP packets.
+    """
+    source = _ipBytes(srcAddr)
+    def match(packet):
+        etherType, position = _payload(packet)
+        if etherType != ETHERTYPE_IPV4 or len(packet) < position + 20:
+            return False
+        protocol = packet[position + 9]
+        if protocol not in (IP_PROTOCOL_TCP, IP_PROTOCOL_UDP):
+            return False
+        if source is not None and packet[position + 12:position + 16] != source:
+            return False
+        transport = position + (packet[position] & 0x0F) * 4
+        if len(packet) < transport + 4:
+            return False
+        sourcePort = (packet[transport] << 8) | packet[transport + 1]
+        destinationPort = (packet[transport + 2] << 8) | packet[transport + 3]
+        return sourcePort in ENIP_PORTS or destinationPort in ENIP_PORTS
+    return match
+
+FILTERS = {
+    "ARP": arpFilter,
+    "DCP": dcpFilter,
+    "CIP": cipFilter
+}
+
+def flowKey(packet):
+    """
+    Args:
+        packet (memoryview): Ethernet frame.
+
+    Returns:
+        string: ``<src> > <dst>`` IP addresses for IPv4 and ARP, MAC addresses otherwise.
+    """
+    etherType, position = _payload(packet)
+    if etherType == ETHERTYPE_IPV4 and len(packet) >= position + 20:
+        return "{} > {}".format(socket.inet_ntoa(bytes(packet[position + 12:position + 16])), socket.inet_ntoa(bytes(packet[position + 16:position + 20])))
+    if etherType == ETHERTYPE_ARP and len(packet) >= position + 28:
+        return "{} > {}".format(socket.inet_ntoa(bytes(packet[position + 14:position + 18])), socket.inet_ntoa(bytes(packet[position + 24:position + 28])))
+    return "{} > {}".format(":".join(["{:02x}".format(byte) for byte in packet[6:12]]), ":".join(["{:02x}".format(byte) for byte in packet[0:6]]))
+
+##########################################################################
+# aggregation
+###
+class PacketStats:
+    """
+    Single pass statistics of the packets of one filter.
+    """
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.first = None
+        self.last = None
+        self.minInterval = None
+        self.maxInterval = None
+        self.meanInterval = 0.0
+        self.m2Interval = 0.0
+        self.intervals = 0
+        self.flows = {}
+
+    def add(self, timestamp, packet):
+        """
+        Args:
+            timestamp (float): Packet time in seconds, None if the capture has none.
+            packet (memoryview): Ethernet frame.
+        """
+        self.count += 1
+        self.bytes += len(packet)
+        key = flowKey(packet)
+        flow = self.flows.setdefault(key, [0, 0, timestamp, timestamp])
+        flow[0] += 1
+        flow[1] += len(packet)
+        flow[3] = timestamp
+        if timestamp is None:
+            return
+        if self.last is not None:
+            # Welford's running mean and variance of the inter-arrival time
+            interval = timestamp - self.last
+            self.intervals += 1
+            delta = interval - self.meanInterval
+            self.meanInterval += delta / self.intervals
+            self.m2Interval += delta * (interval - self.meanInterval)
+            self.minInterval = interval if self.minInterval is None else min(self.minInterval, interval)
+            self.maxInterval = interval if self.maxInterval is None else max(self.maxInterval, interval)
+        if self.first is None:
+            self.first = timestamp
+        self.last = timestamp
+
+    def summary(self):
+        """
+        Returns:
+            dict: ``count``, ``bytes``, inter-arrival ``minMs``, ``meanMs``, ``maxMs``, ``stdMs`` and the ``flows`` with their ``packets``, ``bytes`` and ``bytesPerSecond``.
+        """
+        def ms(value):
+            return None if value is None else value * 1000
+        flows = {}
+        for key, (packets, size, first, last) in self.flows.items():
+            duration = (last - first) if first is not None and last is not None else 0
+            flows[key] = {"packets": packets, "bytes": size, "bytesPerSecond": size / duration if duration > 0 else None}
+        return {
+            "count": self.count,
+            "bytes": self.bytes,
+            "minMs": ms(self.minInterval),
+            "meanMs": ms(self.meanInterval) if self.intervals else None,
+            "maxMs": ms(self.maxInterval),
+            "stdMs": ms(math.sqrt(self.m2Interval / self.intervals)) if self.intervals else None,
+            "flows": flows
+        }
+
+def analyze(reader, filters, since=None, stats=None):
+    """
+    Runs every filter over the packets of the reader in one pass.
+
+    Args:
+        reader (PcapReader): Reader of the capture.
+        filters (dict): Filter function of each name.
+        since (float, optional): Skip packets before this ``time.time()``. Defaults to None.
+        stats (dict, optional): ``PacketStats`` of each name to continue. Defaults to None for new ones.
+
+    Returns:
+        dict: ``PacketStats`` of each filter name.
+    """
+    if stats is None:
+        stats = {name: PacketStats() for name in filters}
+    for timestamp, linktype, packet in reader.packets():
+        if linktype != LINKTYPE_ETHERNET or (since is not None and timestamp is not None and timestamp < since):
+            continue
+        for name, match in filters.items():
+            if match(packet):
+                stats[name].add(timestamp, packet)
+    return stats
+
+###
+# live capture
+###
+class LiveCapture:
+    """
+    Rolling statistics of a capture file that is still being written.
+
+    Args:
+        filepath (string): Capture file.
+        filters (dict): Filter function of each name.
+        since (float, optional): Skip packets before this ``time.time()``. Defaults to None.
+    """
+    def __init__(self, filepath, filters, since=None):
+        self.reader = PcapReader(filepath)
+        self.filters = filters
+        self.since = since
+        self.stats = {name: PacketStats() for name in filters}
+
+    def update(self):
+        """
+        Reads the packets written since the last update.
+
+        Returns:
+            dict: ``PacketStats`` of each filter name.
+        """
+        return analyze(self.reader, self.filters, self.since, self.stats)
+
+    def counts(self):
+        """
+        Returns:
+            dict: Packet count of each filter name after an update.
+        """
+        self.update()
+        return {name: stats.count for name, stats in self.stats.items()}
+
+    def waitFor(self, predicate, timeout):
+        """
+        Updates until the predicate is met or the timeout expires.
+
+        Args:
+            predicate (function): Called with the ``PacketStats`` of each filter name, True ends the wait.
+            timeout (float): Timeout in seconds.
+
+        Returns:
+            bool: True if the predicate was met.
+        """
+        deadline = time.monotonic() + float(timeout)
+        while True:
+            if predicate(self.update()):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(LIVE_POLL_INTERVAL, remaining))
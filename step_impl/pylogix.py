@@ -16,7 +16,8 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite, after_suite, before_spec
+from getgauge.python import step, data_store, before_suite, after_suite, before_spec
+from step_impl import report
 import os
 import sys
 sys.path.append(r"../pylogix_library")
@@ -24,6 +25,10 @@ try:
     from PyLogixLibrary import PyLogixController
 except Exception as exc:
     print("import pylogix:: {} occured: {}".format(type(exc).__name__, exc))
+try:
+    from pylogix import PLC
+except Exception as exc:
+    print("import pylogix PLC:: {} occured: {}".format(type(exc).__name__, exc))
 
 ##########################################################################
 # before suite
@@ -33,18 +38,45 @@ def beforeSuiteHook():
     """
     Initializes variables:
         * ``data_store.suite["pyLogixConnected"]`` is set to ``False`` so that no Step can be run unless the PyLogix Controller class is created
+        * ``data_store.suite["pyLogixPLC"]`` is set to ``None``, the ``pylogix`` PLC of the multi-tag Steps is created on connect
     """
     data_store.suite["pyLogixConnected"] = False
+    data_store.suite["pyLogixPLC"] = None
+
+##########################################################################
+# constants
+###
+PLC_DEVICE_ID = 0x0E
 
 ##########################################################################
 # methods
 ###
+def discoverPLCAddress():
+    """
+    Looks for the PLC with an EtherNet/IP List Identity broadcast.
+
+    Returns:
+        string: IP address of the only Programmable Logic Controller that answered, None if none or several answered.
+    """
+    try:
+        plc = PLC()
+        try:
+            results = plc.Discover()
+        finally:
+            plc.Close()
+    except Exception as exc:
+        report.writeMessage("PLC discovery failed, {}: {}".format(type(exc).__name__, exc), report.DEBUG)
+        return None
+    addresses = [device.IPAddress for device in (results.Value or []) if device.DeviceID == PLC_DEVICE_ID]
+    report.writeMessage("Discovered PLCs: {}".format(addresses), report.DEBUG)
+    return addresses[0] if len(addresses) == 1 else None
+###
 # connect
 ###
 @step("PyLogix connect")
 def pyLogixConnect():
     """
-    Create the PyLogix Contoller class using the ``data_store.suite["pyLogixController"]`` variable.
+    Create the PyLogix Contoller class using the ``data_store.suite["pyLogixController"]`` variable. A ``pylogix`` PLC for the multi-tag Steps is created in ``data_store.suite["pyLogixPLC"]`` at ``pylogix_ip``, or if it is empty at the only PLC that answers an EtherNet/IP discovery.
 
     Step and function definition::
 
@@ -55,14 +87,21 @@ def pyLogixConnect():
         * PyLogix connect
     """
     if data_store.suite["pyLogixConnected"]:
-        Messages.write_message("PyLogix object already connected")
+        report.writeMessage("PyLogix object already connected")
     else:
         try:
             data_store.suite["pyLogixController"] = PyLogixController()
-            Messages.write_message("Created PyLogix object successful")
+            address = os.getenv("pylogix_ip", "").strip() or discoverPLCAddress()
+            if address:
+                data_store.suite["pyLogixPLC"] = PLC()
+                data_store.suite["pyLogixPLC"].IPAddress = address
+                report.writeMessage("PyLogix multi-tag requests go to {}".format(address))
+            else:
+                report.writeMessage("No PLC address, set pylogix_ip for multi-tag requests", report.WARNING)
+            report.writeMessage("Created PyLogix object successful")
             data_store.suite["pyLogixConnected"] = True
         except:
-            Messages.write_message("Error creating PyLogix object")
+            report.writeMessage("Error creating PyLogix object")
             assert False
 ###
 # disconnect
@@ -82,8 +121,11 @@ def pyLogixDisconnect():
     """
     if data_store.suite["pyLogixConnected"]:
         del(data_store.suite["pyLogixController"])
+        if data_store.suite["pyLogixPLC"] is not None:
+            data_store.suite["pyLogixPLC"].Close()
+            data_store.suite["pyLogixPLC"] = None
     else:
-        Messages.write_message("PyLogix not connected")
+        report.writeMessage("PyLogix not connected")
     data_store.suite["pyLogixConnected"] = False
 ###
 # read
@@ -108,8 +150,8 @@ def pyLogixRead(tagname, checkReturn):
     """
     assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
     results = data_store.suite["pyLogixController"].read(tagname)
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     if checkReturn.lower() == "true":
         assert results["result"] == 0, "read failed"
 ###
@@ -135,7 +177,210 @@ def pyLogixWrite(tagname, value, checkReturn):
     """
     assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
     results = data_store.suite["pyLogixController"].write(tagname, int(value))
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     if checkReturn.lower() == "true":
         assert results["result"] == 0, "write failed"
+###
+# multi-tag requests
+###
+def tagValue(text):
+    """
+    Args:
+        text (string): Value from a Step or table cell.
+
+    Returns:
+        int, float or string: Value to write.
+    """
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def valueMatches(value, expected):
+    """
+    Args:
+        value: Value read from the PLC.
+        expected (string): Expected value from a Step or table cell.
+
+    Returns:
+        bool: True if the value equals the expected value, ``True``/``False`` and ``1``/``0`` are both accepted for booleans.
+    """
+    expected = expected.strip()
+    if isinstance(value, bool):
+        return expected.lower() in (str(value).lower(), str(int(value)))
+    try:
+        return float(value) == float(expected)
+    except (TypeError, ValueError):
+        return str(value) == expected
+
+def tagResult(tagname, results):
+    # results of the controller read/write with the value in data["value"]
+    data = results["data"]
+    value = data.get("value") if isinstance(data, dict) else data
+    return {"result": results["result"], "description": results["description"], "data": {"tag": tagname, "value": value}}
+
+def plcResults(action, tagnames, request):
+    # results of a pylogix multi-service request, an exception fails every tag like the controller does
+    try:
+        responses = request()
+    except Exception as exc:
+        return [{"result": -1, "description": "{} {} {} occured: {}".format(tagname, action, type(exc).__name__, exc), "data": {"tag": tagname, "value": None}} for tagname in tagnames]
+    return [{"result": 0 if response.Status == "Success" else -1, "description": "{} {} {}".format(response.TagName, action, response.Status), "data": {"tag": response.TagName, "value": response.Value}} for response in responses]
+
+def readTags(tagnames):
+    """
+    Reads several tags, with one multi-service request where the ``pylogix`` PLC of ``pylogix_ip`` is created.
+
+    Args:
+        tagnames (list): Tag names.
+
+    Returns:
+        list: Results of each tag, ``data`` holds the ``tag`` and its ``value``.
+    """
+    plc = data_store.suite["pyLogixPLC"]
+    if plc is None:
+        report.writeMessage("No pylogix PLC, reading {} tags with one request per tag".format(len(tagnames)), report.WARNING)
+        return [tagResult(tagname, data_store.suite["pyLogixController"].read(tagname)) for tagname in tagnames]
+    return plcResults("read", tagnames, lambda: plc.Read(list(tagnames)))
+
+def writeTags(tags):
+    """
+    Writes several tags, with one multi-service request where the ``pylogix`` PLC of ``pylogix_ip`` is created.
+
+    Args:
+        tags (list): (tag name, value) of each tag.
+
+    Returns:
+        list: Results of each tag, ``data`` holds the ``tag`` and its ``value``.
+    """
+    plc = data_store.suite["pyLogixPLC"]
+    if plc is None:
+        report.writeMessage("No pylogix PLC, writing {} tags with one request per tag".format(len(tags)), report.WARNING)
+        return [tagResult(tagname, data_store.suite["pyLogixController"].write(tagname, value)) for tagname, value in tags]
+    return plcResults("write", [tagname for tagname, _ in tags], lambda: plc.Write(list(tags)))
+
+def checkTags(results, checkReturn, expected=None):
+    """
+    Reports the results of a multi-tag request and asserts them.
+
+    Args:
+        results (list): Results of ``readTags`` or ``writeTags``.
+        checkReturn (string): True to assert that every tag succeeded.
+        expected (list, optional): Expected value of each tag, empty to skip the tag. Defaults to None.
+    """
+    failures = []
+    for index, tagResults in enumerate(results):
+        report.writeMessage("{}: {}".format(tagResults["description"], tagResults["data"]["value"]))
+        if checkReturn.lower() == "true" and tagResults["result"] != 0:
+            failures.append(tagResults["description"])
+        if expected and expected[index].strip() and not valueMatches(tagResults["data"]["value"], expected[index]):
+            failures.append("{} value {} != {}".format(tagResults["data"]["tag"], tagResults["data"]["value"], expected[index].strip()))
+    assert not failures, ", ".join(failures)
+###
+# read tags
+###
+@step("PyLogix read tags <tagnames> check <checkReturn>")
+def pyLogixReadTags(tagnames, checkReturn):
+    """
+    Read the comma separated tags with one multi-service request and then assert against the results based on checkReturn variable.
+
+    Args:
+        tagnames (string): Comma separated tag names.
+        checkReturn (bool): True or False.
+
+    Step and function definition::
+
+        @step("PyLogix read tags <tagnames> check <checkReturn>")
+        def pyLogixReadTags(tagnames, checkReturn):
+
+    Example usage:
+        * PyLogix read tags "Osprey:I.Data[0],Osprey:I.Data[1]" check "True"
+    """
+    assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
+    checkTags(readTags([tagname.strip() for tagname in tagnames.split(",")]), checkReturn)
+###
+# read tags table
+###
+@step("PyLogix read tags check <checkReturn> <table>")
+def pyLogixReadTagsTable(checkReturn, table):
+    """
+    Read the tags of the ``tag`` column with one multi-service request, assert against the results based on checkReturn variable and assert the values of the optional ``value`` column.
+
+    Args:
+        checkReturn (bool): True or False.
+        table (Table): Table with a ``tag`` and an optional ``value`` column, empty values are not checked.
+
+    Step and function definition::
+
+        @step("PyLogix read tags check <checkReturn> <table>")
+        def pyLogixReadTagsTable(checkReturn, table):
+
+    Example usage:
+        * PyLogix read tags check "True"
+
+           |tag                |value|
+           |-------------------|-----|
+           |Osprey:O.Data[0].4 |1    |
+           |Osprey:I.Data[0]   |     |
+    """
+    assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
+    assert "tag" in table.headers, "table needs a tag column"
+    rows = [dict(zip(table.headers, row)) for row in table.rows]
+    expected = [row["value"] for row in rows] if "value" in table.headers else None
+    checkTags(readTags([row["tag"].strip() for row in rows]), checkReturn, expected)
+###
+# write tags
+###
+@step("PyLogix write tags <tagnames> value <value> check <checkReturn>")
+def pyLogixWriteTags(tagnames, value, checkReturn):
+    """
+    Write the value to the comma separated tags with one multi-service request and then assert against the results based on checkReturn variable.
+
+    Args:
+        tagnames (string): Comma separated tag names.
+        value (int): Value to write to the tags.
+        checkReturn (bool): True or False.
+
+    Step and function definition::
+
+        @step("PyLogix write tags <tagnames> value <value> check <checkReturn>")
+        def pyLogixWriteTags(tagnames, value, checkReturn):
+
+    Example usage:
+        * PyLogix write tags "Osprey:O.Data[0].4,Osprey:O.Data[0].5" value "1" check "False"
+    """
+    assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
+    checkTags(writeTags([(tagname.strip(), int(value)) for tagname in tagnames.split(",")]), checkReturn)
+###
+# write tags table
+###
+@step("PyLogix write tags check <checkReturn> <table>")
+def pyLogixWriteTagsTable(checkReturn, table):
+    """
+    Write the values of the ``value`` column to the tags of the ``tag`` column with one multi-service request and then assert against the results based on checkReturn variable.
+
+    Args:
+        checkReturn (bool): True or False.
+        table (Table): Table with a ``tag`` and a ``value`` column.
+
+    Step and function definition::
+
+        @step("PyLogix write tags check <checkReturn> <table>")
+        def pyLogixWriteTagsTable(checkReturn, table):
+
+    Example usage:
+        * PyLogix write tags check "True"
+
+           |tag                |value|
+           |-------------------|-----|
+           |Osprey:O.Data[0].4 |1    |
+           |Osprey:O.Data[1]   |255  |
+    """
+    assert data_store.suite["pyLogixConnected"] == True, "PyLogix is not connected"
+    assert "tag" in table.headers and "value" in table.headers, "table needs a tag and a value column"
+    rows = [dict(zip(table.headers, row)) for row in table.rows]
+    assert all([row["value"].strip() for row in rows]), "every tag needs a value to write"
+    checkTags(writeTags([(row["tag"].strip(), tagValue(row["value"].strip())) for row in rows]), checkReturn)
@@ -0,0 +1,187 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Relay State Cache for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Model of the relay states of the KMTronic web relay (``web_relay.py``) and Numato ethernet relay (``numato_ethernet_relay.py``) controllers.
+
+Writes update the model optimistically and mark the relays as pending. A read of pending relays, or of relays last confirmed more than ``relay_state_ttl`` seconds ago (default 2), reads the whole controller once and confirms all relays. Reads from several threads that arrive while a status read is running share it instead of sending their own, so a verify right after a write always sees the hardware and repeated verifies in the window are answered from the model. A failed write or read invalidates the model of the controller.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import data_store
+import os
+import threading
+import time
+
+##########################################################################
+# constants
+###
+RELAY_STATE_TTL = 2.0
+
+##########################################################################
+# relay state
+###
+def parseStates(data, count):
+    """
+    Args:
+        data (list, int or string): Relay states as a list, a bitmask or a hex or comma separated string.
+        count (int): Number of relays.
+
+    Returns:
+        dict: State (0 or 1) of each relay index starting at 0, None if the data can't be parsed.
+    """
+    try:
+        if isinstance(data, (list, tuple)):
+            return {index: int(state) for index, state in enumerate(data)}
+        if isinstance(data, str) and "," in data:
+            return {index: int(state) for index, state in enumerate(data.split(","))}
+        mask = data if isinstance(data, int) else int(str(data).strip(), 16)
+        return {index: (mask >> index) & 1 for index in range(count)}
+    except (TypeError, ValueError):
+        return None
+
+class RelayState:
+    """
+    Cached relay states of one controller.
+
+    Args:
+        name (string): Controller name for the report.
+        readAll (function): Reads the controller, returns a dict with ``result`` 0 and the state of each relay index in ``data``.
+        ttl (float, optional): Seconds a confirmed state is used. Defaults to ``relay_state_ttl`` or ``RELAY_STATE_TTL``.
+    """
+    def __init__(self, name, readAll, ttl=None):
+        self.name = name
+        self.readAll = readAll
+        self.ttl = float(ttl if ttl is not None else os.getenv("relay_state_ttl", RELAY_STATE_TTL))
+        self.states = {}
+        self.confirmed = {}
+        self.pending = set()
+        self.writtenAt = {}
+        self.lastRead = 0
+        self.lock = threading.Lock()
+        self.readLock = threading.Lock()
+
+    def written(self, states):
+        """
+        Records a successful write, the relays stay pending until the next read.
+
+        Args:
+            states (dict): Written state of each relay index.
+        """
+        now = time.monotonic()
+        with self.lock:
+            self.states.update(states)
+            self.pending.update(states.keys())
+            for index in states:
+                self.writtenAt[index] = now
+
+    def invalidate(self):
+        """
+        Forgets all states, called after a failed or unknown write.
+        """
+        with self.lock:
+            self.states = {}
+            self.confirmed = {}
+            self.pending = set()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Last known state of each relay index, confirmed or written.
+        """
+        with self.lock:
+            return dict(self.states)
+
+    def cached(self, indices):
+        """
+        Args:
+            indices (list): Relay indexes.
+
+        Returns:
+            dict: Confirmed state of each index, None if any of them is pending or expired.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if any([index in self.pending or now - self.confirmed.get(index, -self.ttl) > self.ttl for index in indices]):
+                return None
+            return {index: self.states[index] for index in indices}
+
+    def read(self, indices):
+        """
+        Returns the states from the model if they are confirmed, otherwise reads the controller once.
+
+        Args:
+            indices (list): Relay indexes.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the state of each index, ``cached`` is True if no read was sent.
+        """
+        indices = list(indices)
+        requested = time.monotonic()
+        states = self.cached(indices)
+        if states is not None:
+            return {"result": 0, "description": "{} relay states from cache".format(self.name), "data": states, "cached": True}
+        with self.readLock:
+            # a read that started after this request covers it
+            if self.lastRead >= requested:
+                states = self.cached(indices)
+                if states is not None:
+                    return {"result": 0, "description": "{} relay states from shared read".format(self.name), "data": states, "cached": True}
+            start = time.monotonic()
+            try:
+                results = self.readAll()
+            except Exception as exc:
+                results = {"result": -1, "description": "{} occured: {}".format(type(exc).__name__, exc), "data": None}
+            if results["result"] != 0 or not isinstance(results["data"], dict):
+                self.invalidate()
+                return {"result": -1, "description": "{} relay status read failed: {}".format(self.name, results["description"]), "data": None, "cached": False}
+            mismatched = self.confirm(results["data"], start)
+        missing = [index for index in indices if index not in results["data"]]
+        if missing:
+            return {"result": -1, "description": "{} has no relay index {}".format(self.name, missing), "data": None, "cached": False}
+        description = "{} relay states read".format(self.name)
+        if mismatched:
+            description += ", index {} not in the written state".format(mismatched)
+        return {"result": 0, "description": description, "data": {index: results["data"][index] for index in indices}, "cached": False}
+
+    def confirm(self, states, readTime=None):
+        """
+        Stores the states read from the controller.
+
+        Args:
+            states (dict): State of each relay index.
+            readTime (float, optional): ``time.monotonic()`` the read was sent. Defaults to now.
+
+        Returns:
+            list: Indexes whose read state differs from the written one.
+        """
+        readTime = time.monotonic() if readTime is None else readTime
+        with self.lock:
+            # relays written while the read was on its way stay pending
+            states = {index: state for index, state in states.items() if self.writtenAt.get(index, readTime) <= readTime}
+            mismatched = [index for index in self.pending if index in states and str(states[index]) != str(self.states.get(index))]
+            self.states.update(states)
+            for index in states:
+                self.confirmed[index] = readTime
+            self.pending.difference_update(states.keys())
+            self.lastRead = readTime
+        return mismatched
+
+def getRelayState(key, readAll):
+    """
+    Returns the relay state of a controller stored in ``data_store.suite["relayStates"]``, creating it on first use.
+
+    Args:
+        key (string): Controller key (ie. its IP address).
+        readAll (function): Status read of the controller, see ``RelayState``.
+    """
+    if "relayStates" not in data_store.suite or data_store.suite["relayStates"] is None:
+        data_store.suite["relayStates"] = {}
+    if key not in data_store.suite["relayStates"]:
+        data_store.suite["relayStates"][key] = RelayState(key, readAll)
+    return data_store.suite["relayStates"][key]
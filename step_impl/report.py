@@ -0,0 +1,118 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Report Messages for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Buffered report messages used by all Step Implementation files in place of ``Messages.write_message``.
+
+Messages written while a Step runs are collected and written to the Gauge report as one block in the After Step Hook. Messages written from hooks outside a Step are written straight away. Messages below the ``report_verbosity`` level (``debug``, ``info`` or ``warning``, default ``info``) are dropped, and messages longer than ``report_artifact_threshold`` characters (default 4096) are written to a file under ``<gauge_reports_dir>/artifacts`` with only their first line and the file name kept in the report.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import Messages, before_step, after_step
+import os
+
+##########################################################################
+# constants
+###
+DEBUG = 10
+INFO = 20
+WARNING = 30
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING}
+REPORT_ARTIFACT_THRESHOLD = 4096
+
+##########################################################################
+# report buffer
+###
+class ReportBuffer:
+    """
+    Collects the report messages of the running Step.
+    """
+    def __init__(self):
+        self.messages = []
+        self.inStep = False
+        self.level = LEVELS.get(os.getenv("report_verbosity", "info").strip().lower(), INFO)
+        self.threshold = int(os.getenv("report_artifact_threshold", REPORT_ARTIFACT_THRESHOLD))
+        self.artifactCount = 0
+
+    def _offload(self, message):
+        artifactDir = os.path.join(os.getenv("gauge_reports_dir", "reports"), "artifacts")
+        os.makedirs(artifactDir, exist_ok=True)
+        self.artifactCount += 1
+        filename = os.path.join(artifactDir, "message_{}_{}.txt".format(os.getpid(), self.artifactCount))
+        with open(filename, "w") as artifact:
+            artifact.write(message)
+        return "{} ... ({} characters written to {})".format(message.strip().split("\n")[0], len(message), filename)
+
+    def write(self, message, level=INFO):
+        """
+        Adds a message to the running Step or writes it to the report if no Step is running.
+
+        Args:
+            message (string): Message.
+            level (int, optional): ``DEBUG``, ``INFO`` or ``WARNING``. Defaults to ``INFO``.
+        """
+        if level < self.level:
+            return
+        message = str(message)
+        if len(message) > self.threshold:
+            message = self._offload(message)
+        if self.inStep:
+            self.messages.append(message)
+        else:
+            Messages.write_message(message)
+
+    def begin(self):
+        """
+        Starts collecting messages for a Step.
+        """
+        self.flush()
+        self.inStep = True
+
+    def flush(self):
+        """
+        Writes the collected messages to the report as one message and stops collecting.
+        """
+        self.inStep = False
+        if self.messages:
+            Messages.write_message("\n".join(self.messages))
+            self.messages = []
+
+reportBuffer = ReportBuffer()
+
+##########################################################################
+# methods
+###
+def writeMessage(message, level=INFO):
+    """
+    Writes a message to the Gauge report through the report buffer.
+
+    Args:
+        message (string): Message.
+        level (int, optional): ``DEBUG``, ``INFO`` or ``WARNING``. Defaults to ``INFO``.
+    """
+    reportBuffer.write(message, level)
+
+##########################################################################
+# before step
+###
+@before_step
+def beforeStepHook():
+    """
+    Starts collecting the report messages of the Step.
+    """
+    reportBuffer.begin()
+
+##########################################################################
+# after step
+###
+@after_step
+def afterStepHook():
+    """
+    Writes the report messages of the Step as one block.
+    """
+    reportBuffer.flush()
@@ -15,14 +15,12 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite, after_suite
+from getgauge.python import step, data_store, before_suite, after_suite
+from step_impl import report, browser_pool
 import os
 import sys
 import pathlib
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from pyvirtualdisplay import Display
 sys.path.append(r"../selenium_library")
 try:
     from SeleniumLibrary import SeleniumController
@@ -37,8 +35,13 @@ def beforeSuiteHook():
     """
     Initializes variables:
         * ``data_store.suite["seleniumConnected"]`` is set to ``False`` so that no Step can be run unless the Selenium Controller class is created.
+        * ``data_store.suite["seleniumPool"]`` is the browser pool of the suite, the browsers in ``os.getenv("selenium_prewarm")`` (ie. ``chrome``) are started in the background.
     """
     data_store.suite["seleniumConnected"] = False
+    data_store.suite["seleniumPool"] = browser_pool.BrowserPool()
+    for browserType in os.getenv("selenium_prewarm", "").split(","):
+        if browserType.strip():
+            data_store.suite["seleniumPool"].prewarm(browserType.strip())
 
 ##########################################################################
 # methods
@@ -48,10 +51,10 @@ def beforeSuiteHook():
 @step("Selenium connect <type>")
 def seleniumConnect(type):
     """
-    Create the Selenium Contoller class using the ``data_store.suite["seleniumController"]`` variable.
+    Create the Selenium Contoller class using the ``data_store.suite["seleniumController"]`` variable. The browser is checked out of the browser pool (see ``browser_pool.py``) and starts from a clean ``about:blank`` page, a new browser is only started if none is idle.
 
     Args:
-        type ([type]): [description]
+        type (string): Browser type, chrome or firefox.
 
     Step and function definition::
 
@@ -59,36 +62,22 @@ def seleniumConnect(type):
         def seleniumConnect(type):
 
     Example usage:
-        * Selenium Connect
+        * Selenium connect "chrome"
 
     """
     if data_store.suite["seleniumConnected"]:
-        Messages.write_message("Selenium object already connected")
+        report.writeMessage("Selenium object already connected")
     else:
+        assert type in browser_pool.BROWSER_TYPES, "only chrome and firefox are supported currently"
         try:
-            data_store.suite["seleniumDisplay"] = Display(visible=0, size=(1920, 1080))
-            data_store.suite["seleniumDisplay"].start()
-            if type == "firefox":
-                # setup for firefox
-                options = webdriver.FirefoxOptions()
-                # options.add_argument('--no-sandbox')
-                options.add_argument('--headless')
-                data_store.suite["seleniumDriver"] = webdriver.Firefox(options=options, executable_path="{}/selenium_library/drivers/geckodriver".format(os.getenv("workspace_path")))
-            elif type == "chrome":
-                # setup for chrome
-                options = Options()
-                options.add_argument("--no-sandbox")
-                options.add_argument('--headless')
-                data_store.suite["seleniumDriver"] = webdriver.Chrome(chrome_options=options)
-            else:
-                assert False, "only chrome and firefox are supported currently"
-            data_store.suite["seleniumDriver"].set_window_size(1920, 1080)
+            data_store.suite["seleniumDriver"] = browser_pool.getBrowserPool().checkout(type)
+            data_store.suite["seleniumBrowserType"] = type
             # create class object
             data_store.suite["seleniumController"] = SeleniumController(data_store.suite["seleniumDriver"])
-            Messages.write_message("Created Selenium object successful")
+            report.writeMessage("Created Selenium object successful")
             data_store.suite["seleniumConnected"] = True
         except:
-            Messages.write_message("Error creating Selenium object")
+            report.writeMessage("Error creating Selenium object")
             assert False
 ###
 # disconnect
@@ -96,7 +85,7 @@ def seleniumConnect(type):
 @step("Selenium disconnect")
 def seleniumDisconnect():
     """
-    Disconnects the Selenium Controller object.
+    Disconnects the Selenium Controller object and returns the browser to the browser pool, it is quit at the end of the suite.
 
     Step and function definition::
 
@@ -108,11 +97,10 @@ def seleniumDisconnect():
     """
     if data_store.suite["seleniumConnected"]:
         del(data_store.suite["seleniumController"])
-        data_store.suite["seleniumDriver"].close()
-        data_store.suite["seleniumDriver"].quit()
-        data_store.suite["seleniumDisplay"].stop()
+        browser_pool.getBrowserPool().checkin(data_store.suite["seleniumBrowserType"], data_store.suite["seleniumDriver"])
+        del(data_store.suite["seleniumDriver"])
     else:
-        Messages.write_message("Selenium not connected")
+        report.writeMessage("Selenium not connected")
     data_store.suite["seleniumConnected"] = False
 ###
 # navigate
@@ -135,8 +123,8 @@ def seleniumNavigate(url):
     """
     assert data_store.suite["seleniumConnected"] == True, "Selenium is not connected"
     results = data_store.suite["seleniumController"].navigate(url)
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "navigate failed"
 ###
 # save screenshot
@@ -156,8 +144,8 @@ def seleniumSaveScreenshot():
     """
     assert data_store.suite["seleniumConnected"] == True, "Selenium is not connected"
     results = data_store.suite["seleniumController"].saveScreenshot()
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "saveScreenshot failed"
 ###
 # click
@@ -186,8 +174,8 @@ def seleniumClick(byType, identifier):
         results = data_store.suite["seleniumController"].click((By.ID, identifier))
     else:
         assert False, "byType needs to be Class or ID"
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "click failed"
 ###
 # get selected text from dropdown
@@ -216,8 +204,8 @@ def seleniumGetSelectedTextFromDropdown(byType, identifier):
         results = data_store.suite["seleniumController"].getSelectedTextFromDropDown((By.ID, identifier))
     else:
         assert False, "byType needs to be Class or ID"
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "getSelectedTextFromDropdown failed"
 ###
 # select by value
@@ -248,8 +236,8 @@ def seleniumSelectByValue(byType, identifier, value):
         results = data_store.suite["seleniumController"].selectByValue((By.ID, identifier), value)
     else:
         assert False, "byType needs to be Class or ID"
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "click failed"
 ###
 # get text  
@@ -280,9 +268,21 @@ def seleniumGetText(byType, identifier, verifyText):
         results = data_store.suite["seleniumController"].getText((By.ID, identifier))
     else:
         assert False, "byType needs to be Class or ID"
-    Messages.write_message(results["description"])
-    Messages.write_message(results)
+    report.writeMessage(results["description"])
+    report.writeMessage(results)
     assert results["result"] == 0, "seleniumGetText failed"
     if verifyText != "":
-        Messages.write_message("Text to verify: {}".format(verifyText))
-        assert results["data"]["text"] == verifyText, "Text is not equal"
\ No newline at end of file
+        report.writeMessage("Text to verify: {}".format(verifyText))
+        assert results["data"]["text"] == verifyText, "Text is not equal"
+
+##########################################################################
+# after suite
+###
+@after_suite
+def afterSuiteHook():
+    """
+    Quits the browsers of the pool.
+    """
+    if data_store.suite["seleniumConnected"]:
+        seleniumDisconnect()
+    browser_pool.getBrowserPool().close()
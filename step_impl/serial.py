@@ -8,18 +8,19 @@
 #
 ##########################################################################
 """
-The serial_comms_library is used for this Step Implementation file. All Steps are in the serial.py file.
+The serial ports are opened through the serial hub (``serial_hub.py``) with pyserial and one reader thread, or with the serial_comms_library when pyserial is missing or ``serial_pyserial`` is false. All Steps are in the serial.py file.
 
 Below are a list of implemented Steps:
 """
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, before_suite, after_suite
-import sys
-sys.path.append(r"../serial_comms_library") # append lib path
-from SerialLibrary import SerialController
+from getgauge.python import step, data_store, before_suite, after_suite, before_step, after_step
+from step_impl import report, device_context
+from step_impl.serial_hub import SerialHub
+from step_impl.serial_log import SerialLog
 import os
+import re
 import time
 
 ##########################################################################
@@ -29,35 +30,76 @@ import time
 def beforeSuiteHook():
     """
     Initializes variables:
-        * data_store.suite["ss1Controller"] using the Dynamic Variable os.getenv("ss1_usb")
-        * data_store.suite["ss2Controller"] using the Dynamic Variable os.getenv("ss2_usb")
-        * data_store.suite["ss3Controller"] using the Dynamic Variable os.getenv("ss3_usb")
+        * data_store.suite["serialHub"] opens every port of ``serialPortDevices()`` (SS1/SS2/SS3 from the Dynamic Variables os.getenv("ss1_usb") ...), see ``serial_hub.py``
+        * data_store.suite["serialLogs"] holds the rolling log file of each opened port, see ``serial_log.py``
         * data_store.suite["hardReset"] is set to False which is used in later Step
+
+    In parallel runs the Dynamic Variables come from the node inventory entry of the stream, see ``device_context.py``.
     """
-    try:
-        data_store.suite["ss1Controller"] = SerialController("/dev/{}".format(os.getenv("ss1_usb")), loggerName="SS1")
-    except:
-        Messages.write_message("unable to connect to {}".format(os.getenv("ss1_usb")))
-    try:
-        data_store.suite["ss2Controller"] = SerialController("/dev/{}".format(os.getenv("ss2_usb")), loggerName="SS2")
-    except:
-        Messages.write_message("unable to connect to {}".format(os.getenv("ss2_usb")))
-    try:
-        data_store.suite["ss3Controller"] = SerialController("/dev/{}".format(os.getenv("ss3_usb")), loggerName="SS3")
-    except:
-        Messages.write_message("unable to connect to {}".format(os.getenv("ss3_usb")))
+    device_context.applyDeviceContext()
+    data_store.suite["serialHub"] = SerialHub()
+    data_store.suite["serialLogs"] = {}
+    for name, device in serialPortDevices():
+        try:
+            log = SerialLog(device_context.streamName(name))
+            data_store.suite["serialHub"].open(name, "/dev/{}".format(device), log)
+            data_store.suite["serialLogs"][name] = log
+        except Exception as exc:
+            report.writeMessage("unable to connect to {}: {}".format(device, exc))
     data_store.suite["hardReset"] = False
-    Messages.write_message("serial before suite complete")
+    report.writeMessage("serial before suite complete", report.DEBUG)
 
 ##########################################################################
 # methods
 ###
+# serial ports
+###
+def serialPortDevices():
+    """
+    Returns the ports of the node, every ``ss<n>_usb`` Dynamic Variable is port ``SS<n>``. More ports can be named with ``serial_ports`` (ie. ``PLC=ttyUSB8,SWITCH=ttyUSB9``).
+
+    Returns:
+        list: (name, device) of each port.
+    """
+    devices = {}
+    for key, value in os.environ.items():
+        match = re.match(r"^ss(\d+)_usb$", key)
+        if match and value:
+            devices["SS{}".format(match.group(1))] = value
+    for entry in os.getenv("serial_ports", "").split(","):
+        if "=" in entry:
+            name, device = entry.split("=", 1)
+            devices[name.strip()] = device.strip()
+    return sorted(devices.items())
+
+def getSerialPort(controller):
+    """
+    Args:
+        controller (string): Subsystem name (ie. SS1).
+
+    Returns:
+        SerialPort or ControllerPort: Port from the serial hub.
+    """
+    port = data_store.suite["serialHub"].get(controller)
+    assert port is not None, "Serial connection device {}, not found".format(controller)
+    return port
+
+def getSerialCapture(controller):
+    """
+    Args:
+        controller (string): Subsystem name (ie. SS1).
+
+    Returns:
+        SerialCapture: Capture of the serial port.
+    """
+    return getSerialPort(controller).capture
+###
 # connect to serial port
 ###
 @step("Connect to serial ports")
 def connectToSerialPorts():
     """
-    Verify that the ``data_store.suite`` SS1/SS2/SS3 controller classes were created.
+    Verify that every port of ``serialPortDevices()`` (SS1/SS2/SS3 ...) was opened by the serial hub.
 
     Step and function definition::
 
@@ -67,9 +109,8 @@ def connectToSerialPorts():
     Example usage:
         * Connect to serial ports
     """
-    assert data_store.suite["ss1Controller"] != None, "{} is null".format(os.getenv("ss1_usb"))
-    assert data_store.suite["ss2Controller"] != None, "{} is null".format(os.getenv("ss2_usb"))
-    assert data_store.suite["ss3Controller"] != None, "{} is null".format(os.getenv("ss3_usb"))
+    for name, device in serialPortDevices():
+        assert data_store.suite["serialHub"].get(name) != None, "{} is null".format(device)
 ###
 # find string
 ###
@@ -97,20 +138,66 @@ def findOnSerialPort(findText, controller, timeout=30):
     if timeout == -1:
         ignoreAssert = True
         timeout = 30
-    Messages.write_message("Text to find: {}".format(findText))
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].find(timeout, findText)
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].find(timeout, findText)
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].find(timeout, findText)
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
+    report.writeMessage("Text to find: {}".format(findText))
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).find(findText, timeout)
+    report.writeMessage(results["description"])
     if not ignoreAssert:
         assert results["result"] == 0, "Was not able to find {} on controller {}".format(findText, controller)
 ###
+# find regular expression
+###
+@step("Find regex <pattern> on <controller> serial port <timeout>")
+def findRegexOnSerialPort(pattern, controller, timeout=30):
+    """
+    Find the first match of the given regular expression on the given serial port with given timeout. The match must be within one line.
+
+    Args:
+        pattern (string): Regular expression to find.
+        controller (string): Subsystem to read from.
+        timeout (int, optional): Timeout in seconds. Defaults to 30.
+
+    Step and function definition::
+
+        @step("Find regex <pattern> on <controller> serial port <timeout>")
+        def findRegexOnSerialPort(pattern, controller, timeout=30):
+
+    Example usage:
+        * Find regex "SSR [Aa]gent is [Rr]eady" on "SS1" serial port "120"
+    """
+    report.writeMessage("Pattern to find: {}".format(pattern))
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).find(re.compile(pattern), float(timeout))
+    report.writeMessage(results["description"])
+    assert results["result"] == 0, "Was not able to find {} on controller {}".format(pattern, controller)
+###
+# find any string
+###
+@step("Find any of <findTexts> on <controller> serial port <timeout>")
+def findAnyOnSerialPort(findTexts, controller, timeout=30):
+    """
+    Find whichever of the given texts comes first on the given serial port with given timeout. The found text is saved in ``data_store.scenario["serialFound"]``.
+
+    Args:
+        findTexts (string): Texts to find separated by ``|``.
+        controller (string): Subsystem to read from.
+        timeout (int, optional): Timeout in seconds. Defaults to 30.
+
+    Step and function definition::
+
+        @step("Find any of <findTexts> on <controller> serial port <timeout>")
+        def findAnyOnSerialPort(findTexts, controller, timeout=30):
+
+    Example usage:
+        * Find any of "SSR agent is ready...|Kernel panic" on "SS1" serial port "120"
+    """
+    report.writeMessage("Texts to find: {}".format(findTexts))
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).find(findTexts.split("|"), float(timeout))
+    report.writeMessage(results["description"])
+    assert results["result"] == 0, "Was not able to find any of {} on controller {}".format(findTexts, controller)
+    data_store.scenario["serialFound"] = results["data"]["match"]
+###
 # write string
 ###
 @step("Write <writeText> on <controller> serial port")
@@ -130,17 +217,10 @@ def writeOnSerialPort(writeText, controller):
     Example usage:
         * Write "setenv fullimg ss1_firmware.bin%\n" on "SS1" serial port
     """
-    Messages.write_message("Text to write: {}".format(writeText))
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].write(writeText)
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].write(writeText)
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].write(writeText)
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
+    report.writeMessage("Text to write: {}".format(writeText))
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialPort(controller).write(writeText)
+    report.writeMessage(results["description"])
 ###
 # read string
 ###
@@ -160,17 +240,10 @@ def readOnSerialPort(controller):
     Example usage:
         * Read on "SS1" serial port
     """
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].read()
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].read()
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].read()
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).readLine()
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
 ###
 # read all string
 ###
@@ -190,24 +263,17 @@ def readAllOnSerialPort(controller):
     Example usage::
         * Read on all "SS1" serial port
     """
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].readAll()
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].readAll()
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].readAll()
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
-    Messages.write_message(results["data"])
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).readAll()
+    report.writeMessage(results["description"])
+    report.writeMessage(results["data"])
 ###
 # clear serial port
 ###
 @step("Clear <controller> serial port")
 def clearSerialPort(controller):
     """
-    Clear all lines in the buffer from the given serial port (will clear the buffer for find and read).
+    Clear all lines in the buffer from the given serial port (will clear the buffer for find and read). The text stays in the capture ring, later finds only search the text that arrives after the clear.
 
     Args:
         controller (string): Subsystem to read from.
@@ -220,18 +286,45 @@ def clearSerialPort(controller):
     Example usage::
         * Clear "SS1" serial port
     """
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].clearQueue()
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].clearQueue()
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].clearQueue()
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).clear()
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Was not able to clear on controller {}".format(controller)
 ###
+# save serial log
+###
+@step("Save <controller> serial log of the last <seconds> seconds")
+def saveSerialLog(controller, seconds):
+    """
+    Write the output of the given serial port of the last seconds from its log files to a file in ``<gauge_reports_dir>/artifacts``, only the file name is written to the report.
+
+    Args:
+        controller (string): Subsystem to read from.
+        seconds (float): Length of the window in seconds.
+
+    Step and function definition::
+
+        @step("Save <controller> serial log of the last <seconds> seconds")
+        def saveSerialLog(controller, seconds):
+
+    Example usage:
+        * Save "SS1" serial log of the last "300" seconds
+    """
+    assert controller in data_store.suite["serialLogs"], "Serial connection device {}, not found".format(controller)
+    end = time.time()
+    results = data_store.suite["serialLogs"][controller].saveWindow(end - float(seconds), end, serialLogArtifact(controller))
+    report.writeMessage(results["description"])
+
+def serialLogArtifact(controller):
+    """
+    Args:
+        controller (string): Subsystem name (ie. SS1).
+
+    Returns:
+        string: New file name in ``<gauge_reports_dir>/artifacts`` for a slice of the serial log.
+    """
+    return os.path.join(os.getenv("gauge_reports_dir", "reports"), "artifacts", "{}_{}.log".format(device_context.streamName(controller), int(time.time() * 1000)))
+###
 # before flash step; try to interupt uboot but if it fails hard reset
 ### 
 @step("Before flash find <findText> on <controller> serial port")
@@ -252,17 +345,10 @@ def beforeFlashFind(findText, controller, timeout=30):
     Example usage:
         * Before flash find "Hit any key to stop autoboot" on "SS1" serial port
     """
-    Messages.write_message("Text to find: {}".format(findText))
-    Messages.write_message("Connection: {}".format(controller))
-    if controller == "SS1":
-        results = data_store.suite["ss1Controller"].find(timeout, findText)
-    elif controller == "SS2":
-        results = data_store.suite["ss2Controller"].find(timeout, findText)
-    elif controller == "SS3":
-        results = data_store.suite["ss3Controller"].find(timeout, findText)
-    else:
-        assert False, "Serial connection device {}, not found".format(controller)
-    Messages.write_message(results["description"])
+    report.writeMessage("Text to find: {}".format(findText))
+    report.writeMessage("Connection: {}".format(controller))
+    results = getSerialCapture(controller).find(findText, timeout)
+    report.writeMessage(results["description"])
     if results["result"] == 0:
         # try to interrupt uboot
         writeOnSerialPort("\r\n", "SS1")
@@ -290,29 +376,44 @@ def verifyDeviceIsReadyFromHardReset():
         * Verify device is ready from hard reset
 
     """
-    results = data_store.suite["ss1Controller"].find(120, "SSR agent is ready...")
-    Messages.write_message(results["description"])
+    results = getSerialCapture("SS1").find("SSR agent is ready...", 120)
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "Was not able to verify reboot"
     data_store.suite["hardReset"] = True
 
+##########################################################################
+# step hooks
+###
+stepStartTime = None
+
+@before_step
+def beforeStepHook():
+    """
+    Keeps the start time of the Step for the serial log of a failing Step.
+    """
+    global stepStartTime
+    stepStartTime = time.time()
+
+@after_step
+def afterStepHook(context):
+    """
+    Writes the serial output of a failing Step from the log files to ``<gauge_reports_dir>/artifacts``.
+    """
+    if not context.step.is_failing or stepStartTime is None or "serialLogs" not in data_store.suite:
+        return
+    for controller, log in data_store.suite["serialLogs"].items():
+        results = log.saveWindow(stepStartTime, None, serialLogArtifact(controller))
+        report.writeMessage(results["description"])
+
 ##########################################################################
 # after suite tasks
 ###
 @after_suite
 def afterSuiteHook():
     """
-    Stops the Serial Controller class threads.
+    Closes the serial hub ports and the serial log files.
     """    
-    try:
-        data_store.suite["ss1Controller"].stop()
-    except:
-        pass
-    try:
-        data_store.suite["ss2Controller"].stop()
-    except:
-        pass
-    try:
-        data_store.suite["ss3Controller"].stop()
-    except:
-        pass
-    Messages.write_message("serial after suite complete")
\ No newline at end of file
+    data_store.suite["serialHub"].close()
+    for log in data_store.suite["serialLogs"].values():
+        log.close()
+    report.writeMessage("serial after suite complete", report.DEBUG)
\ No newline at end of file
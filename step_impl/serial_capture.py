@@ -0,0 +1,266 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Serial Capture for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Capture of the SS1/SS2/SS3 console output used by the find and read Steps in ``serial.py``.
+
+The serial hub (``serial_hub.py``) appends every chunk read from a port to a ring of ``serial_capture_size`` characters (default 4 MB) together with its ``time.monotonic()`` timestamp. Whole chunks are dropped from the front once the newer ones fill the ring, so feeding never copies the captured text. The text also goes to the rolling log files of ``serial_log.py`` when a log is given. Text is addressed by its absolute offset since the capture started, so clearing the port only moves the read cursor and the text stays searchable until it falls out of the ring.
+
+Searches take one or more substrings or compiled regular expressions and return on the first match. Searches copy the text under the condition and scan it without holding it. Waiting searches sleep on the condition the reading thread notifies on every arrival and only scan the new text (plus the current line, so regular expressions match within a line), so any number of Steps can wait on the same port.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import bisect
+import threading
+import time
+
+##########################################################################
+# constants
+###
+CAPTURE_SIZE = 4 * 1024 * 1024
+CAPTURE_IDLE = 0.01
+
+##########################################################################
+# serial capture
+###
+class SerialCapture:
+    """
+    Ring buffer of the console output of one serial port.
+
+    Args:
+        name (string): Port name (ie. ``SS1``).
+        capacity (int, optional): Characters kept. Defaults to ``serial_capture_size`` or ``CAPTURE_SIZE``.
+        log (SerialLog, optional): Log file all text is also written to. Defaults to None.
+    """
+    def __init__(self, name, capacity=None, log=None):
+        self.name = name
+        self.log = log
+        self.capacity = int(capacity or os.getenv("serial_capture_size", CAPTURE_SIZE))
+        # (offset, time, text) of each fed chunk, chunks before head have left the ring
+        self.chunks = []
+        self.head = 0
+        self.base = 0
+        self.total = 0
+        self.cursor = 0
+        self.condition = threading.Condition()
+
+    @property
+    def end(self):
+        """
+        Returns:
+            int: Offset after the last captured character.
+        """
+        return self.total
+
+    def feed(self, text):
+        """
+        Appends text read from the port and wakes the waiting searches.
+
+        Args:
+            text (string): Text read from the port.
+        """
+        if not text:
+            return
+        if self.log is not None:
+            self.log.write(text)
+        with self.condition:
+            self.chunks.append((self.total, time.monotonic(), text))
+            self.total += len(text)
+            # drop whole chunks from the front while the rest still fills the ring
+            while self.head + 1 < len(self.chunks) and self.total - self.chunks[self.head + 1][0] >= self.capacity:
+                self.head += 1
+            if self.head > len(self.chunks) // 2:
+                del self.chunks[:self.head]
+                self.head = 0
+            self.base = self.chunks[self.head][0]
+            self.condition.notify_all()
+
+    def _chunkAt(self, offset):
+        # index of the chunk holding the absolute offset, caller holds the condition
+        return bisect.bisect_right(self.chunks, (offset, float("inf")), self.head) - 1
+
+    def timeAt(self, offset):
+        """
+        Args:
+            offset (int): Absolute offset.
+
+        Returns:
+            float: ``time.monotonic()`` when the text at this offset arrived, None if it is no longer in the ring.
+        """
+        with self.condition:
+            index = self._chunkAt(offset)
+            if offset < self.base or index < self.head:
+                return None
+            return self.chunks[index][1]
+
+    def textSince(self, offset, end=None):
+        """
+        Args:
+            offset (int): Absolute start offset, clipped to the oldest text in the ring.
+            end (int, optional): Absolute end offset. Defaults to None for all text.
+
+        Returns:
+            string: Captured text.
+        """
+        with self.condition:
+            start = max(offset, self.base)
+            stop = self.total if end is None else min(end, self.total)
+            if start >= stop:
+                return ""
+            parts = []
+            index = self._chunkAt(start)
+            while index < len(self.chunks) and self.chunks[index][0] < stop:
+                chunkOffset, _, text = self.chunks[index]
+                parts.append(text[max(start - chunkOffset, 0):stop - chunkOffset])
+                index += 1
+            return "".join(parts)
+
+    def _scan(self, patterns, text, offset):
+        # earliest match of any pattern in a snapshot of the text starting at the absolute offset, runs without the condition
+        best = None
+        for pattern in patterns:
+            if isinstance(pattern, str):
+                index = text.find(pattern)
+                if index != -1 and (best is None or index < best[1]):
+                    best = (pattern, index, index + len(pattern), pattern)
+            else:
+                match = pattern.search(text)
+                if match is not None and (best is None or match.start() < best[1]):
+                    best = (pattern.pattern, match.start(), match.end(), match.group(0))
+        if best is None:
+            return None
+        return {"pattern": best[0], "offset": offset + best[1], "end": offset + best[2], "match": best[3]}
+
+    def _rescanFrom(self, patterns, text, offset):
+        # new text is scanned from the start of the last line, substrings also overlap by their length
+        lineStart = offset + text.rfind("\n") + 1
+        overlap = max([len(pattern) for pattern in patterns if isinstance(pattern, str)] or [1]) - 1
+        return min(lineStart, offset + len(text) - overlap)
+
+    def find(self, patterns, timeout=0, start=None, consume=True):
+        """
+        Searches the captured text and waits for new text until one of the patterns is found.
+
+        Args:
+            patterns (string, re.Pattern or list): Substrings and compiled regular expressions, the earliest match wins.
+            timeout (float, optional): Seconds to wait for new text. Defaults to 0 to only search what was captured.
+            start (int, optional): Absolute offset to search from. Defaults to None for the read cursor.
+            consume (bool, optional): Move the read cursor after the line of the match. Defaults to True.
+
+        Returns:
+            dict: ``result`` is 0 if found, ``data`` holds the ``pattern``, ``match``, ``offset``, ``end`` and arrival ``time`` of the match.
+        """
+        if not isinstance(patterns, (list, tuple)):
+            patterns = [patterns]
+        names = ", ".join([pattern if isinstance(pattern, str) else pattern.pattern for pattern in patterns])
+        deadline = time.monotonic() + float(timeout)
+        with self.condition:
+            if start is None:
+                start = self.cursor
+        searchFrom = start
+        while True:
+            # the snapshot is taken under the condition, the scan runs without it so the reading thread isn't blocked
+            with self.condition:
+                searchFrom = max(searchFrom, self.base)
+                scannedTo = self.total
+                text = self.textSince(searchFrom, scannedTo)
+            found = self._scan(patterns, text, searchFrom)
+            if found is not None:
+                with self.condition:
+                    found["time"] = self.timeAt(found["offset"])
+                    if consume:
+                        # like the line queue, the rest of the matched line is consumed with the match
+                        lineEnd = text.find("\n", found["end"] - searchFrom)
+                        self.cursor = max(self.cursor, found["end"] if lineEnd == -1 else searchFrom + lineEnd + 1)
+                return {"result": 0, "description": "{} found {}".format(self.name, repr(found["match"])), "data": found}
+            searchFrom = max(start, self._rescanFrom(patterns, text, searchFrom))
+            with self.condition:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {"result": 1, "description": "{} did not find {} within {} s".format(self.name, names, timeout), "data": None}
+                if self.total == scannedTo:
+                    self.condition.wait(remaining)
+
+    def readLine(self, timeout=0):
+        """
+        Returns the next line after the read cursor and moves the cursor past it.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a complete line. Defaults to 0.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the line without its line end, 1 if there is no complete line.
+        """
+        with self.condition:
+            lineStart = self.cursor
+        results = self.find("\n", timeout, start=lineStart, consume=False)
+        if results["result"] != 0:
+            return {"result": 1, "description": "{} has no new line".format(self.name), "data": ""}
+        with self.condition:
+            line = self.textSince(lineStart, results["data"]["offset"])
+            self.cursor = max(self.cursor, results["data"]["end"])
+        return {"result": 0, "description": "{} read line".format(self.name), "data": line.rstrip("\r")}
+
+    def readAll(self):
+        """
+        Returns all text after the read cursor and moves the cursor to the end.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the text.
+        """
+        with self.condition:
+            text = self.textSince(self.cursor)
+            self.cursor = self.end
+        return {"result": 0, "description": "{} read {} characters".format(self.name, len(text)), "data": text}
+
+    def clear(self):
+        """
+        Moves the read cursor to the end, the text stays in the ring.
+
+        Returns:
+            dict: ``result`` is 0.
+        """
+        with self.condition:
+            self.cursor = self.end
+        return {"result": 0, "description": "{} cleared at offset {}".format(self.name, self.cursor), "data": self.cursor}
+
+###
+# capture reader
+###
+class SerialCaptureReader(threading.Thread):
+    """
+    Thread draining a ``SerialController`` into a ``SerialCapture``.
+
+    Args:
+        controller (SerialController): Serial controller of the port.
+        capture (SerialCapture): Capture to feed.
+    """
+    def __init__(self, controller, capture):
+        threading.Thread.__init__(self, name="{}-capture".format(capture.name), daemon=True)
+        self.controller = controller
+        self.capture = capture
+        self.running = True
+
+    def run(self):
+        while self.running:
+            try:
+                results = self.controller.read()
+            except Exception:
+                results = {"result": -1, "data": ""}
+            if results["result"] == 0 and results["data"]:
+                line = str(results["data"])
+                self.capture.feed(line if line.endswith("\n") else line + "\n")
+            else:
+                time.sleep(CAPTURE_IDLE)
+
+    def stop(self):
+        """
+        Stops the thread after the current read.
+        """
+        self.running = False
@@ -0,0 +1,231 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Serial Hub for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Registry of the serial console ports of the node used by ``serial.py``.
+
+Ports are opened by name (``SS1``, ``SS2`` ...) and the Steps look them up by that name. By default, with ``pyserial`` installed, every port is opened non-blocking and one ``selectors`` event loop thread reads all of them into their ``SerialCapture``, so 16 ports cost one thread. Writes send the Step text unchanged, like ``SerialController.write`` of the serial_comms_library. Without ``pyserial``, or with ``serial_pyserial`` false, each port is a ``SerialController`` drained by its own ``SerialCaptureReader`` thread; the report says which one is used.
+"""
+##########################################################################
+# import libraries
+###
+from step_impl import report, device_context
+from step_impl.serial_capture import SerialCapture, SerialCaptureReader
+import os
+import sys
+import codecs
+import selectors
+import threading
+try:
+    import serial as pyserial
+except Exception as exc:
+    pyserial = None
+    print("import pyserial:: {} occured: {}".format(type(exc).__name__, exc))
+sys.path.append(r"../serial_comms_library") # append lib path
+try:
+    from SerialLibrary import SerialController
+except Exception as exc:
+    print("import serial library:: {} occured: {}".format(type(exc).__name__, exc))
+
+##########################################################################
+# constants
+###
+SERIAL_BAUDRATE = 115200
+SELECT_TIMEOUT = 0.5
+READ_SIZE = 4096
+
+##########################################################################
+# serial ports
+###
+class SerialPort:
+    """
+    Serial port read by the hub selector thread, used unless ``serial_pyserial`` is false.
+
+    Args:
+        name (string): Port name.
+        connection (serial.Serial): Non-blocking pyserial connection.
+        capture (SerialCapture): Capture of the port.
+    """
+    def __init__(self, name, connection, capture):
+        self.name = name
+        self.connection = connection
+        self.capture = capture
+        self.decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+    def fileno(self):
+        return self.connection.fileno()
+
+    def receive(self):
+        """
+        Reads what is waiting on the port into the capture, called by the hub thread.
+
+        Returns:
+            bool: False if the port was closed.
+        """
+        try:
+            data = os.read(self.fileno(), READ_SIZE)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        if not data:
+            return False
+        self.capture.feed(self.decoder.decode(data))
+        return True
+
+    def write(self, text):
+        """
+        Args:
+            text (string): Text to write, sent as it is like ``SerialController.write``.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the number of bytes written.
+        """
+        try:
+            written = self.connection.write(text.encode())
+            self.connection.flush()
+        except Exception as exc:
+            return {"result": -1, "description": "{} write {} occured: {}".format(self.name, type(exc).__name__, exc), "data": 0}
+        return {"result": 0, "description": "{} wrote {} bytes".format(self.name, written), "data": written}
+
+    def close(self):
+        self.connection.close()
+
+class ControllerPort:
+    """
+    Serial port read through a ``SerialController`` and its own reader thread.
+
+    Args:
+        name (string): Port name.
+        controller (SerialController): Serial controller of the port.
+        capture (SerialCapture): Capture of the port.
+    """
+    def __init__(self, name, controller, capture):
+        self.name = name
+        self.controller = controller
+        self.capture = capture
+        self.reader = SerialCaptureReader(controller, capture)
+        self.reader.start()
+
+    def write(self, text):
+        return self.controller.write(text)
+
+    def close(self):
+        self.reader.stop()
+        self.controller.stop()
+
+###
+# serial hub
+###
+class SerialHub:
+    """
+    Opens serial ports by name and reads them from one selector thread.
+    """
+    def __init__(self):
+        self.ports = {}
+        self.lock = threading.Lock()
+        self.selector = selectors.DefaultSelector()
+        # written to wake the selector when a port is added
+        self.wakeRead, self.wakeWrite = os.pipe()
+        self.selector.register(self.wakeRead, selectors.EVENT_READ, None)
+        self.running = False
+        self.thread = None
+
+    def open(self, name, device, log=None, baudrate=None):
+        """
+        Opens a port and starts capturing it.
+
+        Args:
+            name (string): Port name (ie. ``SS1``).
+            device (string): Device path (ie. ``/dev/ttyUSB0``).
+            log (SerialLog, optional): Log file of the port. Defaults to None.
+            baudrate (int, optional): Baud rate. Defaults to ``serial_baudrate`` or ``SERIAL_BAUDRATE``.
+
+        Returns:
+            SerialPort or ControllerPort: Opened port.
+        """
+        capture = SerialCapture(name, log=log)
+        usePyserial = os.getenv("serial_pyserial", "true").strip().lower() == "true"
+        if pyserial is None or not usePyserial:
+            if usePyserial:
+                report.writeMessage("pyserial is not installed, {} is read by its own serial_comms_library thread".format(name), report.WARNING)
+            else:
+                report.writeMessage("{} opened with the serial_comms_library".format(name), report.DEBUG)
+            port = ControllerPort(name, SerialController(device, loggerName=device_context.streamName(name)), capture)
+            with self.lock:
+                self.ports[name] = port
+            return port
+        connection = pyserial.Serial(device, int(baudrate or os.getenv("serial_baudrate", SERIAL_BAUDRATE)), timeout=0)
+        port = SerialPort(name, connection, capture)
+        with self.lock:
+            self.ports[name] = port
+            self.selector.register(port.fileno(), selectors.EVENT_READ, port)
+        os.write(self.wakeWrite, b"\0")
+        self.start()
+        report.writeMessage("{} opened with pyserial on the serial hub thread".format(name), report.DEBUG)
+        return port
+
+    def get(self, name):
+        """
+        Args:
+            name (string): Port name.
+
+        Returns:
+            SerialPort or ControllerPort: Port, None if it was not opened.
+        """
+        with self.lock:
+            return self.ports.get(name)
+
+    def names(self):
+        """
+        Returns:
+            list: Names of the opened ports.
+        """
+        with self.lock:
+            return sorted(self.ports.keys())
+
+    def start(self):
+        """
+        Starts the selector thread if it isn't running.
+        """
+        if self.thread is not None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="serial-hub", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            for key, _ in self.selector.select(SELECT_TIMEOUT):
+                if key.data is None:
+                    os.read(self.wakeRead, READ_SIZE)
+                elif not key.data.receive():
+                    with self.lock:
+                        self.selector.unregister(key.fd)
+
+    def close(self):
+        """
+        Stops the selector thread, closes all ports, the selector and the wake pipe.
+        """
+        if self.wakeWrite is None:
+            return
+        self.running = False
+        os.write(self.wakeWrite, b"\0")
+        if self.thread is not None:
+            self.thread.join(SELECT_TIMEOUT * 2)
+            self.thread = None
+        with self.lock:
+            for port in self.ports.values():
+                try:
+                    port.close()
+                except Exception:
+                    pass
+            self.ports = {}
+            self.selector.close()
+            os.close(self.wakeRead)
+            os.close(self.wakeWrite)
+            self.wakeRead = self.wakeWrite = None
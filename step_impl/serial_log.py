@@ -0,0 +1,162 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   Serial Log Files for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Rolling log files of the SS1/SS2/SS3 console output, written by the captures in ``serial_capture.py``.
+
+Each port is written to ``<serial_log_dir>/<port>.log`` (default ``logs/serial``, the port name gets the stream suffix in parallel runs). Once a file reaches ``serial_log_size`` bytes (default 16 MB) it is rotated to ``<port>.log.1`` and so on up to ``serial_log_backups`` files. Next to every log a ``.idx`` file holds one record per write with the ``time.time()`` of the arrival and the byte offset in the log, so the output of a time window is found with a binary search over the ``mmap`` of the index and sliced out of the ``mmap`` of the log without reading the whole file.
+"""
+##########################################################################
+# import libraries
+###
+import os
+import mmap
+import struct
+import threading
+import time
+
+##########################################################################
+# constants
+###
+SERIAL_LOG_DIR = "logs/serial"
+SERIAL_LOG_SIZE = 16 * 1024 * 1024
+SERIAL_LOG_BACKUPS = 4
+INDEX_RECORD = struct.Struct("<dQ")
+
+##########################################################################
+# serial log
+###
+class SerialLog:
+    """
+    Size rotated log file with a time to offset index.
+
+    Args:
+        name (string): Port name used for the file names.
+        directory (string, optional): Log directory. Defaults to ``serial_log_dir`` or ``SERIAL_LOG_DIR``.
+    """
+    def __init__(self, name, directory=None):
+        self.name = name
+        self.directory = directory or os.getenv("serial_log_dir", SERIAL_LOG_DIR)
+        self.maxSize = int(os.getenv("serial_log_size", SERIAL_LOG_SIZE))
+        self.backups = int(os.getenv("serial_log_backups", SERIAL_LOG_BACKUPS))
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.logFile = None
+        self.indexFile = None
+        # the log of the previous run becomes the first backup
+        self._rotate()
+
+    def _path(self, number=0, extension="log"):
+        path = os.path.join(self.directory, "{}.{}".format(self.name, extension))
+        if number:
+            path = "{}.{}".format(path, number)
+        return path
+
+    def _indexPath(self, number=0):
+        return self._path(number, "idx")
+
+    def _rotate(self):
+        if self.logFile is not None:
+            self.logFile.close()
+            self.indexFile.close()
+        for number in range(self.backups, 0, -1):
+            for path in (self._path, self._indexPath):
+                if os.path.exists(path(number - 1)):
+                    os.replace(path(number - 1), path(number))
+        self.logFile = open(self._path(), "wb")
+        self.indexFile = open(self._indexPath(), "wb")
+        self.size = 0
+
+    def write(self, text, arrival=None):
+        """
+        Appends text to the log and its arrival time to the index.
+
+        Args:
+            text (string): Text read from the port.
+            arrival (float, optional): ``time.time()`` of the arrival. Defaults to now.
+        """
+        data = text.encode("utf-8", "replace")
+        with self.lock:
+            if self.logFile.closed:
+                return
+            if self.size and self.size + len(data) > self.maxSize:
+                self._rotate()
+            self.indexFile.write(INDEX_RECORD.pack(time.time() if arrival is None else arrival, self.size))
+            self.logFile.write(data)
+            self.size += len(data)
+            self.logFile.flush()
+            self.indexFile.flush()
+
+    def _sliceFile(self, number, start, end):
+        # bytes of one log file that arrived between start and end
+        if not os.path.exists(self._indexPath(number)) or os.path.getsize(self._indexPath(number)) == 0:
+            return b""
+        with open(self._indexPath(number), "rb") as indexFile, mmap.mmap(indexFile.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            records = len(index) // INDEX_RECORD.size
+            def search(timestamp):
+                low, high = 0, records
+                while low < high:
+                    middle = (low + high) // 2
+                    if INDEX_RECORD.unpack_from(index, middle * INDEX_RECORD.size)[0] < timestamp:
+                        low = middle + 1
+                    else:
+                        high = middle
+                return low
+            first = search(start)
+            last = search(end)
+            if first >= records or first == last:
+                return b""
+            startOffset = INDEX_RECORD.unpack_from(index, first * INDEX_RECORD.size)[1]
+            endOffset = INDEX_RECORD.unpack_from(index, last * INDEX_RECORD.size)[1] if last < records else None
+        with open(self._path(number), "rb") as logFile:
+            if os.path.getsize(self._path(number)) == 0:
+                return b""
+            with mmap.mmap(logFile.fileno(), 0, access=mmap.ACCESS_READ) as log:
+                return log[startOffset:endOffset]
+
+    def readWindow(self, start, end=None):
+        """
+        Returns the output that arrived in a time window, across rotated files.
+
+        Args:
+            start (float): ``time.time()`` of the window start.
+            end (float, optional): ``time.time()`` of the window end. Defaults to None for now.
+
+        Returns:
+            string: Console output of the window.
+        """
+        if end is None:
+            end = time.time()
+        with self.lock:
+            chunks = [self._sliceFile(number, start, end) for number in range(self.backups, -1, -1)]
+        return b"".join(chunks).decode("utf-8", "replace")
+
+    def saveWindow(self, start, end, filepath):
+        """
+        Writes the output of a time window to a file.
+
+        Args:
+            start (float): ``time.time()`` of the window start.
+            end (float): ``time.time()`` of the window end, None for now.
+            filepath (string): File to write.
+
+        Returns:
+            dict: ``result`` is 0 and ``data`` the number of characters written.
+        """
+        text = self.readWindow(start, end)
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        with open(filepath, "w") as windowFile:
+            windowFile.write(text)
+        return {"result": 0, "description": "{} characters of {} written to {}".format(len(text), self.name, filepath), "data": len(text)}
+
+    def close(self):
+        """
+        Closes the log and index files.
+        """
+        with self.lock:
+            self.logFile.close()
+            self.indexFile.close()
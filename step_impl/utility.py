@@ -15,9 +15,9 @@ Below are a list of implemented Steps:
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, after_suite, before_suite
+from getgauge.python import step, data_store, after_suite, before_suite
+from step_impl import report, lab_server, config_store
 import os
-import requests
 import time
 import json
 import sys
@@ -34,7 +34,7 @@ def beforeSuite():
     Sets the ``data_store.suite["reservedList"]`` to an empty list.
     """
     data_store.suite["reservedList"] = []
-    Messages.write_message("utility before suite complete")
+    report.writeMessage("utility before suite complete", report.DEBUG)
 
 ##########################################################################
 # steps
@@ -82,8 +82,8 @@ def ping(ipAddr):
     assert len(ipAddr.split(".")) == 4, "IP address not proper"
     command = ["ping", "-c", "4", ipAddr]
     result = subprocess.run(args=command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=10)
-    Messages.write_message("{}".format(result.stdout.decode("utf-8")))
-    Messages.write_message("{}".format(result.stderr.decode("utf-8")))
+    report.writeMessage("{}".format(result.stdout.decode("utf-8")))
+    report.writeMessage("{}".format(result.stderr.decode("utf-8")))
     assert result.returncode == 0, "Ping failed"
 ###
 # send shell command
@@ -116,7 +116,7 @@ def sendShellCommand(cmd, check):
         assert False, "call retruned non-zero"
     except Exception as exc:
         assert False, "error during call {}".format(exc)
-    Messages.write_message(process)
+    report.writeMessage(process)
 ###
 # force fail
 ###
@@ -171,36 +171,44 @@ def reserve(toolname, timeout=300):
     Example usage:
         * Reserve "profinet1"
     """
-    if not toolname in data_store.suite["reservedList"]:  
-        results = {}
-        results["result"] = 1
-        timeout = time.time() + timeout
-        vlanId = int(os.getenv("vlan_id"))
-        nodename = os.getenv("nodename")
-        datas = json.dumps({"node": nodename, "toolname": toolname})
-        while (timeout > time.time()) and (results["result"] == 1):
-            try:
-                response = requests.post(
-                    url="http://10.10.1.100:5000/api/v2/reserve",
-                    params={"vlan_id": vlanId},
-                    data=datas
-                )
-                if response.status_code == 200:
-                    results = response.json()
-                else:
-                    Messages.write_message(response.text)
-                    Messages.write_message(response.request.body)
-                    assert False, "error returned from server"
-            except:
-                Messages.write_message(response.text)
-                Messages.write_message(response.request.body)
-                assert False, "error while sending request"
-            time.sleep(15)
-        Messages.write_message(results)
+    if not toolname in data_store.suite["reservedList"]:
+        results = lab_server.getLabServerClient().reserve(os.getenv("nodename"), toolname, int(os.getenv("vlan_id")), timeout)
+        report.writeMessage(results)
         assert results["result"] == 0, "was unable to reserve within timeout period"
+        report.writeMessage("{} reserved after {:.1f} s ({} attempts)".format(toolname, results["waited"], results["attempts"]))
         data_store.suite["reservedList"].append(toolname)
     else:
-        Messages.write_message("tool is already reserved")
+        report.writeMessage("tool is already reserved")
+###
+# reserve tools
+###
+@step("Reserve tools <toolnames>")
+def reserveTools(toolnames, timeout=300):
+    """
+    Reserve several tools concurrently from the tool resources on a timeout of 300 seconds.
+
+    Args:
+        toolnames (string): Comma separated tool names to reserve.
+        timeout (int, optional): Timeout. Defaults to 300.
+
+    Step and function definition::
+
+        @step("Reserve tools <toolnames>")
+        def reserveTools(toolnames, timeout=300):
+
+    Example usage:
+        * Reserve tools "profinet1,ethernetip1"
+    """
+    toolnames = [toolname.strip() for toolname in toolnames.split(",") if toolname.strip() not in data_store.suite["reservedList"]]
+    allResults = lab_server.getLabServerClient().reserveAll(os.getenv("nodename"), toolnames, int(os.getenv("vlan_id")), timeout)
+    failed = []
+    for toolname, results in allResults.items():
+        report.writeMessage("{}: {}".format(toolname, results))
+        if results["result"] == 0:
+            data_store.suite["reservedList"].append(toolname)
+        else:
+            failed.append(toolname)
+    assert len(failed) == 0, "was unable to reserve {} within timeout period".format(", ".join(failed))
 ###
 # unreserve
 ###
@@ -220,24 +228,8 @@ def unreserve(toolname):
     Example usage:
         * Unreserve "profinet1"
     """
-    nodename = os.getenv("nodename")
-    datas = json.dumps({"node": nodename, "toolname": toolname})
-    try:
-        response = requests.post(
-            url="http://10.10.1.100:5000/api/v2/unreserve",
-            data=datas
-        )
-        if response.status_code == 200:
-            results = response.json()
-        else:
-            Messages.write_message(response.text)
-            Messages.write_message(response.request.body)
-            assert False, "error returned from server"
-    except:
-        Messages.write_message(response.text)
-        Messages.write_message(response.request.body)
-        assert False, "error while sending request"
-    Messages.write_message(results)
+    results = lab_server.getLabServerClient().unreserve(os.getenv("nodename"), toolname)
+    report.writeMessage(results)
     assert results["result"] == 0, "was unable to unreserve"
     data_store.suite["reservedList"].remove(toolname)
 ###
@@ -259,25 +251,30 @@ def getConfigCRC(configFilename):
     Example usage:
         * Get config crc "f-host_port-25.bin"
     """
-    datas = json.dumps({"filename": configFilename})
-    try:
-        response = requests.post(
-            url="http://10.10.1.100:5000/api/v2/lookup/config-crc",
-            data=datas
-        )
-        if response.status_code == 200:
-            results = response.json()
-            data_store.suite["configCRC"] = results["data"]["crc"]
-        else:
-            Messages.write_message(response.text)
-            Messages.write_message(response.request.body)
-            assert False, "error returned from server"
-    except:
-        Messages.write_message(response.text)
-        Messages.write_message(response.request.body)
-        assert False, "error while sending request"
-    Messages.write_message(results)
+    results = lab_server.getLabServerClient().cachedPost("lookup/config-crc", {"filename": configFilename})
+    if results["result"] == 0:
+        data_store.suite["configCRC"] = results["data"]["crc"]
+        data_store.suite["configCRCFilename"] = configFilename
+    report.writeMessage(results)
     assert results["result"] == 0, "was unable to get crc from {} file".format(configFilename)
+    storeConfig()
+###
+# clear lab server cache
+###
+@step("Clear lab server cache")
+def clearLabServerCache():
+    """
+    Drops the cached lab server lookups (config CRC, protocol lookup, relay info) so the next lookup goes to the server.
+
+    Step and function definition::
+
+        @step("Clear lab server cache")
+        def clearLabServerCache():
+
+    Example usage:
+        * Clear lab server cache
+    """
+    lab_server.getLabServerClient().invalidate()
 ###
 # load config
 ###
@@ -298,10 +295,26 @@ def loadConfig(configFilename):
         * Load config "f-host_port-25.bin"
     """    
     configFilepath = os.getenv("config_filepath")
-    Messages.write_message(configFilepath)
-    Messages.write_message(configFilename)
+    report.writeMessage(configFilepath)
+    report.writeMessage(configFilename)
     data_store.suite["configFile"] = configFilepath + configFilename
+    data_store.suite["configFilename"] = configFilename
     assert os.path.exists(data_store.suite["configFile"]), "config file does not exist"
+    storeConfig()
+###
+# store config
+###
+def storeConfig():
+    """
+    Once both Load config and Get config crc ran for the same file, checks the file against the lab server CRC and points ``data_store.suite["configFile"]`` at its copy in the configuration store, see ``config_store.py``.
+    """
+    if "configFilename" not in data_store.suite or "configCRCFilename" not in data_store.suite:
+        return
+    if data_store.suite["configFilename"] != data_store.suite["configCRCFilename"]:
+        return
+    results = config_store.storeConfig(data_store.suite["configFile"], data_store.suite["configCRC"])
+    report.writeMessage(results["description"])
+    data_store.suite["configFile"] = results["data"]
 ###
 # lookup tool
 ###
@@ -326,27 +339,14 @@ def lookupProtocol(standardProtocol, safeProtocol):
 
     """
     if safeProtocol == "":
-        datas = json.dumps({"standard": standardProtocol})
+        datas = {"standard": standardProtocol}
     else:
-        datas = json.dumps({"standard": standardProtocol, "safe": safeProtocol})
-    try:
-        response = requests.post(
-            url="http://10.10.1.100:5000/api/v2/lookup",
-            data=datas
-        )
-        if response.status_code == 200:
-            results = response.json()
-            data_store.suite["lookupPort"] = results["data"]["port"]
-            data_store.suite["lookupToolname"] = results["data"]["toolname"]
-        else:
-            Messages.write_message(response.text)
-            Messages.write_message(response.request.body)
-            assert False, "error returned from server"
-    except:
-        Messages.write_message(response.text)
-        Messages.write_message(response.request.body)
-        assert False, "error while sending request"
-    Messages.write_message(results)
+        datas = {"standard": standardProtocol, "safe": safeProtocol}
+    results = lab_server.getLabServerClient().cachedPost("lookup", datas)
+    if results["result"] == 0:
+        data_store.suite["lookupPort"] = results["data"]["port"]
+        data_store.suite["lookupToolname"] = results["data"]["toolname"]
+    report.writeMessage(results)
     assert results["result"] == 0, "was unable to get a return for the lookup with data: {}".format(datas)
 ###
 # reserve lookup
@@ -367,36 +367,7 @@ def reserveLookupTool(timeout=300):
     Example usage:
         * Reserve lookup tool
     """
-    if not data_store.suite["lookupToolname"] in data_store.suite["reservedList"]:  
-        results = {}
-        results["result"] = 1
-        timeout = time.time() + timeout
-        vlanId = int(os.getenv("vlan_id"))
-        nodename = os.getenv("nodename")
-        datas = json.dumps({"node": nodename, "toolname": data_store.suite["lookupToolname"]})
-        while (timeout > time.time()) and (results["result"] == 1):
-            try:
-                response = requests.post(
-                    url="http://10.10.1.100:5000/api/v2/reserve",
-                    params={"vlan_id": vlanId},
-                    data=datas
-                )
-                if response.status_code == 200:
-                    results = response.json()
-                else:
-                    Messages.write_message(response.text)
-                    Messages.write_message(response.request.body)
-                    assert False, "error returned from server"
-            except:
-                Messages.write_message(response.text)
-                Messages.write_message(response.request.body)
-                assert False, "error while sending request"
-            time.sleep(15)
-        Messages.write_message(results)
-        assert results["result"] == 0, "was unable to reserve within timeout period"
-        data_store.suite["reservedList"].append(data_store.suite["lookupToolname"])
-    else:
-        Messages.write_message("tool is already reserved")
+    reserve(data_store.suite["lookupToolname"], timeout)
 ###
 # unreserve lookup tool
 ###
@@ -413,26 +384,7 @@ def unreserveLookupTool():
     Example usage:
         * Unreserve lookup tool
     """
-    nodename = os.getenv("nodename")
-    datas = json.dumps({"node": nodename, "toolname": data_store.suite["lookupToolname"]})
-    try:
-        response = requests.post(
-            url="http://10.10.1.100:5000/api/v2/unreserve",
-            data=datas
-        )
-        if response.status_code == 200:
-            results = response.json()
-        else:
-            Messages.write_message(response.text)
-            Messages.write_message(response.request.body)
-            assert False, "error returned from server"
-    except:
-        Messages.write_message(response.text)
-        Messages.write_message(response.request.body)
-        assert False, "error while sending request"
-    Messages.write_message(results)
-    assert results["result"] == 0, "was unable to unreserve"
-    data_store.suite["reservedList"].remove(data_store.suite["lookupToolname"])
+    unreserve(data_store.suite["lookupToolname"])
 ###
 # config lookup tool
 ###
@@ -472,10 +424,10 @@ def startupWindowsSubsystems():
         * Startup windows subsystems
     """
     subsystemJson = json.loads(os.getenv("windows_subsystem_list"))
-    Messages.write_message("Subsystem list: {}".format(subsystemJson))
+    report.writeMessage("Subsystem list: {}".format(subsystemJson))
     for key in subsystemJson:
         filepath = os.path.join(os.getenv("workspace_path").strip(), subsystemJson[key])
-        Messages.write_message("Filepath: {}".format(filepath))
+        report.writeMessage("Filepath: {}".format(filepath))
         data_store.suite[key] = subprocess.Popen(filepath, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
 ###
 # stop windows subsystems
@@ -505,6 +457,10 @@ def afterSuite():
     """
     If the ``data_store.suite["reservedList"]`` has items in it this Hook will unreserve them.
     """
-    for toolname in data_store.suite["reservedList"]:
+    for toolname in list(data_store.suite["reservedList"]):
         unreserve(toolname)
-    Messages.write_message("utility after suite complete")
+    if "labServerClient" in data_store.suite and data_store.suite["labServerClient"] is not None:
+        report.writeMessage("lab server cache hits: {}, misses: {}".format(data_store.suite["labServerClient"].cacheHits, data_store.suite["labServerClient"].cacheMisses))
+        data_store.suite["labServerClient"].close()
+        data_store.suite["labServerClient"] = None
+    report.writeMessage("utility after suite complete", report.DEBUG)
@@ -17,13 +17,20 @@ Below are a list of implemented Steps:
 ###
 import json
 import os
-import requests
 import sys
 import time
-from getgauge.python import step, Messages, before_suite, data_store
+from concurrent.futures import ThreadPoolExecutor
+from getgauge.python import step, before_suite, data_store
+from step_impl import report, device_context, lab_server, relay_state
 sys.path.append(r"../kmtronic_web_relay_library")
 from KMTronicWebRelayLibrary import WebRelayController
 
+##########################################################################
+# constants
+###
+RELAY_COUNT = 8
+RELAY_POOL_SIZE = 8
+
 ##########################################################################
 # before suite setup
 ###
@@ -31,13 +38,16 @@ from KMTronicWebRelayLibrary import WebRelayController
 def beforeSuiteHook():
     """
     Uses the Dynamic Variable ``os.getenv("automation_index")`` to determine which Web Relay Controller classes to make and saves them to the related ``data_store.suite.``
+
+    In parallel runs ``automation_index`` comes from the node inventory entry of the stream, see ``device_context.py``.
     """
+    device_context.applyDeviceContext()
     print("automation index: {}".format(os.getenv("automation_index")))
     data_store.suite["addressMap"], data_store.suite["relayIndexLists"] = getRelayInfo(os.getenv("automation_index"))
     data_store.suite["webControllers"] = []
     for address in data_store.suite["addressMap"].keys():
         data_store.suite["webControllers"].append(WebRelayController(address))
-    Messages.write_message("web relay before suite complete")
+    report.writeMessage("web relay before suite complete", report.DEBUG)
 
 ##########################################################################
 # methods
@@ -50,23 +60,9 @@ def beforeSuiteHook():
 ###
 def getRelayInfo(automationIndex, timeout=15):
     # send request
-    try:
-        datas = json.dumps({"automation_index": automationIndex})
-        response = requests.post(
-            url="http://10.10.1.100:5000/api/v2/lookup-relay-info",
-            data=datas
-        )
-        if response.status_code == 200:
-            results = json.loads(response.text)
-        else:
-            Messages.write_message(response.text)
-            Messages.write_message(response.request.body)
-            assert False, "error returned from server"
-    except:
-        Messages.write_message(response.text)
-        Messages.write_message(response.request.body)
-        assert False, "error while sending request"
-    Messages.write_message("Response data: {}".format(results["data"]))
+    results = lab_server.getLabServerClient().cachedPost("lookup-relay-info", {"automation_index": automationIndex}, timeout=timeout)
+    assert results["result"] != -1, results["description"]
+    report.writeMessage("Response data: {}".format(results["data"]))
     # organize data
     responseData = json.loads(results["data"])
     if len(responseData["addresses"]) == 0:
@@ -83,6 +79,99 @@ def getRelayInfo(automationIndex, timeout=15):
             relayIndexLists[i] = [index]
     return addressMap, relayIndexLists
 ###
+# relay state of one controller
+###
+def getWebRelayState(controller):
+    """
+    Args:
+        controller (WebRelayController): Web Relay Controller.
+
+    Returns:
+        RelayState: Cached relay states of the controller, see ``relay_state.py``.
+    """
+    return relay_state.getRelayState(controller.ip, lambda: readWebRelayStatus(controller))
+
+def readWebRelayStatus(controller):
+    """
+    Reads the status of all relays of one Web Relay Controller.
+
+    Args:
+        controller (WebRelayController): Web Relay Controller.
+
+    Returns:
+        dict: ``result`` is 0 and ``data`` the status of each relay index.
+    """
+    results = controller._getStatus()
+    if results["result"] != 0:
+        return results
+    status = controller.status
+    states = dict(status.items()) if isinstance(status, dict) else dict(enumerate(status))
+    return {"result": 0, "description": "Read status of web relay at {}".format(controller.ip), "data": states}
+###
+# switch relays of one controller
+###
+def setControllerRelays(controller, relayIndices, on):
+    """
+    Switches the given relays of one Web Relay Controller. When the given relays are all relays of the controller they are switched with one bulk set-state request (``setRelays``) unless ``web_relay_bulk`` is false. Otherwise, or if the controller or its firmware doesn't support it, one request per relay is used, so relays of other nodes on the same controller are never written.
+
+    Args:
+        controller (WebRelayController): Web Relay Controller.
+        relayIndices (list): Relay indexes (1 to ``RELAY_COUNT``).
+        on (bool): True to turn the relays on, False to turn them off.
+
+    Returns:
+        dict: ``result`` is 0 if all relays switched, ``data`` holds the controller ``ip``, ``bulk`` and the ``times`` each switching request returned.
+    """
+    state = "on" if on else "off"
+    value = "1" if on else "0"
+    relayState = getWebRelayState(controller)
+    data = {"ip": controller.ip, "bulk": False, "times": []}
+    # a bulk write of a shared controller could revert a relay another stream just switched
+    if set(range(1, RELAY_COUNT + 1)).issubset(relayIndices) and os.getenv("web_relay_bulk", "true").strip().lower() == "true" and hasattr(controller, "setRelays"):
+        try:
+            # every relay gets the requested value, no cached state decides what is written
+            results = controller.setRelays([value] * RELAY_COUNT)
+            data["bulk"] = results["result"] == 0
+        except Exception as exc:
+            report.writeMessage("Bulk set of web relay at {} not supported, {}: {}".format(controller.ip, type(exc).__name__, exc), report.DEBUG)
+        if data["bulk"]:
+            data["times"].append(time.time())
+            relayState.written({relayIndex: value for relayIndex in relayIndices})
+            return {"result": 0, "description": "Turned {} web relay at {} index/indices {} with one set-state request".format(state, controller.ip, relayIndices), "data": data}
+    for relayIndex in relayIndices:
+        results = controller.relayOn(relayIndex) if on else controller.relayOff(relayIndex)
+        data["times"].append(time.time())
+        if results["result"] != 0:
+            relayState.invalidate()
+            return {"result": -1, "description": "Failed to turn {} web relay at {} index {}".format(state, controller.ip, relayIndex), "data": data}
+        relayState.written({relayIndex: value})
+    return {"result": 0, "description": "Turned {} web relay at {} index/indices {}".format(state, controller.ip, relayIndices), "data": data}
+###
+# switch relays of all controllers
+###
+def switchWebRelays(on):
+    """
+    Switches the relays of all Web Relay Controllers at the ``os.getenv("automation_index")`` index at once, one thread per controller. The skew between the first and the last relay switching is reported and saved in ``data_store.scenario["webRelaySkew"]`` in milliseconds.
+
+    Args:
+        on (bool): True to turn the relays on, False to turn them off.
+    """
+    controllers = data_store.suite["webControllers"]
+    with ThreadPoolExecutor(max_workers=min(len(controllers), RELAY_POOL_SIZE) or 1) as executor:
+        futures = [executor.submit(setControllerRelays, controller, data_store.suite["relayIndexLists"][data_store.suite["addressMap"][controller.ip]], on) for controller in controllers]
+    failures = []
+    times = []
+    for future in futures:
+        results = future.result()
+        report.writeMessage(results["description"])
+        times.extend(results["data"]["times"])
+        if results["result"] != 0:
+            failures.append(results["description"])
+    if times:
+        data_store.scenario["webRelaySkew"] = (max(times) - min(times)) * 1000
+        report.writeMessage("Web relay switching skew: {:.1f} ms over {} controller(s)".format(data_store.scenario["webRelaySkew"], len(controllers)))
+    assert not failures, ", ".join(failures)
+###
 # set web relay step
 ###
 @step("Set web relay <relayList>")
@@ -104,7 +193,9 @@ def setWebRelay(relayList):
     for controller in data_store.suite["webControllers"]:
         relayList = list(relayList)
         results = controller.setRelays(relayList)
-        Messages.write_message(results["description"])
+        # the relay list format is up to the library, the states are read again on the next verify
+        getWebRelayState(controller).invalidate()
+        report.writeMessage(results["description"])
         assert results["result"] == 0, "Set web relay failed"
 ###
 # verify web relay status
@@ -112,7 +203,7 @@ def setWebRelay(relayList):
 @step("Verify web relay status <relayStatus>")
 def verifyWebRelayStatus(relayStatus):
     """
-    Verify the given status of the Web Relay Controller(s) at the ``os.getenv("automation_index")`` index.
+    Verify the given status of the Web Relay Controller(s) at the ``os.getenv("automation_index")`` index. The status is read once per controller after a write and answered from the relay state for ``relay_state_ttl`` seconds after that.
 
     Args:
         relayStatus (int): Value to verify (0 for OFF or 1 for ON).
@@ -126,12 +217,13 @@ def verifyWebRelayStatus(relayStatus):
         * Verify web relay status "0"
     """
     for controller in data_store.suite["webControllers"]:
-        Messages.write_message("Verifying status of web relay at {}.".format(controller.ip))
-        results = controller._getStatus()
-        assert results["result"] == 0, "Get status failed"
+        report.writeMessage("Verifying status of web relay at {}.".format(controller.ip))
         relayIndices = data_store.suite["relayIndexLists"][data_store.suite["addressMap"][controller.ip]]
+        results = getWebRelayState(controller).read(relayIndices)
+        report.writeMessage(results["description"], report.DEBUG)
+        assert results["result"] == 0, "Get status failed"
         for relayIndex in relayIndices:
-            assert relayStatus == controller.status[relayIndex], "Verify {} != Result {}".format(relayStatus, controller.status[relayIndex-1])
+            assert relayStatus == results["data"][relayIndex], "Verify {} != Result {}".format(relayStatus, results["data"][relayIndex])
 ###
 # set web relay power
 ###
@@ -151,18 +243,7 @@ def setWebRelayPower(relayToggle):
     Example usage:
         * Set web relay power "0"
     """
-    relayToggle = int(relayToggle)
-    for controller in data_store.suite["webControllers"]:
-        Messages.write_message("Setting power for web relay at {}.".format(controller.ip))
-        relayIndices = data_store.suite["relayIndexLists"][data_store.suite["addressMap"][controller.ip]]
-        for relayIndex in relayIndices:
-            if (relayToggle == 0):
-                results = controller.relayOn(relayIndex)
-                assert results["result"] == 0, "Failed to turn on web relay at index {}".format(relayIndex)
-            else:
-                results = controller.relayOff(relayIndex)
-                assert results["result"] == 0, "Failed to turn on web relay at index {}".format(relayIndex)
-        Messages.write_message("Successfully toggled relay index/indices: {}.".format(relayIndices))
+    switchWebRelays(int(relayToggle) == 0)
 ###
 # factory flash set web relay
 ###
@@ -182,21 +263,11 @@ def factoryFlashSetWebRelayPower(relayToggle):
     Example usage:
         * Factory flash set web relay power "0"
     """
-    relayToggle = int(relayToggle)
     if data_store.scenario["factoryFlashRestart"]:
-        for controller in data_store.suite["webControllers"]:
-            Messages.write_message("Setting power (factory flash) for web relay at {}.".format(controller.ip))
-            relayIndices = data_store.suite["relayIndexLists"][data_store.suite["addressMap"][controller.ip]]
-            for relayIndex in relayIndices:
-                if (relayToggle == 0):
-                    results = controller.relayOn(relayIndex)
-                    assert results["result"] == 0, "Failed to turn on web relay at index {}".format(relayIndex)
-                else:
-                    results = controller.relayOff(relayIndex)
-                    assert results["result"] == 0, "Failed to turn on web relay at index {}".format(relayIndex)
-            Messages.write_message("Successfully toggled relay index/indices: {}.".format(relayIndices))
+        report.writeMessage("Setting power (factory flash) for web relays")
+        switchWebRelays(int(relayToggle) == 0)
     else:
-        Messages.write_message("Don't need restart")
+        report.writeMessage("Don't need restart")
 ###
 # reset trace32 device
 ###
@@ -216,9 +287,11 @@ def resetTrace32Device():
     if os.getenv("automation_index") == "99":
         for controller in data_store.suite["webControllers"]:
             results = controller.relayOff(4)
-            Messages.write_message(results["description"])
+            report.writeMessage(results["description"])
+            getWebRelayState(controller).written({4: "0"})
             time.sleep(5)
             results = controller.relayOn(4)
-            Messages.write_message(results["description"])
+            report.writeMessage(results["description"])
+            getWebRelayState(controller).written({4: "1"})
             time.sleep(10)
             assert True
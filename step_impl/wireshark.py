@@ -8,20 +8,27 @@
 #
 ##########################################################################
 """
-The ``wireshark_library`` is used for this Step Implementation file. All Steps are in the ``wireshark.py`` file.
+The ``wireshark_library`` is used for this Step Implementation file to run tshark, the capture is analyzed with ``pcap_reader.py``. All Steps are in the ``wireshark.py`` file.
 
 Below are a list of implemented Steps:
 """
 ##########################################################################
 # import libraries
 ###
-from getgauge.python import step, Messages, data_store, after_scenario, before_suite
+from getgauge.python import step, data_store, after_scenario, before_suite
+from step_impl import report, pcap_reader, cyclic_io
 import time
 import os
 import sys
 sys.path.append(r"../wireshark_library")
 from WiresharkLibrary import WiresharkController
 
+##########################################################################
+# constants
+###
+CAPTURE_FILE = "wireshark.cap"
+CAPTURE_START_TIMEOUT = 5
+
 ##########################################################################
 # before suite
 ###
@@ -41,7 +48,7 @@ def beforeSuiteHook():
 @step("Wireshark start")
 def wiresharkStart():
     """
-    Starts the wireshark capture by creating the Wireshark Controller class using ``data_store.scenario["wiresharkController"]`` variable.
+    Starts the wireshark capture by creating the Wireshark Controller class using ``data_store.scenario["wiresharkController"]`` variable. Waits until tshark created the capture file and sets ``data_store.scenario["wiresharkLive"]`` to tail it while the Scenario runs.
 
     Step and function definition::
 
@@ -52,9 +59,14 @@ def wiresharkStart():
         * Wireshark start
     """
     data_store.scenario["wiresharkController"] = WiresharkController(os.getenv("wireshark_interface"))
-    Messages.write_message("Wireshark started")
+    report.writeMessage("Wireshark started")
     data_store.scenario["wiresharkEnabled"] = True
-    time.sleep(2) # let tshark start
+    # let tshark start, the capture file is written once it listens
+    timeout = time.monotonic() + CAPTURE_START_TIMEOUT
+    while not os.path.exists(CAPTURE_FILE) and time.monotonic() < timeout:
+        time.sleep(0.05)
+    assert os.path.exists(CAPTURE_FILE), "tshark did not create the capture file {} within {} s".format(CAPTURE_FILE, CAPTURE_START_TIMEOUT)
+    data_store.scenario["wiresharkLive"] = pcap_reader.LiveCapture(CAPTURE_FILE, {name: makeFilter() for name, makeFilter in pcap_reader.FILTERS.items()})
 ###
 # wireshark stop
 ###
@@ -72,7 +84,7 @@ def wiresharkStop():
         * Wireshark stop
     """
     results = data_store.scenario["wiresharkController"].stopProcess()
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     data_store.scenario["wiresharkEnabled"] = False
 ###
 # wireshark generate json
@@ -80,7 +92,7 @@ def wiresharkStop():
 @step("Wireshark generate json <filename>")
 def wiresharkGenerateJson(filename):
     """
-    Generates the given filename in JSON form from the Wireshark capture file.
+    Generates the given filename in JSON form from the Wireshark capture file. The analysis Steps read the capture directly and don't need the JSON file.
 
     Args:
         filename (string): File name to save.
@@ -93,11 +105,11 @@ def wiresharkGenerateJson(filename):
     Example usage:
         *  Wireshark generate json "./wireshark.cap"
     """
-    Messages.write_message("Using cap filename: {}".format(filename))
-    Messages.write_message("Working in dir: {}".format(os.getcwd()))
+    report.writeMessage("Using cap filename: {}".format(filename))
+    report.writeMessage("Working in dir: {}".format(os.getcwd()))
     assert os.path.exists(filename), "wireshark capture file does not exist"
     results = data_store.scenario["wiresharkController"].generateJson(filename)
-    Messages.write_message(results["description"])
+    report.writeMessage(results["description"])
     assert results["result"] == 0, "wireshark generate json failed"
 ###
 # arp count
@@ -125,11 +137,178 @@ def wiresharkArpCount(count, srcAddr, dstAddr):
     ip = list(map(int, dstAddr.split(".")))
     assert len(ip) == 4, "dst IP address format is wrong"
     count = int(count)
-    results = data_store.scenario["wiresharkController"].arpCount(srcAddr, dstAddr, data_store.scenario["arpStartTime"])
-    Messages.write_message(results["description"])
-    assert results["result"] == 0, "wireshark arp count failed"
-    Messages.write_message("ARPs counted: {}".format(results["data"]["arpCount"]))
-    assert (results["data"]["arpCount"] == count) or (results["data"]["arpCount"] == (count + 1)), "ARPs counted: {}, ARPs requested: {}".format(results["data"]["arpCount"], count)
+    assert os.path.exists(CAPTURE_FILE), "wireshark capture file does not exist"
+    stats = pcap_reader.analyze(pcap_reader.PcapReader(CAPTURE_FILE), {"ARP": pcap_reader.arpFilter(srcAddr, dstAddr)}, data_store.scenario["arpStartTime"])
+    arpCount = stats["ARP"].count
+    report.writeMessage("ARPs counted: {}".format(arpCount))
+    assert (arpCount == count) or (arpCount == (count + 1)), "ARPs counted: {}, ARPs requested: {}".format(arpCount, count)
+###
+# wait for arp
+###
+@step("Wireshark wait for <count> ARP from <srcAddr> within <timeout>")
+def wiresharkWaitForArp(count, srcAddr, timeout):
+    """
+    Tails the running Wireshark capture until the given number of ARPs from the source IP address was captured (since ARP start if it was called). Returns as soon as the ARPs are seen, tshark keeps running.
+
+    Args:
+        count (int): ARP count to wait for.
+        srcAddr (string): Source IP address.
+        timeout (float): Timeout in seconds.
+
+    Step and function definition::
+
+        @step("Wireshark wait for <count> ARP from <srcAddr> within <timeout>")
+        def wiresharkWaitForArp(count, srcAddr, timeout):
+
+    Example usage:
+        * Wireshark wait for "5" ARP from "192.168.1.10" within "30"
+    """
+    ip = list(map(int, srcAddr.split(".")))
+    assert len(ip) == 4, "src IP address format is wrong"
+    count = int(count)
+    since = data_store.scenario["arpStartTime"] if "arpStartTime" in data_store.scenario else None
+    live = pcap_reader.LiveCapture(CAPTURE_FILE, {"ARP": pcap_reader.arpFilter(srcAddr)}, since)
+    start = time.monotonic()
+    found = live.waitFor(lambda stats: stats["ARP"].count >= count, timeout)
+    report.writeMessage("ARPs counted: {} after {:.3f} s".format(live.stats["ARP"].count, time.monotonic() - start))
+    assert found, "ARPs counted: {}, ARPs requested: {} within {} s".format(live.stats["ARP"].count, count, timeout)
+###
+# live counts
+###
+@step("Wireshark live counts")
+def wiresharkLiveCounts():
+    """
+    Reads the packets captured since the last call and reports the rolling ARP, PROFINET DCP and EtherNet/IP counts of the Scenario without stopping tshark. The counts are saved in ``data_store.scenario["wiresharkCounts"]``.
+
+    Step and function definition::
+
+        @step("Wireshark live counts")
+        def wiresharkLiveCounts():
+
+    Example usage:
+        * Wireshark live counts
+    """
+    assert "wiresharkLive" in data_store.scenario, "Wireshark start was not called"
+    data_store.scenario["wiresharkCounts"] = data_store.scenario["wiresharkLive"].counts()
+    for name, count in data_store.scenario["wiresharkCounts"].items():
+        report.writeMessage("{} packets: {}".format(name, count))
+###
+# capture summary
+###
+@step("Wireshark summary")
+def wiresharkSummary():
+    """
+    Reads the Wireshark capture once and reports the count, inter-arrival times and flow byte rates of the ARP, PROFINET DCP and EtherNet/IP packets. The results are saved in ``data_store.scenario["wiresharkSummary"]``.
+
+    Step and function definition::
+
+        @step("Wireshark summary")
+        def wiresharkSummary():
+
+    Example usage:
+        * Wireshark summary
+    """
+    assert os.path.exists(CAPTURE_FILE), "wireshark capture file does not exist"
+    filters = {name: makeFilter() for name, makeFilter in pcap_reader.FILTERS.items()}
+    stats = pcap_reader.analyze(pcap_reader.PcapReader(CAPTURE_FILE), filters)
+    data_store.scenario["wiresharkSummary"] = {name: stat.summary() for name, stat in stats.items()}
+    for name, summary in data_store.scenario["wiresharkSummary"].items():
+        reportSummary(name, summary)
+
+def reportSummary(name, summary):
+    """
+    Writes the statistics of one protocol to the report.
+
+    Args:
+        name (string): Protocol name.
+        summary (dict): ``PacketStats.summary()`` of the protocol.
+    """
+    report.writeMessage("{}: {} packets, {} bytes".format(name, summary["count"], summary["bytes"]))
+    if summary["meanMs"] is not None:
+        report.writeMessage("{} interval: min {:.3f} ms, mean {:.3f} ms, max {:.3f} ms, std {:.3f} ms".format(name, summary["minMs"], summary["meanMs"], summary["maxMs"], summary["stdMs"]))
+    for flow, flowSummary in summary["flows"].items():
+        rate = "" if flowSummary["bytesPerSecond"] is None else ", {:.0f} bytes/s".format(flowSummary["bytesPerSecond"])
+        report.writeMessage("{} {}: {} packets, {} bytes{}".format(name, flow, flowSummary["packets"], flowSummary["bytes"], rate))
+###
+# max interval
+###
+@step("Wireshark verify <protocol> max interval <maxMs>")
+def wiresharkVerifyMaxInterval(protocol, maxMs):
+    """
+    Asserts the longest time between two packets of the protocol (ARP, DCP or CIP) in the Wireshark capture.
+
+    Args:
+        protocol (string): ARP, DCP or CIP.
+        maxMs (float): Longest allowed interval in milliseconds.
+
+    Step and function definition::
+
+        @step("Wireshark verify <protocol> max interval <maxMs>")
+        def wiresharkVerifyMaxInterval(protocol, maxMs):
+
+    Example usage:
+        * Wireshark verify "CIP" max interval "12"
+    """
+    assert protocol in pcap_reader.FILTERS, "protocol {} is not one of {}".format(protocol, ", ".join(pcap_reader.FILTERS))
+    assert os.path.exists(CAPTURE_FILE), "wireshark capture file does not exist"
+    summary = pcap_reader.analyze(pcap_reader.PcapReader(CAPTURE_FILE), {protocol: pcap_reader.FILTERS[protocol]()})[protocol].summary()
+    reportSummary(protocol, summary)
+    assert summary["maxMs"] is not None, "less than two {} packets captured".format(protocol)
+    assert summary["maxMs"] <= float(maxMs), "{} max interval {:.3f} ms > {} ms".format(protocol, summary["maxMs"], maxMs)
+###
+# cyclic io summary
+###
+@step("Wireshark cyclic IO summary")
+def wiresharkCyclicIoSummary():
+    """
+    Reports the cycle time, jitter and late and missed frames of every PROFINET RT and EtherNet/IP class 1 connection in the Wireshark capture. The results are saved in ``data_store.scenario["cyclicIo"]``.
+
+    Step and function definition::
+
+        @step("Wireshark cyclic IO summary")
+        def wiresharkCyclicIoSummary():
+
+    Example usage:
+        * Wireshark cyclic IO summary
+    """
+    assert os.path.exists(CAPTURE_FILE), "wireshark capture file does not exist"
+    data_store.scenario["cyclicIo"] = cyclic_io.analyzeCapture(CAPTURE_FILE)
+    for name, analysis in data_store.scenario["cyclicIo"].items():
+        report.writeMessage(cyclic_io.describe(name, analysis))
+    if not data_store.scenario["cyclicIo"]:
+        report.writeMessage("no cyclic IO connections captured")
+###
+# cyclic io jitter
+###
+@step("Wireshark verify cyclic IO cycle <cycleMs> jitter below <maxJitterMs>")
+def wiresharkVerifyCyclicIoJitter(cycleMs, maxJitterMs):
+    """
+    Asserts that every cyclic IO connection in the Wireshark capture keeps its cycle: no interval deviates more than ``maxJitterMs`` from the cycle and no frames are missed.
+
+    Args:
+        cycleMs (float): Configured cycle in milliseconds, 0 to use the median interval of each connection.
+        maxJitterMs (float): Largest allowed deviation from the cycle in milliseconds.
+
+    Step and function definition::
+
+        @step("Wireshark verify cyclic IO cycle <cycleMs> jitter below <maxJitterMs>")
+        def wiresharkVerifyCyclicIoJitter(cycleMs, maxJitterMs):
+
+    Example usage:
+        * Wireshark verify cyclic IO cycle "4" jitter below "0.5"
+    """
+    assert os.path.exists(CAPTURE_FILE), "wireshark capture file does not exist"
+    results = cyclic_io.analyzeCapture(CAPTURE_FILE, float(cycleMs) or None)
+    data_store.scenario["cyclicIo"] = results
+    assert results, "no cyclic IO connections captured"
+    failures = []
+    for name, analysis in results.items():
+        report.writeMessage(cyclic_io.describe(name, analysis))
+        if analysis["maxMs"] > float(maxJitterMs):
+            failures.append("{} jitter {:.3f} ms > {} ms".format(name, analysis["maxMs"], maxJitterMs))
+        if analysis["missed"]:
+            failures.append("{} missed {} frames".format(name, analysis["missed"]))
+    assert not failures, ", ".join(failures)
 
 ##########################################################################
 # after scenario
@@ -142,11 +321,11 @@ def afterScenarioHook():
     if "wiresharkEnabled" in data_store.scenario:
         if data_store.scenario["wiresharkEnabled"]:
             results = data_store.scenario["wiresharkController"].stopProcess()
-            Messages.write_message(results["description"])
-            Messages.write_message("wireshark after scenario complete")
+            report.writeMessage(results["description"])
+            report.writeMessage("wireshark after scenario complete", report.DEBUG)
         else:
-            Messages.write_message("wireshark already stopped")
-        if os.path.exists("wireshark.cap"):
+            report.writeMessage("wireshark already stopped")
+        if os.path.exists(CAPTURE_FILE):
             newFilename = "wireshark_{}.cap".format(data_store.suite["wiresharkCount"])
             data_store.suite["wiresharkCount"] += 1
-            os.rename("wireshark.cap", newFilename)
\ No newline at end of file
+            os.rename(CAPTURE_FILE, newFilename)
\ No newline at end of file
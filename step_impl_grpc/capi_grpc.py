@@ -16,17 +16,21 @@ import time
 import os
 import json
 import sys
-import struct
-import pickle
-import grpc
 sys.path.append(r"../grpc_library")
 import embedded_automation_pb2
 import embedded_automation_pb2_grpc
+from step_impl_grpc.grpc_channel_pool import getChannelPool
+from step_impl_grpc import capi_payload
+from step_impl import cmtp_layout, hex_dump
+from step_impl.device_readiness import DeviceReadiness
+from step_impl_grpc.io_subscription import IOSubscription
 
 ##########################################################################
 # constants
 ###
-CMTP_BUFFER_LEN = 1024
+IO_LOOP_TIMEOUT_MS = 2000
+IO_POLL_MIN_INTERVAL = 0.002
+IO_POLL_MAX_INTERVAL = 0.05
 
 ##########################################################################
 # before scenario setup
@@ -41,9 +45,13 @@ def beforeScenarioHook():
     data_store.scenario["safeEnabled"] = False
     data_store.scenario["pingOpen"] = False
     data_store.scenario["arpRegistered"] = False
+    data_store.scenario["ioSubscription"] = None
+    data_store.scenario["ioWriteTime"] = None
+    data_store.scenario["configOnDevice"] = False
+    data_store.scenario["resetTime"] = None
     data_store.scenario["capiServerAddress"] = "localhost:4502"
-    data_store.scenario["capiRPCChannel"] = grpc.insecure_channel(data_store.scenario["capiServerAddress"])
-    data_store.scenario["capiRPCStub"] = embedded_automation_pb2_grpc.embeddedAutomationServiceStub(data_store.scenario["capiRPCChannel"])
+    # channels are pooled for the whole suite, see grpc_channel_pool.py
+    data_store.scenario["capiRPCStub"] = getChannelPool().getStub(data_store.scenario["capiServerAddress"], embedded_automation_pb2_grpc.embeddedAutomationServiceStub)
     Messages.write_message("capi before scenario completed")
 
 ##########################################################################
@@ -53,6 +61,11 @@ def beforeScenarioHook():
 ###
 @step("Init")
 def init():
+    results = getChannelPool().checkReady(data_store.scenario["capiServerAddress"])
+    Messages.write_message(results["description"])
+    assert results["result"] == 0, "CAPI gRPC server not ready"
+    if results["data"]["reconnected"]:
+        data_store.scenario["capiRPCStub"] = getChannelPool().getStub(data_store.scenario["capiServerAddress"], embedded_automation_pb2_grpc.embeddedAutomationServiceStub)
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi init request",
@@ -116,6 +129,11 @@ def getCardInfo():
 ###
 @step("Soft reset device")
 def softResetDevice():
+    if data_store.scenario["configOnDevice"]:
+        # last step of the configuration download, later soft resets run again
+        data_store.scenario["configOnDevice"] = False
+        Messages.write_message("Configuration already on device, soft reset skipped")
+        return
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi soft reset request",
@@ -124,6 +142,7 @@ def softResetDevice():
     response = data_store.scenario["capiRPCStub"].rpcCAPISoftReset(request)
     Messages.write_message("capi soft reset returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Soft reset failed"
+    data_store.scenario["resetTime"] = time.monotonic()
 ###
 # start standard connections
 ###
@@ -242,12 +261,12 @@ def readIO():
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi read IO request",
-        data = ""
+        data = capi_payload.requestData()
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPIReadIO(request)
     Messages.write_message("read IO returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "read IO failed"
-    responseData = json.loads(response.data)
+    responseData = capi_payload.decodeIO(response)
     data_store.scenario["producedIO"] = responseData["produced"]
     Messages.write_message("Produced: {}".format(data_store.scenario["producedIO"]))
     data_store.scenario["consumedIO"] = responseData["consumed"]
@@ -260,18 +279,52 @@ def writeIO(value):
     newProduceData = list(data_store.scenario["producedIO"])
     newProduceData[0] = int(value)
     newProduceData = tuple(newProduceData)
-    requestData = pickle.dumps(newProduceData)
+    ioData = capi_payload.encodeWriteIO(newProduceData)
     request = embedded_automation_pb2.bytesRequest(
         result = 0,
         description = "capi write IO request",
-        bytesData = requestData
+        bytesData = ioData
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPIWriteIO(request)
     Messages.write_message("write IO returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "write IO failed"
     Messages.write_message("Write: {}".format(newProduceData))
-    responseData = json.loads(response.data)
-    time.sleep(responseData["produceFunctionDuty"])
+    data_store.scenario["ioWriteTime"] = time.perf_counter()
+###
+# wait for input
+###
+@step("Wait for input <value> within <timeoutMs>")
+def waitForInput(value, timeoutMs):
+    start = time.perf_counter()
+    if data_store.scenario["ioWriteTime"] is not None:
+        start = data_store.scenario["ioWriteTime"]
+    deadline = time.perf_counter() + int(timeoutMs) / 1000.0
+    interval = IO_POLL_MIN_INTERVAL
+    reads = 0
+    request = embedded_automation_pb2.basicRequest(
+        result = 0,
+        description = "capi read IO request",
+        data = capi_payload.requestData()
+    )
+    while True:
+        response = data_store.scenario["capiRPCStub"].rpcCAPIReadIO(request)
+        reads += 1
+        assert response.result == 0, "read IO failed"
+        responseData = capi_payload.decodeIO(response)
+        if responseData["consumed"][0] == int(value):
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, IO_POLL_MAX_INTERVAL)
+    latency = (time.perf_counter() - start) * 1000
+    data_store.scenario["ioWriteTime"] = None
+    data_store.scenario["producedIO"] = responseData["produced"]
+    data_store.scenario["consumedIO"] = responseData["consumed"]
+    Messages.write_message("Consumed: {}".format(data_store.scenario["consumedIO"]))
+    Messages.write_message("Input latency: {:.1f} ms ({} reads)".format(latency, reads))
+    verifyInput(value)
 ###
 # start all connections
 ###
@@ -347,12 +400,12 @@ def getPingStats():
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi ping get stats request",
-        data = ""
+        data = capi_payload.requestData()
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPIGetPingStats(request)
     Messages.write_message("ping get stats returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "ping get stats failed"
-    responseData = json.loads(response.data)
+    responseData = capi_payload.decodePingStats(response)
     if responseData != "":
         data_store.scenario["transmitted"] = str(responseData["transmitted"])
         Messages.write_message("Number of transmitted PING requests: {}".format(data_store.scenario["transmitted"]))
@@ -596,24 +649,14 @@ def getIOStatus(index):
 def sendMessageBlink(byMac, dataLength):
     assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 20
-    for i, mac in enumerate(byMac.split(":")):
-        data[i] = int("0x{}".format(mac), 0)
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage("blink", byMac=cmtp_layout.macBytes(byMac))
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message blink request",
@@ -624,19 +667,12 @@ def sendMessageBlink(byMac, dataLength):
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message blink returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message blink failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
@@ -649,39 +685,20 @@ def sendMessageSetName(dwRemanent, dwNameLength, szName, byMac, dataLength):
     assert int(dwNameLength) == len(szName), "szName and dwNameLength are not equal in size"
     assert int(dwRemanent) < 4294967296, "dwRemanent is too large, needs to be less than 4294967296"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 22
-    # set request type, 0 is volatile 1 is permenant
-    dwRemanentOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwRemanent))):
-        data[i + dwRemanentOffset] = num
-    # set name length
-    dwNameLengthOffset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwNameLength))):
-        data[i + dwNameLengthOffset] = num
-    # set name
-    szNameOffset = 32 - 24
-    for i, stringNum in enumerate(bytes(szName, "utf-8")):
-        data[i + szNameOffset] = stringNum
-    # set MAC
-    byMacOffset = 272 - 24
-    for i, mac in enumerate(byMac.split(":")):
-        data[i + byMacOffset] = int("0x{}".format(mac), 0)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage(
+        "set name",
+        dwRemanent = int(dwRemanent),
+        dwNameLength = int(dwNameLength),
+        szName = bytes(szName, "utf-8"),
+        byMac = cmtp_layout.macBytes(byMac)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message set name request",
@@ -692,19 +709,12 @@ def sendMessageSetName(dwRemanent, dwNameLength, szName, byMac, dataLength):
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message set name returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message set name failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
@@ -719,47 +729,22 @@ def sendMessageSetIP(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGateway, byMa
     assert int(dwRemanent) < 4294967296, "dwRemanent is too large, needs to be less than 4294967296"
     assert int(dwIPMode) < 4294967296, "dwIPMode is too large, needs to be less than 4294967296"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 23
-    # set request type, 0 is volatile 1 is permenant
-    dwRemanentOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwRemanent))):
-        data[i + dwRemanentOffset] = num
-    # set IP mode, 1 for static
-    dwIPModeOffset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwIPMode))):
-        data[i + dwIPModeOffset] = num
-    # set IP Addr
-    byIPAddrOffset = 32 - 24
-    for i, ip in enumerate(byIPAddr.split(".")):
-        data[i + byIPAddrOffset] = int("{}".format(ip), 0)
-    # set IP Mask
-    byIPMaskOffset = 36 - 24
-    for i, ip in enumerate(byIPMask.split(".")):
-        data[i + byIPMaskOffset] = int("{}".format(ip), 0)
-    # set IP Gateway
-    byIPGatewayOffset = 40 - 24
-    for i, ip in enumerate(byIPGateway.split(".")):
-        data[i + byIPGatewayOffset] = int("{}".format(ip), 0)
-    # set MAC
-    byMacOffset = 44 - 24
-    for i, mac in enumerate(byMac.split(":")):
-        data[i + byMacOffset] = int("0x{}".format(mac), 0)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage(
+        "set ip",
+        dwRemanent = int(dwRemanent),
+        dwIPMode = int(dwIPMode),
+        byIPAddr = cmtp_layout.ipBytes(byIPAddr),
+        byIPMask = cmtp_layout.ipBytes(byIPMask),
+        byIPGateway = cmtp_layout.ipBytes(byIPGateway),
+        byMac = cmtp_layout.macBytes(byMac)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message set ip request",
@@ -770,77 +755,38 @@ def sendMessageSetIP(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGateway, byMa
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message set ip returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message set ip failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
 # send read explicit message
 ###
 @step("Send message read explicit <dwConfID> <dwCrc32> <wDeviceNumber> <dwApi> <wSlotNumber> <wSubSlotNumber> <wIndex> <wLengthDataToRead> <dataLength>")
-def sendMessageReadExplicit(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGateway, byMac, dataLength):
-    assert len(byMac.split(":")) == 6, "MAC Address not correct format"
+def sendMessageReadExplicit(dwConfID, dwCrc32, wDeviceNumber, dwApi, wSlotNumber, wSubSlotNumber, wIndex, wLengthDataToRead, dataLength):
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 32
-    # set configuration ID
-    dwConfIDOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwConfID))):
-        data[i + dwConfIDOffset] = num
-    # set crc 32
-    dwCrc32Offset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwCrc32))):
-        data[i + dwCrc32Offset] = num
-    # set device number
-    wDeviceNumberOffset = 32 - 24
-    for i, num in enumerate(struct.pack('<h', int(wDeviceNumber))):
-        data[i + wDeviceNumberOffset] = num
-    # set api
-    dwApiOffset = 34 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwApi))):
-        data[i + dwApiOffset] = num
-    # set slot number
-    wSlotNumberOffset = 38 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSlotNumber))):
-        data[i + wSlotNumberOffset] = num
-    # set sub slot number
-    wSubSlotNumberOffset = 40 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSubSlotNumber))):
-        data[i + wSubSlotNumberOffset] = num
-    # set index
-    wIndexOffset = 42 - 24
-    for i, num in enumerate(struct.pack('<h', int(wIndex))):
-        data[i + wSubSlotNumberOffset] = num
-    # set length data to read
-    wLengthDataToReadOffset = 44 - 24
-    for i, num in enumerate(struct.pack('<h', int(wLengthDataToRead))):
-        data[i + wLengthDataToReadOffset] = num
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage(
+        "read explicit",
+        dwConfID = int(dwConfID),
+        dwCrc32 = int(dwCrc32),
+        wDeviceNumber = int(wDeviceNumber),
+        dwApi = int(dwApi),
+        wSlotNumber = int(wSlotNumber),
+        wSubSlotNumber = int(wSubSlotNumber),
+        wIndex = int(wIndex),
+        wLengthDataToRead = int(wLengthDataToRead)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message read explicit request",
@@ -849,81 +795,44 @@ def sendMessageReadExplicit(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGatewa
         dataLength = dataLength
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
-    Messages.write_message("send message set name returned exit code " + str(response.result) + ": " + response.description)
+    Messages.write_message("send message read explicit returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message read explicit failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
-    assert responseData.result == 0, "read explicit failed"
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
 # send write explicit message
 ###
 @step("Send message write explicit <dwConfID> <dwCrc32> <wDeviceNumber> <dwApi> <wSlotNumber> <wSubSlotNumber> <wIndex> <dataToWrite> <dataLength>")
-def sendMessageWriteExplicit(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGateway, byMac, dataLength):
-    assert len(byMac.split(":")) == 6, "MAC Address not correct format"
+def sendMessageWriteExplicit(dwConfID, dwCrc32, wDeviceNumber, dwApi, wSlotNumber, wSubSlotNumber, wIndex, dataToWrite, dataLength):
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 32
-    # set configuration ID
-    dwConfIDOffset = 24 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwConfID))):
-        data[i + dwConfIDOffset] = num
-    # set crc 32
-    dwCrc32Offset = 28 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwCrc32))):
-        data[i + dwCrc32Offset] = num
-    # set device number
-    wDeviceNumberOffset = 32 - 24
-    for i, num in enumerate(struct.pack('<h', int(wDeviceNumber))):
-        data[i + wDeviceNumberOffset] = num
-    # set api
-    dwApiOffset = 34 - 24
-    for i, num in enumerate(struct.pack('<i', int(dwApi))):
-        data[i + dwApiOffset] = num
-    # set slot number
-    wSlotNumberOffset = 38 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSlotNumber))):
-        data[i + wSlotNumberOffset] = num
-    # set sub slot number
-    wSubSlotNumberOffset = 40 - 24
-    for i, num in enumerate(struct.pack('<h', int(wSubSlotNumber))):
-        data[i + wSubSlotNumberOffset] = num
-    # set index
-    wIndexOffset = 42 - 24
-    for i, num in enumerate(struct.pack('<h', int(wIndex))):
-        data[i + wSubSlotNumberOffset] = num
-    # set data to write
-    dataToWriteOffset = 44 - 24
+    dataToWriteList = []
     for i, num in enumerate(dataToWrite.split(",")):
         assert int(num) < 256, "Number in dataToWrite list too large {} at index {}".format(num, i)
-        data[i + dataToWriteOffset] = int(num)
-    # init data string
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+        dataToWriteList.append(int(num))
+    serviceID, data = cmtp_layout.buildMessage(
+        "write explicit",
+        dwConfID = int(dwConfID),
+        dwCrc32 = int(dwCrc32),
+        wDeviceNumber = int(wDeviceNumber),
+        dwApi = int(dwApi),
+        wSlotNumber = int(wSlotNumber),
+        wSubSlotNumber = int(wSubSlotNumber),
+        wIndex = int(wIndex),
+        dataToWrite = bytes(dataToWriteList)
+    )
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message write explicit request",
@@ -934,19 +843,12 @@ def sendMessageWriteExplicit(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGatew
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message write explicit returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message write explicit failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
@@ -954,22 +856,14 @@ def sendMessageWriteExplicit(dwRemanent, dwIPMode, byIPAddr, byIPMask, byIPGatew
 ###
 @step("Send message identify")
 def sendMessageIdentify():
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = 254
-    serviceID = 10
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage("identify")
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message identify request",
@@ -980,19 +874,12 @@ def sendMessageIdentify():
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message identify returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message identify failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
@@ -1000,22 +887,14 @@ def sendMessageIdentify():
 ###
 @step("Send message get device detected")
 def sendMessageGetDeviceDetected():
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = 254
-    serviceID = 11
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage("get device detected")
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message get device request",
@@ -1026,19 +905,12 @@ def sendMessageGetDeviceDetected():
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message get device returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message get device failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
 ###
@@ -1048,24 +920,14 @@ def sendMessageGetDeviceDetected():
 def sendMessageFactoryReset(byMac, dataLength):
     assert len(byMac.split(":")) == 6, "MAC Address not correct format"
     assert int(dataLength) < 255, "dataLength is too large, needs to be less than 254"
-    data = [0] * CMTP_BUFFER_LEN
     dataLength = int(dataLength)
-    serviceID = 21
-    for i, mac in enumerate(byMac.split(":")):
-        data[i] = int("0x{}".format(mac), 0)
-    dataString = ""
-    for i, resultData in enumerate(data):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    serviceID, data = cmtp_layout.buildMessage("factory reset", byMac=cmtp_layout.macBytes(byMac))
+    dataString = hex_dump.hexDump(data, dataLength)
     Messages.write_message("Sending Service: {}".format(serviceID))
     Messages.write_message("Sending Size: {}".format(dataLength))
     Messages.write_message("Sending Data: \n{}".format(dataString))
     # serialize data to bytes-like object for gRPC transmission
-    serializedData = pickle.dumps(data)
+    serializedData = capi_payload.encodeMessage(data)
     request = embedded_automation_pb2.capiMessageRequest(
         result = 0,
         description = "capi send message factory reset request",
@@ -1076,19 +938,12 @@ def sendMessageFactoryReset(byMac, dataLength):
     response = data_store.scenario["capiRPCStub"].rpcCAPISendMessage(request)
     Messages.write_message("send message factory reset returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Send message factory reset failed"
-    # load the stringified response data into a dictionary object
-    responseData = json.loads(response.data)
+    # decode the binary or stringified response data into a dictionary object
+    responseData = capi_payload.decodeMessage(response)
     Messages.write_message("Received Status: {}".format(responseData["status"]))
     Messages.write_message("Received Service: {}".format(responseData["service"]))
     Messages.write_message("Received Size: {}".format(responseData["size"]))
-    dataString = ""
-    for i, resultData in enumerate(responseData["data"]):
-        if i % 4 == 0:
-            dataString += "\n"
-            dataString += "{0:0{1}X}: ".format(i, 4)
-            dataString += "{0:0{1}X} ".format(resultData, 2)
-        else:
-            dataString += "{0:0{1}X} ".format(resultData, 2)
+    dataString = hex_dump.hexDump(responseData["data"], responseData["size"])
     Messages.write_message("Received Data: \n{}".format(dataString))
     assert responseData["status"] == 0, "Status from response is non-zero - {}".format(responseData["status"])
     
@@ -1192,12 +1047,12 @@ def readSafeIO():
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi read safe IO request",
-        data = ""
+        data = capi_payload.requestData()
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPIReadSafeIO(request)
     Messages.write_message("read IO returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "read safe IO failed"
-    responseData = json.loads(response.data)
+    responseData = capi_payload.decodeIO(response)
     data_store.scenario["producedSafeIO"] = responseData["produced"]
     Messages.write_message("Safe Produced: {}".format(data_store.scenario["producedSafeIO"]))
     data_store.scenario["consumedSafeIO"] = responseData["consumed"]
@@ -1210,11 +1065,11 @@ def writeSafeIO(value):
     newProduceData = list(data_store.scenario["producedSafeIO"])
     newProduceData[0] = int(value)
     newProduceData = tuple(newProduceData)
-    requestData = pickle.dumps(newProduceData)
+    ioData = capi_payload.encodeWriteIO(newProduceData)
     request = embedded_automation_pb2.bytesRequest(
         result = 0,
         description = "capi write safe IO request",
-        bytesData = requestData
+        bytesData = ioData
     )
     response = data_store.scenario["capiRPCStub"].rpcCAPIWriteSafeIO(request)
     Messages.write_message("write safe IO returned exit code " + str(response.result) + ": " + response.description)
@@ -1297,10 +1152,43 @@ def getIOStatus(index):
 ##########################################################################
 # configuration steps
 ###
+# check device configuration
+###
+@step("Check device configuration")
+def checkDeviceConfiguration():
+    data_store.scenario["configOnDevice"] = False
+    if "configCRC" not in data_store.suite:
+        Messages.write_message("No config CRC, configuration will be downloaded")
+        return
+    request = embedded_automation_pb2.flagRequest(
+        result = 0,
+        description = "capi read config ID request",
+        flag = True
+    )
+    response = data_store.scenario["capiRPCStub"].rpcCAPIReadConfigID(request)
+    Messages.write_message("capi read config ID returned exit code " + str(response.result) + ": " + response.description)
+    if response.result != 0:
+        Messages.write_message("No configuration on device, configuration will be downloaded")
+        return
+    deviceCRC = hex(int(json.loads(response.data)["configDataCRC"]))
+    Messages.write_message("Device CRC: {}".format(deviceCRC))
+    Messages.write_message("Database CRC: {}".format(data_store.suite["configCRC"]))
+    data_store.scenario["configOnDevice"] = int(deviceCRC, 16) == int(data_store.suite["configCRC"], 16)
+    if data_store.scenario["configOnDevice"]:
+        Messages.write_message("Configuration already on device, download skipped")
+
+def configDownloadSkipped():
+    if data_store.scenario["configOnDevice"]:
+        Messages.write_message("Configuration already on device, step skipped")
+        return True
+    return False
+###
 # register
 ###
 @step("Config register")
 def configRegister():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.flagRequest(
         result = 0,
         description = "capi config register request",
@@ -1314,6 +1202,8 @@ def configRegister():
 ###
 @step("Config unregister")
 def configUnregister():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.flagRequest(
         result = 0,
         description = "capi config unregister request",
@@ -1327,6 +1217,8 @@ def configUnregister():
 ###
 @step("Config lock")
 def configLock():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.flagRequest(
         result = 0,
         description = "capi config lock request",
@@ -1340,6 +1232,8 @@ def configLock():
 ###
 @step("Config unlock")
 def configUnlock():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.flagRequest(
         result = 0,
         description = "capi config unlock request",
@@ -1353,6 +1247,8 @@ def configUnlock():
 ###
 @step("Config mode")
 def configMode():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi config mode request",
@@ -1371,26 +1267,20 @@ def configReset():
         description = "capi config reset request",
         data = ""
     )
+    start = time.monotonic()
     response = data_store.scenario["capiRPCStub"].rpcCAPIConfigReset(request)
     Messages.write_message("capi config reset returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Config reset failed"
-    timeout = time.time() + 30
-    configRead = False
-    id_request = embedded_automation_pb2.flagRequest(
-        result = 0,
-        description = "capi read config ID request",
-        flag = True
-    )
-    while (time.time() < timeout and configRead == False):
-        x = data_store.scenario["capiRPCStub"].rpcCAPIReadConfigID(id_request)
-        if (x.result == 0):
-            configRead = True
-    assert configRead == True, "Unable to confirm config was reset"
+    results = waitDeviceReady(start)
+    Messages.write_message("config reset: " + results["description"])
+    assert results["result"] == 0, "Unable to confirm config was reset"
 ###
 # write block - network config
 ###
 @step("Write block network config")
 def writeBlockNetworkConfig():
+    if configDownloadSkipped():
+        return
     try:
         dataString = json.dumps({"fileType": 10, "fileName":data_store.suite["configFile"]})
         request = embedded_automation_pb2.basicRequest(
@@ -1409,6 +1299,8 @@ def writeBlockNetworkConfig():
 ###
 @step("Write block network config compressed")
 def writeBlockNetworkConfigCompressed():
+    if configDownloadSkipped():
+        return
     try:
         dataString = json.dumps({"fileType": 11, "fileName":data_store.suite["configFile"]})
         request = embedded_automation_pb2.basicRequest(
@@ -1427,6 +1319,8 @@ def writeBlockNetworkConfigCompressed():
 ###
 @step("Config validate")
 def configValidate():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi config validate request",
@@ -1440,26 +1334,93 @@ def configValidate():
 ###
 @step("Config apply")
 def configApply():
+    if configDownloadSkipped():
+        return
     request = embedded_automation_pb2.basicRequest(
         result = 0,
         description = "capi config apply compressed request",
         data = ""
     )
+    start = time.monotonic()
     response = data_store.scenario["capiRPCStub"].rpcCAPIConfigApply(request)
     Messages.write_message("capi config apply returned exit code " + str(response.result) + ": " + response.description)
     assert response.result == 0, "Config apply failed"
-    timeout = time.time() + 30
-    configRead = False
+    results = waitDeviceReady(start)
+    Messages.write_message("config apply: " + results["description"])
+    assert results["result"] == 0, "Cannot verify config"
+
+def waitDeviceReady(since, timeout=30, requireTransition=False):
     id_request = embedded_automation_pb2.flagRequest(
         result = 0,
         description = "capi read config ID request",
         flag = True
     )
-    while (time.time() < timeout and configRead == False):
-        x = data_store.scenario["capiRPCStub"].rpcCAPIReadConfigID(id_request)
-        if (x.result == 0):
-            configRead = True
-    assert configRead == True, "Cannot verify config"
+    state_request = embedded_automation_pb2.basicRequest(
+        result = 0,
+        description = "capi get state request",
+        data = ""
+    )
+    def readState():
+        response = data_store.scenario["capiRPCStub"].rpcCAPIReadState(state_request)
+        return json.loads(response.data)["state"] if response.result == 0 else None
+    readiness = DeviceReadiness(lambda: data_store.scenario["capiRPCStub"].rpcCAPIReadConfigID(id_request).result == 0, readState)
+    return readiness.waitReady(timeout, since, requireTransition)
+###
+# wait for device ready
+###
+@step("Wait for device ready within <timeoutMs>")
+def waitForDeviceReady(timeoutMs):
+    resetTime = data_store.scenario["resetTime"]
+    data_store.scenario["resetTime"] = None
+    results = waitDeviceReady(resetTime, int(timeoutMs) / 1000, resetTime is not None)
+    Messages.write_message("{}: {}".format("Soft reset" if resetTime is not None else "Device", results["description"]))
+    assert results["result"] == 0, "Device not ready within {} ms".format(timeoutMs)
+###
+# subscribe io
+###
+@step("Subscribe IO <rateMs>")
+def subscribeIO(rateMs):
+    if data_store.scenario["ioSubscription"] is not None:
+        unsubscribeIO()
+    subscription = IOSubscription(data_store.scenario["capiRPCStub"], embedded_automation_pb2.basicRequest, rateMs, data_store.scenario["safeEnabled"])
+    subscription.start()
+    data_store.scenario["ioSubscription"] = subscription
+    Messages.write_message("IO subscription started every {} ms ({})".format(rateMs, "stream" if subscription.streaming else "polling"))
+    # wait for the first snapshot so the produced IO is known before the next Write IO
+    snapshot = subscription.waitFor(lambda snapshot: True, 5, 0)
+    assert snapshot is not None, "subscribe IO failed: {}".format(subscription.error)
+    _storeSnapshot(snapshot)
+###
+# unsubscribe io
+###
+@step("Unsubscribe IO")
+def unsubscribeIO():
+    subscription = data_store.scenario["ioSubscription"]
+    if subscription is None:
+        return
+    subscription.stop()
+    data_store.scenario["ioSubscription"] = None
+    Messages.write_message("IO subscription stopped after {} RPC calls, {} snapshots".format(subscription.rpcCount, subscription.sequence))
+
+def _storeSnapshot(snapshot):
+    # keep the scenario IO in sync so Write IO and the Verify steps see the latest snapshot
+    for key in ("producedIO", "consumedIO", "producedSafeIO", "consumedSafeIO", "producedNSC", "consumedNSC"):
+        if snapshot[key] is not None:
+            data_store.scenario[key] = snapshot[key]
+
+def _waitForSnapshot(predicate, timeoutMs, description):
+    subscription = data_store.scenario["ioSubscription"]
+    assert subscription is not None, "IO subscription not started, use Subscribe IO first"
+    start = time.perf_counter()
+    snapshot = subscription.waitFor(predicate, int(timeoutMs) / 1000.0)
+    if snapshot is None:
+        assert subscription.error is None, "IO subscription failed: {}".format(subscription.error)
+        snapshot = subscription.snapshot
+    if snapshot is not None:
+        _storeSnapshot(snapshot)
+    Messages.write_message("{} after {:.1f} ms".format(description, (time.perf_counter() - start) * 1000))
+    return snapshot
+
 ##########################################################################
 # verify steps
 ###
@@ -1529,6 +1490,28 @@ def verifySafeOutput(value):
 def verifyNCS(val1, val2):
     assert data_store.scenario["consumedNSC"] == int(val1) or data_store.scenario["consumedNSC"] == int(val2), "{} != {} or {}".format(data_store.scenario["consumedNSC"], int(val1), int(val2))
 
+###
+# wait for input on io subscription
+###
+@step("Wait for subscribed input <value> within <timeoutMs>")
+def waitForSubscribedInput(value, timeoutMs):
+    _waitForSnapshot(lambda snapshot: snapshot["consumedIO"] and snapshot["consumedIO"][0] == int(value), timeoutMs, "Wait for input {}".format(value))
+    verifyInput(value)
+###
+# wait for safe output on io subscription
+###
+@step("Wait for subscribed safe output <value> within <timeoutMs>")
+def waitForSubscribedSafeOutput(value, timeoutMs):
+    _waitForSnapshot(lambda snapshot: snapshot["producedSafeIO"] and snapshot["producedSafeIO"][0] == int(value), timeoutMs, "Wait for safe output {}".format(value))
+    verifySafeOutput(value)
+###
+# wait for ncs on io subscription
+###
+@step("Wait for subscribed NCS <val1> or <val2> within <timeoutMs>")
+def waitForSubscribedNCS(val1, val2, timeoutMs):
+    _waitForSnapshot(lambda snapshot: snapshot["consumedNSC"] in (int(val1), int(val2)), timeoutMs, "Wait for NCS {} or {}".format(val1, val2))
+    verifyNCS(val1, val2)
+
 ##########################################################################
 # automation steps
 ###
@@ -1538,6 +1521,25 @@ def verifyNCS(val1, val2):
 def testIOTestSafeIOLoop(standardValue, safeValue, timeoutSeconds):
     timeout = time.time() + int(timeoutSeconds)
     while timeout > time.time():
+        subscription = data_store.scenario["ioSubscription"]
+        if subscription is not None and subscription.includeSafe:
+            # the subscription keeps the IO up to date, wait on it instead of reading and sleeping
+            writeIO(standardValue)
+            waitForSubscribedInput(standardValue, IO_LOOP_TIMEOUT_MS)
+            writeIO("0")
+            waitForSubscribedInput("0", IO_LOOP_TIMEOUT_MS)
+            waitForSubscribedNCS("0", "16", IO_LOOP_TIMEOUT_MS)
+            getState()
+            writeSafeIO(safeValue)
+            waitForSubscribedSafeOutput(safeValue, IO_LOOP_TIMEOUT_MS)
+            writeSafeIO("0")
+            waitForSubscribedSafeOutput("0", IO_LOOP_TIMEOUT_MS)
+            verifyConnections("2")
+            verifyActiveConnections("2")
+            Messages.write_message("=============================")
+            Messages.write_message("Loop iteration")
+            Messages.write_message("=============================")
+            continue
         readIO()
         writeIO(standardValue)
         time.sleep(0.5)
@@ -1571,6 +1573,8 @@ def testIOTestSafeIOLoop(standardValue, safeValue, timeoutSeconds):
 ###
 @after_scenario
 def afterScenarioHook():
+    if data_store.scenario["ioSubscription"] is not None:
+        unsubscribeIO()
     if data_store.scenario["safeEnabled"]:
         request = embedded_automation_pb2.basicRequest(
             result = 0,
@@ -0,0 +1,211 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   CAPI gRPC Payload Encoding for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Typed binary payloads for the CAPI gRPC Steps in ``capi_grpc.py``.
+
+The ``embedded_automation_pb2`` messages only carry a ``data`` string and a ``bytesData`` field, so IO, CMTP message and ping stats payloads are packed as fixed binary records into ``bytesData`` instead of JSON text or pickled lists. Every record starts with ``PAYLOAD_MAGIC`` so the automation server can tell it apart from a legacy pickle.
+
+The encoding is selected with the ``capi_payload_encoding`` environment variable (``json`` or ``binary``, default ``json``). With ``json`` the legacy pickle/JSON path is used, and any response without a binary record is decoded from ``response.data`` so older servers keep working. In binary mode the read requests ask the server for binary records, but Write IO and Send Message requests are only sent as binary records once the server answered with one, until then they stay pickled so a server without binary support can still read them.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import data_store
+import os
+import json
+import pickle
+import struct
+
+##########################################################################
+# constants
+###
+PAYLOAD_MAGIC = b"CAPB"
+PAYLOAD_VERSION = 1
+IO_PAYLOAD = 1
+MESSAGE_PAYLOAD = 2
+PING_STATS_PAYLOAD = 3
+# magic, version, payload type
+PAYLOAD_HEADER = struct.Struct("<4sBB")
+# produced length, consumed length
+IO_HEADER = struct.Struct("<HH")
+# status, service, size, data length
+MESSAGE_HEADER = struct.Struct("<iIIH")
+# transmitted, received, duplicated, lastRTT, maxRTT, minRTT, avrRTT, sumRTT, sendErrorCode, recvErrorCode
+PING_STATS = struct.Struct("<IIIdddddii")
+PING_STATS_FIELDS = ("transmitted", "received", "duplicated", "lastRTT", "maxRTT", "minRTT", "avrRTT", "sumRTT", "sendErrorCode", "recvErrorCode")
+
+##########################################################################
+# methods
+###
+# encoding selection
+###
+def binaryEnabled():
+    """
+    Returns:
+        bool: True if ``capi_payload_encoding`` is set to ``binary``.
+    """
+    return os.getenv("capi_payload_encoding", "json").strip().lower() == "binary"
+
+def binaryAccepted():
+    """
+    Returns:
+        bool: True if binary mode is selected and the server already answered with a binary record, so it can read binary requests.
+    """
+    return binaryEnabled() and "capiBinaryServer" in data_store.suite and data_store.suite["capiBinaryServer"] == True
+
+def requestData():
+    """
+    Returns the ``data`` string for requests without arguments. In binary mode it asks the server to answer with a binary record.
+
+    Returns:
+        string: Request data.
+    """
+    if binaryEnabled():
+        return json.dumps({"encoding": "binary"})
+    return ""
+
+def _header(payloadType):
+    return PAYLOAD_HEADER.pack(PAYLOAD_MAGIC, PAYLOAD_VERSION, payloadType)
+
+def _record(response, payloadType):
+    # returns the record body if the response carries a binary record of the given type
+    payload = getattr(response, "bytesData", b"")
+    if len(payload) < PAYLOAD_HEADER.size:
+        return None
+    magic, version, recordType = PAYLOAD_HEADER.unpack_from(payload)
+    if magic != PAYLOAD_MAGIC:
+        return None
+    data_store.suite["capiBinaryServer"] = True
+    assert version == PAYLOAD_VERSION, "Unsupported payload version {}".format(version)
+    assert recordType == payloadType, "Expected payload type {} got {}".format(payloadType, recordType)
+    return memoryview(payload)[PAYLOAD_HEADER.size:]
+###
+# io
+###
+def encodeIO(produced, consumed=()):
+    """
+    Packs produced (and optionally consumed) IO into a binary record.
+
+    Args:
+        produced (list): Produced IO bytes.
+        consumed (list, optional): Consumed IO bytes. Defaults to ().
+
+    Returns:
+        bytes: Binary IO record.
+    """
+    produced = bytes(produced)
+    consumed = bytes(consumed)
+    return _header(IO_PAYLOAD) + IO_HEADER.pack(len(produced), len(consumed)) + produced + consumed
+
+def encodeWriteIO(produced):
+    """
+    Encodes the produced IO for a Write IO request, as a binary record only if ``binaryAccepted``.
+
+    Args:
+        produced (tuple): Produced IO bytes.
+
+    Returns:
+        bytes: Request ``bytesData``.
+    """
+    if binaryAccepted():
+        return encodeIO(produced)
+    return pickle.dumps(tuple(produced))
+
+def decodeIO(response):
+    """
+    Decodes a Read IO response.
+
+    Args:
+        response (basicResponse): gRPC response.
+
+    Returns:
+        dict: ``produced`` and ``consumed`` IO as lists.
+    """
+    record = _record(response, IO_PAYLOAD)
+    if record is None:
+        return json.loads(response.data)
+    producedLength, consumedLength = IO_HEADER.unpack_from(record)
+    offset = IO_HEADER.size
+    return {
+        "produced": list(record[offset:offset + producedLength]),
+        "consumed": list(record[offset + producedLength:offset + producedLength + consumedLength])
+    }
+###
+# cmtp messages
+###
+def encodeMessage(data):
+    """
+    Encodes a CMTP message buffer for a Send Message request, as a binary record only if ``binaryAccepted``.
+
+    Args:
+        data (list or bytes): CMTP buffer.
+
+    Returns:
+        bytes: Request ``bytesData``.
+    """
+    if binaryAccepted():
+        return _header(MESSAGE_PAYLOAD) + bytes(data)
+    return pickle.dumps(list(data))
+
+def encodeMessageResponse(status, service, size, data):
+    """
+    Packs a CMTP message response into a binary record, this is the server side of ``decodeMessage``.
+
+    Returns:
+        bytes: Binary message record.
+    """
+    data = bytes(data)
+    return _header(MESSAGE_PAYLOAD) + MESSAGE_HEADER.pack(status, service, size, len(data)) + data
+
+def decodeMessage(response):
+    """
+    Decodes a Send Message response.
+
+    Args:
+        response (basicResponse): gRPC response.
+
+    Returns:
+        dict: ``status``, ``service``, ``size`` and ``data`` of the CMTP response, ``data`` is a list of byte values in both modes.
+    """
+    record = _record(response, MESSAGE_PAYLOAD)
+    if record is None:
+        return json.loads(response.data)
+    status, service, size, dataLength = MESSAGE_HEADER.unpack_from(record)
+    offset = MESSAGE_HEADER.size
+    return {
+        "status": status,
+        "service": service,
+        "size": size,
+        "data": list(record[offset:offset + dataLength])
+    }
+###
+# ping stats
+###
+def encodePingStats(stats):
+    """
+    Packs a ping stats dictionary into a binary record, this is the server side of ``decodePingStats``.
+
+    Returns:
+        bytes: Binary ping stats record.
+    """
+    return _header(PING_STATS_PAYLOAD) + PING_STATS.pack(*[stats[field] for field in PING_STATS_FIELDS])
+
+def decodePingStats(response):
+    """
+    Decodes a Get Ping Stats response.
+
+    Args:
+        response (basicResponse): gRPC response.
+
+    Returns:
+        dict: Ping statistics keyed by ``PING_STATS_FIELDS``.
+    """
+    record = _record(response, PING_STATS_PAYLOAD)
+    if record is None:
+        return json.loads(response.data)
+    return dict(zip(PING_STATS_FIELDS, PING_STATS.unpack_from(record)))
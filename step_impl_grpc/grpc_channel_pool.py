@@ -0,0 +1,215 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   gRPC Channel Pool for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+Suite scoped registry of gRPC channels shared by the ``step_impl_grpc`` Step Implementation files.
+
+Channels are keyed by server address and kept open for the whole suite, so each Scenario reuses the TCP/HTTP2 connection instead of opening a new one.
+"""
+##########################################################################
+# import libraries
+###
+from getgauge.python import Messages, data_store, before_suite, after_suite
+import threading
+import time
+import grpc
+
+##########################################################################
+# constants
+###
+CHANNEL_OPTIONS = [
+    # send a keepalive ping every 30s, even when no call is active, so idle channels survive between scenarios
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    # let the core reconnect quickly after the automation server restarts
+    ("grpc.initial_reconnect_backoff_ms", 250),
+    ("grpc.min_reconnect_backoff_ms", 250),
+    ("grpc.max_reconnect_backoff_ms", 5000),
+]
+READY_TIMEOUT = 5
+MAX_CONNECT_ATTEMPTS = 4
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 4
+
+##########################################################################
+# channel pool
+###
+class GRPCChannelPool:
+    """
+    Registry of gRPC channels keyed by server address.
+
+    Args:
+        options (list, optional): Channel arguments. Defaults to ``CHANNEL_OPTIONS``.
+        readyTimeout (float, optional): Seconds to wait for a channel to become ready per attempt. Defaults to ``READY_TIMEOUT``.
+        maxAttempts (int, optional): Connect attempts before giving up. Defaults to ``MAX_CONNECT_ATTEMPTS``.
+    """
+    def __init__(self, options=None, readyTimeout=READY_TIMEOUT, maxAttempts=MAX_CONNECT_ATTEMPTS):
+        self.options = CHANNEL_OPTIONS if options is None else options
+        self.readyTimeout = readyTimeout
+        self.maxAttempts = maxAttempts
+        self.channels = {}
+        self.stubs = {}
+        self.states = {}
+        self.created = 0
+        self.reused = 0
+        self.reconnects = 0
+        self.lock = threading.Lock()
+
+    def _open(self, address):
+        channel = grpc.insecure_channel(address, options=self.options)
+        self.channels[address] = channel
+        self.stubs[address] = {}
+        self.states[address] = None
+        channel.subscribe(lambda state, channel=channel: self._onStateChange(address, channel, state))
+        self.created += 1
+        return channel
+
+    def _onStateChange(self, address, channel, state):
+        # ignore late callbacks from a channel that was already replaced
+        if self.channels.get(address) is channel:
+            self.states[address] = state
+
+    def _close(self, address):
+        channel = self.channels.pop(address, None)
+        self.stubs.pop(address, None)
+        self.states.pop(address, None)
+        if channel is not None:
+            channel.close()
+
+    def _waitForReady(self, address):
+        delay = BACKOFF_BASE
+        for attempt in range(self.maxAttempts):
+            try:
+                grpc.channel_ready_future(self.channels[address]).result(timeout=self.readyTimeout)
+                return True
+            except grpc.FutureTimeoutError:
+                if attempt + 1 == self.maxAttempts:
+                    break
+                # drop the dead channel and try again with a fresh one
+                time.sleep(delay)
+                delay = min(delay * 2, BACKOFF_MAX)
+                self._close(address)
+                self._open(address)
+                self.reconnects += 1
+        return False
+
+    def getChannel(self, address, waitForReady=False):
+        """
+        Get the open channel for the given address, creating it on first use. When ``waitForReady`` is set the channel is health checked and reopened with exponential backoff until it becomes ready.
+
+        Args:
+            address (string): Server address (ie. localhost:4502).
+            waitForReady (bool, optional): Block until the channel is ready. Defaults to False.
+
+        Returns:
+            grpc.Channel: Pooled channel.
+        """
+        with self.lock:
+            if address in self.channels and self.states[address] != grpc.ChannelConnectivity.SHUTDOWN:
+                self.reused += 1
+            else:
+                self._open(address)
+            if waitForReady and not self._waitForReady(address):
+                raise ConnectionError("gRPC server at {} not ready after {} attempts".format(address, self.maxAttempts))
+            return self.channels[address]
+
+    def checkReady(self, address):
+        """
+        Health check the pooled channel for the given address, reconnecting with backoff if needed. Stubs taken before a reconnect are bound to the closed channel and must be taken again.
+
+        Args:
+            address (string): Server address (ie. localhost:4502).
+
+        Returns:
+            dict: ``result`` is 0 if the channel is ready, ``data["reconnected"]`` is True if the channel was reopened.
+        """
+        with self.lock:
+            if address not in self.channels:
+                self._open(address)
+            channel = self.channels[address]
+            ready = self._waitForReady(address)
+            reconnected = self.channels.get(address) is not channel
+        if ready:
+            return {"result": 0, "description": "gRPC server at {} is ready".format(address), "data": {"reconnected": reconnected}}
+        return {"result": 1, "description": "gRPC server at {} not ready after {} attempts".format(address, self.maxAttempts), "data": {"reconnected": reconnected}}
+
+    def getStub(self, address, stubClass):
+        """
+        Get a stub of the given class bound to the pooled channel for the given address.
+
+        Args:
+            address (string): Server address (ie. localhost:4502).
+            stubClass (class): Generated stub class (ie. ``embeddedAutomationServiceStub``).
+
+        Returns:
+            object: Stub instance, reused for as long as the channel stays open.
+        """
+        channel = self.getChannel(address)
+        with self.lock:
+            stubs = self.stubs[address]
+            if stubClass not in stubs:
+                stubs[stubClass] = stubClass(channel)
+            return stubs[stubClass]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of channels created, reused and reconnected plus the number currently open.
+        """
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "reconnects": self.reconnects,
+            "open": len(self.channels)
+        }
+
+    def shutdown(self):
+        """
+        Close every channel in the pool.
+        """
+        with self.lock:
+            for address in list(self.channels.keys()):
+                self._close(address)
+
+###
+# pool accessor
+###
+def getChannelPool():
+    """
+    Returns the suite channel pool stored in ``data_store.suite["grpcChannelPool"]``, creating it if the Before Suite Hook has not run yet.
+    """
+    if "grpcChannelPool" not in data_store.suite or data_store.suite["grpcChannelPool"] is None:
+        data_store.suite["grpcChannelPool"] = GRPCChannelPool()
+    return data_store.suite["grpcChannelPool"]
+
+##########################################################################
+# before suite
+###
+@before_suite
+def beforeSuiteHook():
+    """
+    Creates the suite channel pool in ``data_store.suite["grpcChannelPool"]``.
+    """
+    getChannelPool()
+
+##########################################################################
+# after suite
+###
+@after_suite
+def afterSuiteHook():
+    """
+    Shuts down every pooled channel and writes the channel reuse counters to the Gauge report.
+    """
+    if "grpcChannelPool" in data_store.suite and data_store.suite["grpcChannelPool"] is not None:
+        pool = data_store.suite["grpcChannelPool"]
+        stats = pool.stats()
+        pool.shutdown()
+        data_store.suite["grpcChannelPool"] = None
+        Messages.write_message("gRPC channels created: {}, reused: {}, reconnects: {}".format(stats["created"], stats["reused"], stats["reconnects"]))
+    Messages.write_message("grpc channel pool after suite complete")
@@ -0,0 +1,156 @@
+##########################################################################
+#
+#   MOLEX Ltd. Test Library
+#
+#   CAPI gRPC IO Subscription for Test Automation in Gauge Framework
+#
+##########################################################################
+"""
+IO subscription used by the ``Subscribe IO`` Steps in ``capi_grpc.py``.
+
+If the automation server exposes the server-streaming ``rpcCAPISubscribeIO`` RPC a single call pushes produced/consumed IO, safe IO and NCS snapshots at the requested rate. Older servers without the RPC are polled from the same background thread, so Steps can wait on snapshots the same way in both cases.
+"""
+##########################################################################
+# import libraries
+###
+import json
+import threading
+import time
+from step_impl_grpc import capi_payload
+
+##########################################################################
+# constants
+###
+SNAPSHOT_KEYS = ("producedIO", "consumedIO", "producedSafeIO", "consumedSafeIO", "producedNSC", "consumedNSC")
+
+##########################################################################
+# io subscription
+###
+class IOSubscription:
+    """
+    Background IO subscription on the CAPI gRPC server.
+
+    Args:
+        stub (embeddedAutomationServiceStub): Stub of the CAPI gRPC server.
+        requestClass (class): Request message class (``embedded_automation_pb2.basicRequest``).
+        rateMs (int): Snapshot period in ms.
+        includeSafe (bool, optional): Also collect safe IO and NCS. Defaults to False.
+    """
+    def __init__(self, stub, requestClass, rateMs, includeSafe=False):
+        self.stub = stub
+        self.requestClass = requestClass
+        self.rate = max(int(rateMs), 1) / 1000.0
+        self.includeSafe = includeSafe
+        self.snapshot = None
+        self.sequence = 0
+        self.rpcCount = 0
+        self.streaming = hasattr(stub, "rpcCAPISubscribeIO")
+        self.error = None
+        self.call = None
+        self.stopEvent = threading.Event()
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _request(self, description, data=""):
+        return self.requestClass(result=0, description=description, data=data)
+
+    def _publish(self, snapshot):
+        snapshot["timestamp"] = time.perf_counter()
+        with self.condition:
+            self.snapshot = snapshot
+            self.sequence += 1
+            self.condition.notify_all()
+
+    def _stream(self):
+        requestData = json.dumps({"rateMs": int(self.rate * 1000), "safe": self.includeSafe})
+        self.call = self.stub.rpcCAPISubscribeIO(self._request("capi subscribe IO request", requestData))
+        self.rpcCount += 1
+        for response in self.call:
+            if self.stopEvent.is_set():
+                break
+            if response.result != 0:
+                raise RuntimeError("subscribe IO returned exit code {}: {}".format(response.result, response.description))
+            responseData = json.loads(response.data)
+            self._publish({key: responseData.get(key) for key in SNAPSHOT_KEYS})
+
+    def _poll(self):
+        while not self.stopEvent.is_set():
+            snapshot = dict.fromkeys(SNAPSHOT_KEYS)
+            response = self.stub.rpcCAPIReadIO(self._request("capi read IO request", capi_payload.requestData()))
+            self.rpcCount += 1
+            if response.result == 0:
+                responseData = capi_payload.decodeIO(response)
+                snapshot["producedIO"] = responseData["produced"]
+                snapshot["consumedIO"] = responseData["consumed"]
+            if self.includeSafe:
+                response = self.stub.rpcCAPIReadSafeIO(self._request("capi read safe IO request", capi_payload.requestData()))
+                self.rpcCount += 1
+                if response.result == 0:
+                    responseData = capi_payload.decodeIO(response)
+                    snapshot["producedSafeIO"] = responseData["produced"]
+                    snapshot["consumedSafeIO"] = responseData["consumed"]
+                response = self.stub.rpcCAPIGetNCS(self._request("capi get NCS request"))
+                self.rpcCount += 1
+                if response.result == 0:
+                    responseData = json.loads(response.data)
+                    snapshot["producedNSC"] = responseData["producedNSC"]
+                    snapshot["consumedNSC"] = responseData["consumedNSC"]
+            self._publish(snapshot)
+            self.stopEvent.wait(self.rate)
+
+    def _run(self):
+        try:
+            if self.streaming:
+                self._stream()
+            else:
+                self._poll()
+        except Exception as exc:
+            if not self.stopEvent.is_set():
+                self.error = exc
+        finally:
+            # wake up any waiter so it can report the error
+            with self.condition:
+                self.condition.notify_all()
+
+    def start(self):
+        """
+        Starts the background thread.
+        """
+        self.thread.start()
+
+    def stop(self):
+        """
+        Cancels the stream (or stops polling) and joins the background thread.
+        """
+        self.stopEvent.set()
+        if self.call is not None:
+            self.call.cancel()
+        self.thread.join(timeout=max(self.rate * 2, 1))
+
+    def waitFor(self, predicate, timeout, after=None):
+        """
+        Blocks until a snapshot newer than the call satisfies the given predicate.
+
+        Args:
+            predicate (function): Called with each snapshot dictionary, returns True on match.
+            timeout (float): Timeout in seconds.
+            after (int, optional): Only snapshots with a higher sequence number are checked. Defaults to None for the sequence number at the call.
+
+        Returns:
+            dict: Matching snapshot, or None on timeout.
+        """
+        deadline = time.perf_counter() + timeout
+        with self.condition:
+            # a snapshot taken before the call may predate the write the caller waits for
+            seen = self.sequence if after is None else after
+            while True:
+                if self.snapshot is not None and self.sequence != seen:
+                    seen = self.sequence
+                    if predicate(self.snapshot):
+                        return self.snapshot
+                if self.error is not None or not self.thread.is_alive():
+                    return None
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
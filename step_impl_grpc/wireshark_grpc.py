@@ -16,10 +16,11 @@ import time
 import json
 import os
 import sys
-import grpc
 sys.path.append(r"../grpc_library")
 import embedded_automation_pb2
 import embedded_automation_pb2_grpc
+from step_impl_grpc.grpc_channel_pool import getChannelPool
+from step_impl import cyclic_io
 
 ##########################################################################
 # before suite
@@ -28,8 +29,8 @@ import embedded_automation_pb2_grpc
 def beforeScenarioHook():
     data_store.suite["wiresharkCount"] = 0
     data_store.scenario["wiresharkServerAddress"] = "localhost:4504"
-    data_store.scenario["wiresharkRPCChannel"] = grpc.insecure_channel(data_store.scenario["wiresharkServerAddress"])
-    data_store.scenario["wiresharkRPCStub"] = embedded_automation_pb2_grpc.embeddedAutomationServiceStub(data_store.scenario["wiresharkRPCChannel"])
+    # channels are pooled for the whole suite, see grpc_channel_pool.py
+    data_store.scenario["wiresharkRPCStub"] = getChannelPool().getStub(data_store.scenario["wiresharkServerAddress"], embedded_automation_pb2_grpc.embeddedAutomationServiceStub)
 
 ##########################################################################
 # methods
@@ -38,6 +39,11 @@ def beforeScenarioHook():
 ###
 @step("Wireshark start")
 def wiresharkStart():
+    results = getChannelPool().checkReady(data_store.scenario["wiresharkServerAddress"])
+    Messages.write_message(results["description"])
+    assert results["result"] == 0, "Wireshark gRPC server not ready"
+    if results["data"]["reconnected"]:
+        data_store.scenario["wiresharkRPCStub"] = getChannelPool().getStub(data_store.scenario["wiresharkServerAddress"], embedded_automation_pb2_grpc.embeddedAutomationServiceStub)
     requestData = json.dumps({"interface": os.getenv("wireshark_interface")})
     request = embedded_automation_pb2.basicRequest(
         result = 0,
@@ -106,6 +112,37 @@ def wiresharkArpCount(count, srcAddr, dstAddr):
     responseData = json.loads(response.data)
     Messages.write_message("ARPs counted: {}".format(responseData["arpCount"]))
     assert (responseData["arpCount"] == count) or (responseData["arpCount"] == (count + 1)), "ARPs counted: {}, ARPs requested: {}".format(responseData["arpCount"], count)
+###
+# cyclic io summary
+###
+@step("Wireshark cyclic IO summary")
+def wiresharkCyclicIoSummary():
+    # the capture is written to the wireshark lib dir, it is analyzed here instead of over gRPC
+    filename = os.path.join(os.getenv("workspace_path"), "wireshark_library", "wireshark.cap")
+    assert os.path.exists(filename), "wireshark capture file does not exist"
+    data_store.scenario["cyclicIo"] = cyclic_io.analyzeCapture(filename)
+    for name, analysis in data_store.scenario["cyclicIo"].items():
+        Messages.write_message(cyclic_io.describe(name, analysis))
+    if not data_store.scenario["cyclicIo"]:
+        Messages.write_message("no cyclic IO connections captured")
+###
+# cyclic io jitter
+###
+@step("Wireshark verify cyclic IO cycle <cycleMs> jitter below <maxJitterMs>")
+def wiresharkVerifyCyclicIoJitter(cycleMs, maxJitterMs):
+    filename = os.path.join(os.getenv("workspace_path"), "wireshark_library", "wireshark.cap")
+    assert os.path.exists(filename), "wireshark capture file does not exist"
+    results = cyclic_io.analyzeCapture(filename, float(cycleMs) or None)
+    data_store.scenario["cyclicIo"] = results
+    assert results, "no cyclic IO connections captured"
+    failures = []
+    for name, analysis in results.items():
+        Messages.write_message(cyclic_io.describe(name, analysis))
+        if analysis["maxMs"] > float(maxJitterMs):
+            failures.append("{} jitter {:.3f} ms > {} ms".format(name, analysis["maxMs"], maxJitterMs))
+        if analysis["missed"]:
+            failures.append("{} missed {} frames".format(name, analysis["missed"]))
+    assert not failures, ", ".join(failures)
 
 ##########################################################################
 # after scenario